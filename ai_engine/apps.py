@@ -25,6 +25,12 @@ class AiEngineConfig(AppConfig):
             # Initialize global AI model directory
             self._ensure_model_directories()
             
+            # Apply model cache settings
+            self._configure_model_registry()
+            
+            # Optionally preload models before the first request
+            self._start_model_warmup()
+            
             logger.info("AI Engine initialized successfully")
             
         except Exception as e:
@@ -47,4 +53,52 @@ class AiEngineConfig(AppConfig):
         for directory in model_dirs:
             os.makedirs(directory, exist_ok=True)
             
-        logger.info("AI model directories created successfully")
\ No newline at end of file
+        logger.info("AI model directories created successfully")
+    
+    def _configure_model_registry(self):
+        """
+        Apply the configured memory budget, inference backend and
+        reload check interval to the shared model registry, and route
+        predictions through the inference server if one is configured
+        """
+        from django.conf import settings
+        from .ml_models.registry import model_registry
+        
+        max_bytes = getattr(settings, 'AI_MODEL_CACHE_MAX_BYTES', None)
+        backend = getattr(settings, 'AI_INFERENCE_BACKEND', None)
+        check_interval = getattr(settings, 'AI_MODEL_RELOAD_CHECK_INTERVAL', None)
+        model_registry.configure(max_bytes=max_bytes, backend=backend, check_interval=check_interval)
+        
+        logger.info(
+            f"AI model cache budget: {model_registry.max_bytes} bytes, "
+            f"inference backend: {model_registry.backend}"
+        )
+        
+        socket_path = getattr(settings, 'AI_INFERENCE_SOCKET', None)
+        if socket_path:
+            from .ml_models.inference_client import configure_inference_client
+            configure_inference_client(socket_path)
+            logger.info(f"Routing single predictions through inference server at {socket_path}")
+    
+    def _start_model_warmup(self):
+        """
+        Preload the global model and the most recently active tenants'
+        models when AI_WARMUP_ON_STARTUP is enabled.
+        Runs in a background thread so startup is not blocked and the
+        database is not queried during app initialization.
+        """
+        import threading
+        from django.conf import settings
+        
+        if not getattr(settings, 'AI_WARMUP_ON_STARTUP', False):
+            return
+        
+        from .utils.model_warmup import run_model_warmup
+        
+        thread = threading.Thread(
+            target=run_model_warmup,
+            kwargs={'tenant_limit': getattr(settings, 'AI_WARMUP_TENANT_COUNT', 10)},
+            name='ai-model-warmup',
+            daemon=True,
+        )
+        thread.start()
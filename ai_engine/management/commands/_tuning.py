@@ -0,0 +1,77 @@
+# ai_engine/management/commands/_tuning.py
+# Hyperparameter search options shared by the training commands
+
+import json
+from django.conf import settings
+from django.core.management.base import CommandError
+from ai_engine.ml_models.tuning import search_hyperparameters
+
+def add_tuning_arguments(parser):
+    parser.add_argument('--tune', action='store_true', help='Search hyperparameters before training')
+    parser.add_argument(
+        '--param-space', type=str,
+        help='JSON file of {param: [values]} to search (default: AI_TUNING_PARAM_SPACE or the built-in space)'
+    )
+    parser.add_argument(
+        '--n-candidates', type=int,
+        help='Sample this many configurations at random instead of searching the full grid'
+    )
+    parser.add_argument('--cv', type=int, default=3, help='Cross-validation folds')
+    parser.add_argument('--scoring', type=str, default='f1', help='Metric the search optimizes')
+    parser.add_argument('--n-jobs', type=int, default=-1, help='Parallel fits (-1 = all CPUs)')
+    parser.add_argument(
+        '--latency-budget-ms', type=float,
+        help='Prefer the best configuration whose p99 single-row latency fits this budget'
+    )
+
+def tune_from_options(X, y, options, stdout):
+    """
+    Run the configured search. Returns (params, metadata_fields) where
+    metadata_fields are the AIModelMetadata values to record, or
+    (None, {}) when --tune is not set.
+    """
+    if not options['tune']:
+        return None, {}
+    param_space = getattr(settings, 'AI_TUNING_PARAM_SPACE', None)
+    if options['param_space']:
+        try:
+            with open(options['param_space']) as f:
+                param_space = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read parameter space {options['param_space']}: {e}")
+
+    result = search_hyperparameters(
+        X, y,
+        param_space=param_space,
+        n_candidates=options['n_candidates'],
+        cv=options['cv'],
+        scoring=options['scoring'],
+        n_jobs=options['n_jobs'],
+        latency_budget_ms=options['latency_budget_ms'],
+    )
+    for candidate in result.candidates:
+        if candidate.get('finalist'):
+            stdout.write(
+                f"  {candidate['params']}: {options['scoring']} {candidate['mean_score']:.3f} "
+                f"± {candidate['std_score']:.3f}, p99 {candidate['latency_p99_ms']:.2f} ms"
+            )
+    stdout.write(
+        f"Searched {len(result.candidates)} configuration rounds ({result.n_fits} fits) in "
+        f"{result.search_seconds:.1f}s; chose {result.best_params}"
+    )
+    metrics = result.cv_metrics
+    return result.best_params, {
+        'accuracy': metrics['accuracy'],
+        'precision': metrics['precision'],
+        'recall': metrics['recall'],
+        'f1_score': metrics['f1'],
+        'tuning_results': {
+            'scoring': options['scoring'],
+            'cv_folds': options['cv'],
+            'latency_budget_ms': options['latency_budget_ms'],
+            'search_seconds': result.search_seconds,
+            'n_fits': result.n_fits,
+            'cv_metrics': metrics,
+            'candidates': result.candidates,
+        },
+    }
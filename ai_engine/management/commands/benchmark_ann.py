@@ -0,0 +1,109 @@
+# ai_engine/management/commands/benchmark_ann.py
+
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from ai_engine.ml_models.ann_index import DEFAULT_EMBEDDING_DIM, benchmark_recall, recall_at_k, synthetic_vectors
+
+class Command(BaseCommand):
+    help = 'Measure recall@k and latency of the IVF approximate index against exact search'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vectors', type=int, default=200000, help='Synthetic vectors to index')
+        parser.add_argument('--dim', type=int, default=DEFAULT_EMBEDDING_DIM, help='Synthetic vector width')
+        parser.add_argument('--clusters', type=int, default=256, help='Clusters the synthetic vectors are drawn around')
+        parser.add_argument('--spread', type=float, default=0.6, help='Noise around each cluster (larger: less clustered)')
+        parser.add_argument(
+            '--tenant', type=int,
+            help='Measure approximate semantic search over this tenant\'s candidates against exact semantic search',
+        )
+        parser.add_argument('--shortlist', type=int, help='Embeddings reranked per tenant query (default: AI_ANN_SHORTLIST)')
+        parser.add_argument('--queries', type=int, default=200, help='Queries measured')
+        parser.add_argument('--k', type=int, default=10, help='Neighbors per query (recall@k)')
+        parser.add_argument('--n-lists', type=int, help='Inverted lists (default: about sqrt(vectors))')
+        parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32, 64], help='nprobe values to try')
+
+    def handle(self, *args, **options):
+        if options['tenant'] is not None:
+            report, description = self.benchmark_tenant(options)
+        else:
+            vectors = synthetic_vectors(options['vectors'], options['dim'], options['clusters'], options['spread'], seed=0)
+            queries = synthetic_vectors(options['queries'], options['dim'], options['clusters'], options['spread'], seed=1)
+            report = benchmark_recall(vectors, queries, k=options['k'], nprobes=options['nprobe'], n_lists=options['n_lists'])
+            description = (
+                f"{len(vectors)} synthetic vectors x {vectors.shape[1]}, {report['n_lists']} lists "
+                f"(built in {report['build_seconds']:.1f}s), {len(queries)} queries"
+            )
+
+        self.stdout.write(description)
+        recall_label = f"recall@{options['k']}"
+        self.stdout.write(f"{'search':<14}{recall_label:>10}{'p50':>10}{'p99':>10}")
+        exact = report['exact']
+        self.stdout.write(f"{'exact':<14}{exact['recall']:>10.3f}{exact['p50_ms']:>8.2f}ms{exact['p99_ms']:>8.2f}ms")
+        for row in report['ivf']:
+            label = f"nprobe={row['nprobe']}"
+            self.stdout.write(f"{label:<14}{row['recall']:>10.3f}{row['p50_ms']:>8.2f}ms{row['p99_ms']:>8.2f}ms")
+
+    def benchmark_tenant(self, options):
+        """
+        recall@k of approximate_search (ANN shortlist reranked by exact
+        cosine) against SemanticIndex.search, the exact semantic ranking,
+        with the tenant's jobs as queries (its candidates if it has none).
+        """
+        from core.models import Job
+        from ai_engine.ml_models.semantic_index import job_document
+        from ai_engine.utils.semantic_matching import (
+            SEMANTIC_JOB_FIELDS,
+            approximate_search,
+            ensure_ann_index,
+            ensure_semantic_index,
+        )
+
+        tenant_id, k = options['tenant'], options['k']
+        index = ensure_semantic_index(tenant_id, 'candidates')
+        if not len(index):
+            raise CommandError(f"Tenant {tenant_id} has no candidates")
+        started = time.perf_counter()
+        ann = ensure_ann_index(tenant_id)
+        build_seconds = time.perf_counter() - started
+
+        rng = np.random.default_rng(1)
+        jobs = list(Job.objects.filter(tenant_id=tenant_id).values_list(*SEMANTIC_JOB_FIELDS))
+        if jobs:
+            picked = rng.choice(len(jobs), size=min(options['queries'], len(jobs)), replace=False)
+            queries = [index.vectorize(job_document(*jobs[i][1:])) for i in picked]
+            source = 'jobs'
+        else:
+            # Indexed candidates as queries: their own row is always the top hit
+            _, rows = index.export()
+            picked = rng.choice(rows.shape[0], size=min(options['queries'], rows.shape[0]), replace=False)
+            queries = [(rows[i].indices, rows[i].data) for i in picked]
+            source = 'candidates'
+
+        def timed(search):
+            results, latencies = [], []
+            for query in queries:
+                started = time.perf_counter()
+                results.append(search(query)[1])
+                latencies.append((time.perf_counter() - started) * 1000)
+            return results, float(np.percentile(latencies, 50)), float(np.percentile(latencies, 99))
+
+        truth, exact_p50, exact_p99 = timed(lambda query: index.search(query, k))
+        report = {'exact': {'recall': 1.0, 'p50_ms': exact_p50, 'p99_ms': exact_p99}, 'ivf': []}
+        for nprobe in options['nprobe']:
+            found, p50, p99 = timed(
+                lambda query: approximate_search(tenant_id, 'candidates', query, k, nprobe=nprobe, shortlist=options['shortlist'])
+            )
+            report['ivf'].append({
+                'nprobe': nprobe,
+                'recall': float(np.mean([recall_at_k(scores, exact) for scores, exact in zip(found, truth)])),
+                'p50_ms': p50,
+                'p99_ms': p99,
+            })
+        description = (
+            f"tenant {tenant_id}: {len(index)} candidates, embeddings x {ann.dim} in {ann.n_lists} lists "
+            f"(ready in {build_seconds:.1f}s), {len(queries)} {source} as queries, "
+            f"recall against exact semantic search"
+        )
+        return report, description
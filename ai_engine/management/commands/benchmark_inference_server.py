@@ -0,0 +1,101 @@
+# ai_engine/management/commands/benchmark_inference_server.py
+
+from django.core.management.base import BaseCommand, CommandError
+import multiprocessing
+import os
+import tempfile
+import time
+import numpy as np
+from ai_engine.ml_models.global_ai import GLOBAL_MODEL_PATH
+from ai_engine.ml_models.inference_client import InferenceClient
+from ai_engine.ml_models.inference_server import InferenceServer
+from ai_engine.ml_models.registry import model_registry
+from ai_engine.ml_models.tenant_ai import resolve_tenant_model_path
+
+def _serve(socket_path, max_wait):
+    InferenceServer(socket_path, max_wait=max_wait).serve_forever()
+
+def _client_worker(mode, socket_path, tenant_id, n_features, requests, barrier, results):
+    """Score single rows back to back, like a web worker under load."""
+    if mode == 'server':
+        client = InferenceClient(socket_path)
+        score = lambda row: client.predict(tenant_id, row[np.newaxis])
+    else:
+        path = GLOBAL_MODEL_PATH if tenant_id is None else resolve_tenant_model_path(tenant_id)
+        model = model_registry.get(path)
+        score = lambda row: model.predict_proba(row[np.newaxis])[:, 1]
+    rows = np.random.default_rng(os.getpid()).random((requests, n_features))
+    score(rows[0])
+    barrier.wait()
+    started = time.time()
+    latencies = []
+    for row in rows:
+        t0 = time.perf_counter()
+        score(row)
+        latencies.append(time.perf_counter() - t0)
+    results.put((started, time.time(), latencies))
+
+class Command(BaseCommand):
+    help = 'Compare single-prediction throughput in-process vs through the micro-batching inference server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant-id', type=int, default=None, help='Tenant whose model is scored (default: global)')
+        parser.add_argument('--clients', type=int, default=8, help='Concurrent client processes')
+        parser.add_argument('--requests', type=int, default=200, help='Single-row requests per client')
+        parser.add_argument('--max-wait-ms', type=float, default=2.0, help='Server batching window')
+
+    def handle(self, *args, **options):
+        tenant_id = options['tenant_id']
+        path = GLOBAL_MODEL_PATH if tenant_id is None else resolve_tenant_model_path(tenant_id)
+        if not os.path.isfile(path):
+            raise CommandError(f"Model not found at {path}")
+        n_features = model_registry.get(path).n_features_in_
+
+        ctx = multiprocessing.get_context('spawn')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            socket_path = os.path.join(tmpdir, 'inference.sock')
+            server = ctx.Process(target=_serve, args=(socket_path, options['max_wait_ms'] / 1000), daemon=True)
+            server.start()
+            try:
+                self._wait_for_socket(socket_path)
+                self.stdout.write(f"Model: {path}, clients: {options['clients']}, requests/client: {options['requests']}")
+                self.stdout.write(f"{'mode':<12}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+                for mode in ('in-process', 'server'):
+                    throughput, p50, p99 = self._run_clients(ctx, mode, socket_path, tenant_id, n_features, options)
+                    self.stdout.write(f"{mode:<12}{throughput:>10.0f}{p50:>10.2f}{p99:>10.2f}")
+                stats = InferenceClient(socket_path).stats()
+                self.stdout.write(
+                    f"Server batches: {stats['batches']}, "
+                    f"avg requests per batch: {stats['avg_requests_per_batch']:.1f}"
+                )
+            finally:
+                server.terminate()
+                server.join()
+
+    def _wait_for_socket(self, socket_path, timeout=30.0):
+        deadline = time.monotonic() + timeout
+        while not os.path.exists(socket_path):
+            if time.monotonic() > deadline:
+                raise CommandError("Inference server did not start")
+            time.sleep(0.05)
+
+    def _run_clients(self, ctx, mode, socket_path, tenant_id, n_features, options):
+        clients = options['clients']
+        barrier = ctx.Barrier(clients)
+        results = ctx.Queue()
+        processes = [
+            ctx.Process(
+                target=_client_worker,
+                args=(mode, socket_path, tenant_id, n_features, options['requests'], barrier, results),
+            )
+            for _ in range(clients)
+        ]
+        for process in processes:
+            process.start()
+        measurements = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        elapsed = max(m[1] for m in measurements) - min(m[0] for m in measurements)
+        latencies = np.concatenate([m[2] for m in measurements]) * 1000
+        throughput = latencies.size / elapsed if elapsed > 0 else 0.0
+        return throughput, np.percentile(latencies, 50), np.percentile(latencies, 99)
@@ -0,0 +1,97 @@
+# ai_engine/management/commands/benchmark_model_memory.py
+
+from django.core.management.base import BaseCommand, CommandError
+import multiprocessing
+import os
+import resource
+import tempfile
+import numpy as np
+from ai_engine.ml_models.artifacts import load_estimator, load_model_artifact, save_model_artifact
+from ai_engine.ml_models.compiled_forest import CompiledForest
+from ai_engine.ml_models.global_ai import GLOBAL_MODEL_PATH
+
+# (label, inference backend)
+MODES = [('pickle', 'sklearn'), ('mmap', 'mmap'), ('compiled', 'compiled')]
+
+def _memory_usage():
+    """
+    Return this process' memory in kB: rss, pss (proportional share of
+    shared pages) and private. pss/private are only available on Linux.
+    """
+    usage = {'rss': None, 'pss': None, 'private': None}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            fields = {}
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1])
+        usage['rss'] = fields.get('Rss')
+        usage['pss'] = fields.get('Pss')
+        usage['private'] = fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    except OSError:
+        usage['rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage
+
+def _measure_worker(path, backend, rows, barrier, results):
+    """Load the model and score a batch, then report memory growth."""
+    before = _memory_usage()
+    model = load_model_artifact(path, backend=backend)
+    X = np.random.default_rng(0).random((rows, model.n_features_in_), dtype=np.float32)
+    model.predict_proba(X)
+    # Measure while every worker holds the model, like a live worker pool
+    barrier.wait()
+    after = _memory_usage()
+    barrier.wait()
+    results.put({
+        key: (after[key] - before[key]) if after[key] is not None else None
+        for key in after
+    })
+
+class Command(BaseCommand):
+    help = 'Benchmark per-worker memory of pickled vs memory-mapped model loading'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model-path', type=str, default=GLOBAL_MODEL_PATH, help='Model file to load')
+        parser.add_argument('--workers', type=int, default=4, help='Number of concurrent worker processes')
+        parser.add_argument('--rows', type=int, default=1000, help='Rows scored by each worker')
+
+    def handle(self, *args, **options):
+        path = options['model_path']
+        workers = options['workers']
+        if not os.path.isfile(path):
+            raise CommandError(f"Model not found at {path}")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            if not isinstance(load_model_artifact(path), CompiledForest):
+                # Legacy pickle without tree arrays: re-save a copy in the new layout
+                self.stdout.write("No tree arrays sidecar found; converting a temporary copy")
+                path = save_model_artifact(load_estimator(path), os.path.join(tmpdir, os.path.basename(path)))
+
+            self.stdout.write(f"Model: {path} ({os.path.getsize(path) / 1024 / 1024:.1f} MB), workers: {workers}")
+            self.stdout.write(f"{'mode':<10}{'RSS/worker MB':>16}{'PSS/worker MB':>16}{'private/worker MB':>20}")
+            for mode, backend in MODES:
+                results = self._run_workers(path, backend, workers, options['rows'])
+                row = [self._average_mb(results, key) for key in ('rss', 'pss', 'private')]
+                self.stdout.write(f"{mode:<10}{row[0]:>16}{row[1]:>16}{row[2]:>20}")
+
+    def _run_workers(self, path, backend, workers, rows):
+        ctx = multiprocessing.get_context('spawn')
+        barrier = ctx.Barrier(workers)
+        results = ctx.Queue()
+        processes = [
+            ctx.Process(target=_measure_worker, args=(path, backend, rows, barrier, results))
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        measurements = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        return measurements
+
+    def _average_mb(self, results, key):
+        values = [r[key] for r in results if r[key] is not None]
+        if not values:
+            return 'n/a'
+        return f"{sum(values) / len(values) / 1024:.1f}"
@@ -0,0 +1,35 @@
+# ai_engine/management/commands/build_training_dataset.py
+
+import os
+import time
+from django.core.management.base import BaseCommand
+from ai_engine.utils.training_dataset import build_tenant_dataset, load_dataset, merge_datasets, save_dataset
+from core.models import Tenant
+
+class Command(BaseCommand):
+    help = 'Build labeled job-candidate training matrices per tenant from submissions, interviews and offers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=int, help='Tenant id (default: all tenants)')
+        parser.add_argument('--output-dir', type=str, default='models/datasets', help='Directory for tenant_<id>.npz files')
+        parser.add_argument('--full', action='store_true', help='Rebuild from scratch instead of from the saved watermark')
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.all()
+        if options['tenant'] is not None:
+            tenants = tenants.filter(id=options['tenant'])
+        os.makedirs(options['output_dir'], exist_ok=True)
+
+        for tenant in tenants:
+            path = os.path.join(options['output_dir'], f"tenant_{tenant.id}.npz")
+            previous = None
+            if not options['full'] and os.path.isfile(path):
+                previous = load_dataset(path)
+            started = time.perf_counter()
+            update = build_tenant_dataset(tenant, previous.watermark if previous else None)
+            dataset = merge_datasets(previous, update)
+            save_dataset(dataset, path)
+            self.stdout.write(
+                f"Tenant {tenant.id}: {len(update.y)} new/changed pairs, {len(dataset.y)} total "
+                f"({int(dataset.y.sum())} fit) in {time.perf_counter() - started:.2f}s -> {path}"
+            )
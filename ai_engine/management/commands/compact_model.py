@@ -0,0 +1,120 @@
+# ai_engine/management/commands/compact_model.py
+
+import os
+import tempfile
+from django.core.management.base import BaseCommand, CommandError
+from ai_engine.ml_models.artifacts import current_model_version, load_estimator, save_model_artifact, save_model_version
+from ai_engine.ml_models.compaction import artifact_report, compact_forest
+from ai_engine.ml_models.global_ai import GLOBAL_MODEL_PATH
+from ai_engine.ml_models.registry import model_registry
+from ai_engine.ml_models.tenant_ai import get_tenant_model_path
+from ai_engine.ml_models.training_data import load_training_matrix
+from ai_engine.utils.model_metadata import record_model_version
+
+REPORT_ROWS = [
+    ('pickle_bytes', 'Pickle size', lambda v: f"{v / 1024:.0f} KB"),
+    ('tree_arrays_bytes', 'Tree arrays size', lambda v: f"{v / 1024:.0f} KB"),
+    ('in_memory_bytes', 'In memory', lambda v: f"{v / 1024:.0f} KB"),
+    ('trees', 'Trees', str),
+    ('nodes', 'Nodes', str),
+    ('load_seconds', 'Load time', lambda v: f"{v * 1000:.1f} ms"),
+    ('latency_p50_ms', 'Latency p50', lambda v: f"{v:.3f} ms"),
+    ('latency_p99_ms', 'Latency p99', lambda v: f"{v:.3f} ms"),
+    ('accuracy', 'Accuracy', lambda v: f"{v:.4f}"),
+]
+
+class Command(BaseCommand):
+    help = 'Shrink a forest model (depth/leaf caps, fewer trees, float32 arrays) and report the trade-off'
+
+    def add_arguments(self, parser):
+        parser.add_argument('data_path', type=str, help='Labeled evaluation data (.csv, .parquet or .npz)')
+        parser.add_argument('--tenant', type=int, help='Compact this tenant\'s model (default: the global model)')
+        parser.add_argument('--max-depth', type=int, help='Cut every tree to this depth')
+        parser.add_argument('--max-leaf-nodes', type=int, help='Keep at most this many leaves per tree')
+        parser.add_argument('--max-trees', type=int, help='Keep only the trees contributing most on the data')
+        parser.add_argument('--keep-float64', action='store_true', help='Keep float64 tree arrays and an uncompressed pickle')
+        parser.add_argument(
+            '--max-accuracy-drop', type=float, default=0.01,
+            help='Do not register the compacted model if accuracy drops by more than this'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only report; do not register a new version')
+
+    def handle(self, *args, **options):
+        tenant = None
+        model_path = GLOBAL_MODEL_PATH
+        if options['tenant'] is not None:
+            from core.models import Tenant
+            tenant = Tenant.objects.get(id=options['tenant'])
+            model_path = get_tenant_model_path(tenant.id)
+        if not os.path.isfile(model_path):
+            raise CommandError(f"No trained model at {model_path}")
+
+        X, y, _, stats = load_training_matrix(options['data_path'])
+        self.stdout.write(f"Evaluating on {stats['rows_used']} rows")
+        original = load_estimator(model_path)
+        if not hasattr(original, 'estimators_'):
+            raise CommandError(f"{type(original).__name__} is not a forest")
+        compact = not options['keep_float64']
+        compacted = compact_forest(
+            original,
+            max_depth=options['max_depth'],
+            max_leaf_nodes=options['max_leaf_nodes'],
+            max_trees=options['max_trees'],
+            X=X, y=y,
+        )
+
+        before = artifact_report(model_path, X, y)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            candidate_path = save_model_artifact(compacted, os.path.join(tmpdir, 'compacted.pkl'), compact=compact)
+            after = artifact_report(candidate_path, X, y)
+        self._write_report(before, after)
+
+        accuracy_drop = before['accuracy'] - after['accuracy']
+        if options['dry_run']:
+            return
+        if accuracy_drop > options['max_accuracy_drop']:
+            raise CommandError(
+                f"Accuracy drops by {accuracy_drop:.4f} (> {options['max_accuracy_drop']}); not registering"
+            )
+
+        source_version = current_model_version(model_path)
+        save_model_version(compacted, model_path, compact=compact)
+        model_registry.invalidate(model_path)
+        current = self._active_metadata(tenant)
+        metadata = record_model_version(
+            model_path, 'tenant' if tenant else 'global',
+            tenant=tenant,
+            training_samples=current.training_samples if current else 0,
+            features_count=current.features_count if current else X.shape[1],
+            feedback_watermark=current.feedback_watermark if current else None,
+            hyperparameters={
+                **(current.hyperparameters if current else original.get_params()),
+                'n_estimators': len(compacted.estimators_),
+                'compaction': {
+                    'source_version': source_version[0] if source_version else None,
+                    'max_depth': options['max_depth'],
+                    'max_leaf_nodes': options['max_leaf_nodes'],
+                    'max_trees': options['max_trees'],
+                    'float32': compact,
+                    'before': before,
+                    'after': after,
+                },
+            },
+        )
+        self.stdout.write(self.style.SUCCESS(f"Registered compacted model as v{metadata.version}"))
+
+    def _active_metadata(self, tenant):
+        from ai_engine.models import AIModelMetadata
+        return AIModelMetadata.objects.filter(
+            tenant=tenant, model_type='tenant' if tenant else 'global', status='active'
+        ).first()
+
+    def _write_report(self, before, after):
+        self.stdout.write(f"{'':<18}{'original':>14}{'compacted':>14}{'change':>10}")
+        for key, label, fmt in REPORT_ROWS:
+            change = ''
+            if key == 'accuracy':
+                change = f"{after[key] - before[key]:+.4f}"
+            elif before[key]:
+                change = f"{(after[key] - before[key]) / before[key]:+.0%}"
+            self.stdout.write(f"{label:<18}{fmt(before[key]):>14}{fmt(after[key]):>14}{change:>10}")
@@ -0,0 +1,49 @@
+# ai_engine/management/commands/gc_model_store.py
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from ai_engine.utils.model_store import adopt_legacy_versions, collect_garbage, store_usage
+
+def _mb(nbytes):
+    return f"{nbytes / 1024 / 1024:.1f} MB"
+
+class Command(BaseCommand):
+    help = 'Garbage collect unreferenced model blobs and report disk saved by deduplication'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age-seconds', type=int,
+            default=getattr(settings, 'AI_MODEL_STORE_GC_MIN_AGE_SECONDS', 3600),
+            help='Never remove blobs younger than this'
+        )
+        parser.add_argument(
+            '--adopt-legacy', action='store_true',
+            help='First move model versions saved before the store into it'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be removed')
+
+    def handle(self, *args, **options):
+        if options['adopt_legacy'] and not options['dry_run']:
+            self.stdout.write(f"Moved {adopt_legacy_versions()} legacy model files into the store")
+        result = collect_garbage(options['min_age_seconds'], dry_run=options['dry_run'])
+        verb = 'Would remove' if options['dry_run'] else 'Removed'
+        self.stdout.write(
+            f"{verb} {len(result['removed'])} unreferenced blobs ({_mb(result['freed_bytes'])}); "
+            f"{result['kept']} kept"
+        )
+
+        usage = store_usage()
+        self.stdout.write(f"{'Scope':<14}{'Versions':>9}{'Blobs':>7}{'Shared':>8}{'Logical':>12}")
+        for scope in usage['scopes']:
+            missing = f"  ({scope['missing_blobs']} missing)" if scope['missing_blobs'] else ''
+            self.stdout.write(
+                f"{scope['scope']:<14}{scope['versions']:>9}{scope['blobs']:>7}"
+                f"{scope['shared_blobs']:>8}{_mb(scope['logical_bytes']):>12}{missing}"
+            )
+        totals = usage['totals']
+        saved = totals['saved_bytes'] / totals['logical_bytes'] if totals['logical_bytes'] else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['versions']} versions in {totals['blobs']} blobs: {_mb(totals['stored_bytes'])} stored "
+            f"for {_mb(totals['logical_bytes'])} of versions, {_mb(totals['saved_bytes'])} ({saved:.0%}) saved; "
+            f"{_mb(totals['unreferenced_bytes'])} unreferenced"
+        ))
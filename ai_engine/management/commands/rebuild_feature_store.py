@@ -0,0 +1,29 @@
+# ai_engine/management/commands/rebuild_feature_store.py
+
+import time
+from django.core.management.base import BaseCommand
+from ai_engine.utils.candidate_retrieval import rebuild_candidate_index
+from ai_engine.utils.entity_features import rebuild_feature_store
+from ai_engine.utils.semantic_matching import rebuild_ann_index, rebuild_semantic_index
+from core.models import Tenant
+
+class Command(BaseCommand):
+    help = 'Recompute the per-tenant candidate and job feature store, candidate index, semantic vectors and ANN index from the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=int, help='Tenant id (default: all tenants)')
+
+    def handle(self, *args, **options):
+        tenant_ids = Tenant.objects.values_list('id', flat=True)
+        if options['tenant'] is not None:
+            tenant_ids = tenant_ids.filter(id=options['tenant'])
+        for tenant_id in tenant_ids:
+            started = time.perf_counter()
+            candidates, jobs = rebuild_feature_store(tenant_id)
+            rebuild_candidate_index(tenant_id)
+            rebuild_semantic_index(tenant_id, 'candidates')
+            rebuild_semantic_index(tenant_id, 'jobs')
+            rebuild_ann_index(tenant_id)
+            self.stdout.write(
+                f"Tenant {tenant_id}: {candidates} candidates, {jobs} jobs in {time.perf_counter() - started:.2f}s"
+            )
@@ -0,0 +1,141 @@
+# ai_engine/management/commands/retrain_all_tenants.py
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import multiprocessing
+import os
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from ai_engine.models import AIMatchingResult
+from ai_engine.utils.bulk_retraining import (
+    RetrainState,
+    estimate_training_bytes,
+    physical_memory_bytes,
+    retrain_tenant,
+)
+from ai_engine.utils.feedback_training import FEEDBACK_FEATURES
+from ai_engine.utils.training_jobs import setup_worker_process
+from core.models import Tenant
+
+class Command(BaseCommand):
+    help = 'Retrain every tenant model from database feedback in parallel, resuming interrupted runs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Parallel training processes')
+        parser.add_argument(
+            '--memory-budget-mb', type=int,
+            default=getattr(settings, 'AI_RETRAIN_MEMORY_BUDGET_MB', None),
+            help='Estimated memory all running trainings may use together (default: half of RAM)'
+        )
+        parser.add_argument(
+            '--state-file', type=str, default='models/retrain_all_tenants.state.json',
+            help='Progress file used to resume an interrupted run'
+        )
+        parser.add_argument('--restart', action='store_true', help='Ignore progress from an interrupted run')
+
+    def handle(self, *args, **options):
+        state = RetrainState.load(options['state_file'])
+        if options['restart']:
+            state.clear()
+        elif state.results:
+            self.stdout.write(f"Resuming: {sum(map(state.is_done, state.results))} tenants already done")
+
+        budget = self._memory_budget(options['memory_budget_mb'])
+        labeled = dict(
+            AIMatchingResult.objects.filter(actual_outcome__isnull=False)
+            .values('tenant_id').annotate(n=Count('id')).values_list('tenant_id', 'n')
+        )
+        # Largest tenants first so the longest trainings don't start last
+        pending = sorted(
+            (tenant_id for tenant_id in Tenant.objects.values_list('id', flat=True) if not state.is_done(tenant_id)),
+            key=lambda tenant_id: -labeled.get(tenant_id, 0),
+        )
+        estimates = {
+            tenant_id: estimate_training_bytes(labeled.get(tenant_id, 0), len(FEEDBACK_FEATURES))
+            for tenant_id in pending
+        }
+        workers = max(1, options['workers'])
+        self.stdout.write(
+            f"Retraining {len(pending)} tenants with {workers} workers, "
+            f"memory budget {budget / 1024 / 1024:.0f} MB"
+        )
+
+        started = time.perf_counter()
+        inflight = {}  # future -> tenant id
+        inflight_bytes = 0
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=setup_worker_process,
+        )
+        try:
+            while pending or inflight:
+                # Admit the largest tenants that fit the remaining budget;
+                # a tenant larger than the whole budget runs alone
+                for tenant_id in list(pending):
+                    if len(inflight) >= workers:
+                        break
+                    if inflight and inflight_bytes + estimates[tenant_id] > budget:
+                        continue
+                    pending.remove(tenant_id)
+                    inflight[pool.submit(retrain_tenant, tenant_id)] = tenant_id
+                    inflight_bytes += estimates[tenant_id]
+
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    tenant_id = inflight.pop(future)
+                    inflight_bytes -= estimates[tenant_id]
+                    try:
+                        summary = future.result()
+                    except Exception as e:
+                        summary = {'tenant_id': tenant_id, 'status': 'failed', 'error': str(e), 'seconds': 0.0}
+                    state.record(summary)
+                    self._write_result(summary)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING(
+                f"Interrupted; rerun to resume ({len(pending) + len(inflight)} tenants left)"
+            ))
+            pool.shutdown(wait=False, cancel_futures=True)
+            return
+        pool.shutdown()
+
+        self._write_summary(state, time.perf_counter() - started)
+        if all(state.is_done(tenant_id) for tenant_id in state.results):
+            state.clear()
+
+    def _memory_budget(self, budget_mb):
+        if budget_mb:
+            return budget_mb * 1024 * 1024
+        total = physical_memory_bytes()
+        return total // 2 if total else 4 * 1024 ** 3
+
+    def _write_result(self, summary):
+        if summary['status'] == 'completed':
+            self.stdout.write(self.style.SUCCESS(
+                f"Tenant {summary['tenant_id']}: v{summary['version']} in {summary['seconds']:.1f}s"
+            ))
+        elif summary['status'] == 'skipped':
+            self.stdout.write(f"Tenant {summary['tenant_id']}: skipped ({summary['error']})")
+        else:
+            self.stdout.write(self.style.ERROR(f"Tenant {summary['tenant_id']}: failed ({summary['error']})"))
+
+    def _write_summary(self, state, elapsed):
+        self.stdout.write(f"\n{'tenant':>8}{'status':>11}{'seconds':>9}{'samples':>9}{'accuracy':>10}{'f1':>8}")
+        for tenant_id, summary in sorted(state.results.items()):
+            accuracy = summary.get('accuracy')
+            f1 = summary.get('f1_score')
+            self.stdout.write(
+                f"{tenant_id:>8}{summary['status']:>11}{summary['seconds']:>9.1f}"
+                f"{summary.get('samples', '-'):>9}"
+                f"{f'{accuracy:.3f}' if accuracy is not None else '-':>10}"
+                f"{f'{f1:.3f}' if f1 is not None else '-':>8}"
+            )
+        counts = {}
+        for summary in state.results.values():
+            counts[summary['status']] = counts.get(summary['status'], 0) + 1
+        training_seconds = sum(summary['seconds'] for summary in state.results.values())
+        self.stdout.write(
+            f"Finished in {elapsed:.1f}s ({training_seconds:.1f}s of training): "
+            + ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+        )
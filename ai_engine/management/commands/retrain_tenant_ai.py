@@ -1,9 +1,12 @@
 # ai_engine/management/commands/retrain_tenant_ai.py
 
 from django.core.management.base import BaseCommand
+from django.utils import timezone
 import pandas as pd
-from ai_engine.ml_models.tenant_ai import train_tenant_model
+from ai_engine.ml_models.tenant_ai import get_tenant_model_path, train_tenant_model
+from ai_engine.utils.model_metadata import record_model_version
 from core.models import Tenant
+from ._tuning import add_tuning_arguments, tune_from_options
 
 class Command(BaseCommand):
     help = 'Retrain AI model for a specific tenant'
@@ -11,13 +14,25 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('tenant_id', type=int, help='Tenant ID')
         parser.add_argument('csv_path', type=str, help='Path to tenant training CSV file')
+        add_tuning_arguments(parser)
 
     def handle(self, *args, **options):
         tenant_id = options['tenant_id']
         csv_path = options['csv_path']
         df = pd.read_csv(csv_path)
         feature_cols = [c for c in df.columns if c not in {"fit_label"}]
-        model = train_tenant_model(tenant_id, df[feature_cols], df["fit_label"])
+        started = timezone.now()
+        params, tuning_fields = tune_from_options(df[feature_cols], df["fit_label"], options, self.stdout)
+        model = train_tenant_model(tenant_id, df[feature_cols], df["fit_label"], params)
+        metadata = record_model_version(
+            get_tenant_model_path(tenant_id), 'tenant',
+            tenant=Tenant.objects.get(id=tenant_id),
+            training_samples=len(df),
+            features_count=len(feature_cols),
+            training_duration=timezone.now() - started,
+            hyperparameters=model.get_params(),
+            **tuning_fields,
+        )
         self.stdout.write(self.style.SUCCESS(
-            f"Tenant {tenant_id} model retrained and saved. Features: {feature_cols}"
+            f"Tenant {tenant_id} model retrained and saved as v{metadata.version}. Features: {feature_cols}"
         ))
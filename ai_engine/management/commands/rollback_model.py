@@ -0,0 +1,36 @@
+# ai_engine/management/commands/rollback_model.py
+
+from django.core.management.base import BaseCommand, CommandError
+from ai_engine.models import AIModelMetadata
+from ai_engine.utils.model_metadata import activate_model_version
+
+class Command(BaseCommand):
+    help = 'Serve an earlier version of the global or a tenant model again (a pointer flip, no retraining)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=int, help='Roll back this tenant\'s model (default: the global model)')
+        parser.add_argument('--to-version', type=str, help='Version to serve, e.g. 1.0.3 (default: the previous one)')
+
+    def handle(self, *args, **options):
+        tenant_id = options['tenant']
+        rows = AIModelMetadata.objects.filter(
+            tenant_id=tenant_id, model_type='tenant' if tenant_id is not None else 'global'
+        ).exclude(model_path__startswith='ref:')
+        active = rows.filter(status='active').first()
+        if options['to_version']:
+            target = rows.filter(version=options['to_version']).first()
+        else:
+            earlier = rows.filter(status='deprecated')
+            if active is not None:
+                earlier = earlier.filter(created_at__lt=active.created_at)
+            target = earlier.order_by('-created_at').first()
+        if target is None:
+            raise CommandError("No such model version to roll back to")
+        if target.status == 'failed':
+            raise CommandError(f"Version {target.version} failed validation; not serving it")
+        try:
+            activate_model_version(target)
+        except FileNotFoundError as e:
+            raise CommandError(str(e))
+        previous = f" (was v{active.version})" if active is not None and active.pk != target.pk else ''
+        self.stdout.write(self.style.SUCCESS(f"Now serving v{target.version}{previous}"))
@@ -0,0 +1,48 @@
+# ai_engine/management/commands/run_inference_server.py
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ai_engine.ml_models.inference_server import (
+    DEFAULT_MAX_BATCH_ROWS,
+    DEFAULT_MAX_WAIT,
+    InferenceServer,
+)
+
+class Command(BaseCommand):
+    help = 'Run the local micro-batching inference server on a Unix socket'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--socket', type=str, default=getattr(settings, 'AI_INFERENCE_SOCKET', None),
+            help='Unix socket path (defaults to AI_INFERENCE_SOCKET)'
+        )
+        parser.add_argument(
+            '--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT * 1000,
+            help='How long to wait for more requests before scoring a batch'
+        )
+        parser.add_argument(
+            '--max-batch-rows', type=int, default=DEFAULT_MAX_BATCH_ROWS,
+            help='Maximum rows per batched predict_proba call'
+        )
+
+    def handle(self, *args, **options):
+        socket_path = options['socket']
+        if not socket_path:
+            raise CommandError("No socket path: pass --socket or set AI_INFERENCE_SOCKET")
+        server = InferenceServer(
+            socket_path,
+            max_wait=options['max_wait_ms'] / 1000,
+            max_batch_rows=options['max_batch_rows'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Inference server listening on {socket_path}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            stats = server.stats()
+            self.stdout.write(
+                f"Served {stats['requests']} requests in {stats['batches']} batches "
+                f"({stats['avg_requests_per_batch']:.1f} requests per batch)"
+            )
@@ -0,0 +1,98 @@
+# ai_engine/management/commands/run_training_worker.py
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from ai_engine.utils.training_jobs import (
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_MAX_ATTEMPTS,
+    claim_jobs,
+    default_worker_id,
+    heartbeat,
+    reclaim_stale_jobs,
+    release_jobs,
+    run_training_job,
+    setup_worker_process,
+)
+
+class Command(BaseCommand):
+    help = 'Run a worker that claims and executes pending ModelTrainingQueue jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int,
+            default=getattr(settings, 'AI_TRAINING_WORKER_CONCURRENCY', None) or os.cpu_count() or 1,
+            help='Jobs run at once, each in its own process'
+        )
+        parser.add_argument(
+            '--lease-seconds', type=int,
+            default=getattr(settings, 'AI_TRAINING_LEASE_SECONDS', DEFAULT_LEASE_SECONDS),
+            help='Reclaim running jobs whose worker has not heartbeated for this long'
+        )
+        parser.add_argument(
+            '--node-max-heavy', type=int,
+            default=getattr(settings, 'AI_TRAINING_NODE_MAX_HEAVY_JOBS', None) or os.cpu_count() or 1,
+            help='CPU-heavy jobs allowed to run at once on this host, across all workers'
+        )
+        parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS, help='Claims before a job is failed')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds between queue polls')
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is drained')
+
+    def handle(self, *args, **options):
+        worker_id = default_worker_id()
+        concurrency = max(1, options['concurrency'])
+        self.stdout.write(f"Training worker {worker_id} started with concurrency {concurrency}")
+        pool = self._make_pool(concurrency)
+        inflight = {}  # future -> job id
+        completed = failed = 0
+        try:
+            while True:
+                reclaim_stale_jobs(options['lease_seconds'], options['max_attempts'])
+                free_slots = concurrency - len(inflight)
+                for job_id in claim_jobs(free_slots, worker_id, options['node_max_heavy']):
+                    inflight[pool.submit(run_training_job, job_id, worker_id)] = job_id
+                    self.stdout.write(f"Claimed job {job_id}")
+                if not inflight:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                # Renew leases while jobs run; a dead worker stops renewing
+                heartbeat(list(inflight.values()), worker_id)
+                done, _ = wait(inflight, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_id = inflight.pop(future)
+                    try:
+                        status = future.result()
+                    except BrokenProcessPool:
+                        # A training process died; requeue everything it held
+                        lost = [job_id] + list(inflight.values())
+                        release_jobs(lost, worker_id, 'training process crashed', options['max_attempts'])
+                        self.stdout.write(self.style.ERROR(f"Worker process crashed; requeued jobs {lost}"))
+                        inflight.clear()
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = self._make_pool(concurrency)
+                        break
+                    if status == 'completed':
+                        completed += 1
+                        self.stdout.write(self.style.SUCCESS(f"Job {job_id} completed"))
+                    else:
+                        failed += 1
+                        self.stdout.write(self.style.ERROR(f"Job {job_id} failed"))
+        except KeyboardInterrupt:
+            release_jobs(list(inflight.values()), worker_id, 'worker stopped')
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self.stdout.write(f"Training worker stopped: {completed} completed, {failed} failed")
+
+    def _make_pool(self, concurrency):
+        return ProcessPoolExecutor(
+            max_workers=concurrency,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=setup_worker_process,
+        )
@@ -1,20 +1,82 @@
 # ai_engine/management/commands/train_global_ai.py
 
-from django.core.management.base import BaseCommand
-import pandas as pd
-from ai_engine.ml_models.global_ai import train_global_model
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from ai_engine.ml_models.global_ai import GLOBAL_MODEL_PATH, train_global_model, train_global_model_from_batches
+from ai_engine.ml_models.training_data import (
+    DEFAULT_CHUNK_ROWS,
+    iter_training_batches,
+    load_training_matrix,
+    peak_rss_bytes,
+)
+from ai_engine.utils.model_metadata import record_model_version
+from ._tuning import add_tuning_arguments, tune_from_options
 
 class Command(BaseCommand):
     help = 'Train global AI model for candidate fit'
 
     def add_arguments(self, parser):
-        parser.add_argument('csv_path', type=str, help='Path to training CSV file')
+        parser.add_argument('csv_path', type=str, help='Path to training data (.csv, .parquet or .npz)')
+        parser.add_argument(
+            '--max-memory-mb', type=int, default=getattr(settings, 'AI_TRAINING_DATA_MAX_MB', 1024),
+            help='Cap on the in-memory training matrix; larger files are uniformly subsampled'
+        )
+        parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help='Rows read per chunk')
+        parser.add_argument(
+            '--chunked', action='store_true',
+            help='Train from every row, chunk by chunk, adding trees per chunk instead of subsampling'
+        )
+        parser.add_argument('--trees-per-chunk', type=int, default=10, help='Trees added per chunk with --chunked')
+        add_tuning_arguments(parser)
 
     def handle(self, *args, **options):
         csv_path = options['csv_path']
-        df = pd.read_csv(csv_path)
-        feature_cols = [c for c in df.columns if c not in {"fit_label"}]
-        model = train_global_model(df[feature_cols], df["fit_label"])
+        if options['chunked'] and options['tune']:
+            raise CommandError("--tune needs the in-memory matrix; it cannot be combined with --chunked")
+        tuning_fields = {}
+        started = timezone.now()
+        load_started = time.perf_counter()
+        if options['chunked']:
+            rows = 0
+            feature_cols = None
+
+            def batches():
+                nonlocal rows, feature_cols
+                for X, y, names in iter_training_batches(csv_path, options['chunk_rows']):
+                    rows += len(X)
+                    feature_cols = names
+                    yield X, y
+
+            model, used, skipped = train_global_model_from_batches(batches(), options['trees_per_chunk'])
+            self.stdout.write(
+                f"Trained on {rows} rows in {used} chunks ({skipped} skipped for missing classes)"
+            )
+        else:
+            X, y, feature_cols, stats = load_training_matrix(
+                csv_path, max_bytes=options['max_memory_mb'] * 1024 * 1024, chunk_rows=options['chunk_rows']
+            )
+            rows = stats['rows_used']
+            self.stdout.write(
+                f"Loaded {stats['rows_used']} of {stats['rows_read']} rows "
+                f"({X.nbytes / 1024 / 1024:.1f} MB) in {stats['load_seconds']:.1f}s"
+            )
+            params, tuning_fields = tune_from_options(X, y, options, self.stdout)
+            model = train_global_model(X, y, params)
+        metadata = record_model_version(
+            GLOBAL_MODEL_PATH, 'global',
+            training_samples=rows,
+            features_count=len(feature_cols),
+            training_duration=timezone.now() - started,
+            hyperparameters={**model.get_params(), 'n_estimators': len(model.estimators_)},
+            **tuning_fields,
+        )
+        peak = peak_rss_bytes()
+        self.stdout.write(
+            f"Total {time.perf_counter() - load_started:.1f}s, peak RSS "
+            + (f"{peak / 1024 / 1024:.0f} MB" if peak else "unknown")
+        )
         self.stdout.write(self.style.SUCCESS(
-            f"Global model trained and saved. Features: {feature_cols}"
+            f"Global model trained and saved as v{metadata.version}. Features: {feature_cols}"
         ))
@@ -0,0 +1,21 @@
+# ai_engine/management/commands/training_queue_report.py
+
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from ai_engine.utils.training_jobs import queue_wait_by_plan
+
+class Command(BaseCommand):
+    help = 'Report training queue wait time by subscription plan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='Only jobs started in the last N days')
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(days=options['days'])
+        stats = queue_wait_by_plan(since)
+        self.stdout.write(f"{'plan':<12}{'started':>9}{'avg wait s':>12}{'max wait s':>12}{'pending':>9}")
+        for plan, row in sorted(stats.items()):
+            avg_wait = f"{row['avg_wait']:.1f}" if row['avg_wait'] is not None else '-'
+            max_wait = f"{row['max_wait']:.1f}" if row['max_wait'] is not None else '-'
+            self.stdout.write(f"{plan:<12}{row['jobs']:>9}{avg_wait:>12}{max_wait:>12}{row['pending']:>9}")
@@ -0,0 +1,39 @@
+# ai_engine/management/commands/update_tenant_ai.py
+
+from django.core.management.base import BaseCommand
+from ai_engine.ml_models.tenant_ai import DEFAULT_INCREMENTAL_TREES
+from ai_engine.utils.feedback_training import UpdateSkipped, incremental_update_tenant
+from core.models import Tenant
+
+class Command(BaseCommand):
+    help = 'Incrementally update tenant AI models with recruiter feedback received since the last update'
+
+    def add_arguments(self, parser):
+        parser.add_argument('tenant_ids', nargs='*', type=int, help='Tenant IDs (default: all tenants)')
+        parser.add_argument(
+            '--trees', type=int, default=DEFAULT_INCREMENTAL_TREES,
+            help='Trees added per update'
+        )
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.all()
+        if options['tenant_ids']:
+            tenants = tenants.filter(id__in=options['tenant_ids'])
+        for tenant in tenants:
+            try:
+                metadata = incremental_update_tenant(tenant, n_new_trees=options['trees'])
+            except UpdateSkipped as e:
+                # The feedback is kept and retried on the next run
+                self.stdout.write(f"Tenant {tenant.id} skipped: {e}")
+                continue
+            except ValueError as e:
+                self.stdout.write(self.style.WARNING(f"Tenant {tenant.id} not updated: {e}"))
+                continue
+            if metadata is None:
+                self.stdout.write(f"Tenant {tenant.id}: no new feedback")
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f"Tenant {tenant.id} model updated to v{metadata.version} with "
+                f"{metadata.incremental_samples} new samples in "
+                f"{metadata.training_duration.total_seconds():.2f}s"
+            ))
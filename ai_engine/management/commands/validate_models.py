@@ -1,22 +1,40 @@
 # ai_engine/management/commands/validate_models.py
 
+import time
 from django.core.management.base import BaseCommand
-from ai_engine.ml_models.global_ai import load_global_model
-from ai_engine.ml_models.tenant_ai import load_tenant_model
-from ai_engine.utils.model_validation import is_model_file_valid
-from core.models import Tenant
+from ai_engine.utils.model_validation import (
+    collect_model_artifacts,
+    record_validation_failures,
+    validate_model_artifacts,
+)
 
 class Command(BaseCommand):
-    help = 'Validate trained global and tenant models'
+    help = 'Validate trained global and tenant models against their manifests'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--deep', action='store_true',
+            help='Also unpickle and score every model in a process pool'
+        )
+        parser.add_argument('--workers', type=int, default=None, help='Parallel checks (default: CPU count)')
 
     def handle(self, *args, **options):
-        ok = is_model_file_valid("models/global/global_ai_model.pkl", load_global_model)
+        started = time.perf_counter()
+        artifacts = collect_model_artifacts()
+        results = validate_model_artifacts(artifacts, deep=options['deep'], workers=options['workers'])
+
+        counts = {True: 0, False: 0, None: 0}
+        for path, (ok, detail) in results.items():
+            counts[ok] += 1
+            served = ", ".join(artifacts[path])
+            if ok:
+                self.stdout.write(self.style.SUCCESS(f"Valid: {served} ({detail})"))
+            elif ok is None:
+                self.stdout.write(self.style.WARNING(f"Unverified: {served} ({detail}; use --deep)"))
+            else:
+                self.stdout.write(self.style.ERROR(f"NOT valid: {served} ({detail}) [{path}]"))
+        marked = record_validation_failures(results)
         self.stdout.write(
-            self.style.SUCCESS("Global model valid") if ok else self.style.ERROR("Global model NOT valid")
+            f"{counts[True]} valid, {counts[False]} invalid, {counts[None]} unverified artifacts "
+            f"in {time.perf_counter() - started:.1f}s; {marked} model records marked failed"
         )
-        for tenant in Tenant.objects.all():
-            ok = is_model_file_valid(f"models/tenants/tenant_{tenant.id}_ai_model.pkl", load_tenant_model)
-            self.stdout.write(
-                self.style.SUCCESS(f"Tenant {tenant.id} model valid")
-                if ok else self.style.ERROR(f"Tenant {tenant.id} model NOT valid")
-            )
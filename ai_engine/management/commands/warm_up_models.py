@@ -0,0 +1,26 @@
+# ai_engine/management/commands/warm_up_models.py
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from ai_engine.utils.model_warmup import run_model_warmup
+
+class Command(BaseCommand):
+    help = 'Preload the global model and recently active tenant models, then report timings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenants', type=int, default=getattr(settings, 'AI_WARMUP_TENANT_COUNT', 10),
+            help='Number of most recently active tenants to preload'
+        )
+        parser.add_argument('--skip-nlp', action='store_true', help='Do not load the spaCy model')
+
+    def handle(self, *args, **options):
+        report = run_model_warmup(options['tenants'], include_nlp=not options['skip_nlp'])
+        for entry in report['models']:
+            label = f"Tenant {entry['tenant_id']}" if entry['tenant_id'] is not None else "Global"
+            self.stdout.write(f"{label} model {entry['path']}: {entry['seconds'] * 1000:.1f} ms")
+        if report['nlp_seconds'] is not None:
+            self.stdout.write(f"spaCy model: {report['nlp_seconds'] * 1000:.1f} ms")
+        for error in report['errors']:
+            self.stdout.write(self.style.ERROR(f"Failed to warm {error['path']}: {error['error']}"))
+        self.stdout.write(self.style.SUCCESS(f"Warm-up finished in {report['duration']:.2f}s"))
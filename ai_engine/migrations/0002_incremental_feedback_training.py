@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0001_initial'),
+        ('core', '0002_alter_user_managers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aimodelmetadata',
+            name='feedback_watermark',
+            field=models.DateTimeField(blank=True, help_text='updated_at of the newest AIMatchingResult feedback already learned from', null=True),
+        ),
+        migrations.AddField(
+            model_name='aimodelmetadata',
+            name='incremental_samples',
+            field=models.IntegerField(default=0, help_text='Labeled samples added by the incremental update that produced this version'),
+        ),
+        migrations.AddIndex(
+            model_name='aimatchingresult',
+            index=models.Index(fields=['tenant', 'job_id', '-match_score'], name='ai_engine_a_tenant__aea947_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aimatchingresult',
+            index=models.Index(fields=['tenant', 'candidate_id'], name='ai_engine_a_tenant__1da74f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aimatchingresult',
+            index=models.Index(fields=['tenant', 'updated_at'], name='ai_engine_a_tenant__87516f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='featureextractionlog',
+            index=models.Index(fields=['tenant', 'extraction_type'], name='ai_engine_f_tenant__15777f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='featureextractionlog',
+            index=models.Index(fields=['entity_id', 'extraction_type'], name='ai_engine_f_entity__16db59_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='modeltrainingqueue',
+            index=models.Index(fields=['status', 'created_at'], name='ai_engine_m_status_4bdbb0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='modeltrainingqueue',
+            index=models.Index(fields=['tenant', 'training_type'], name='ai_engine_m_tenant__9a69b3_idx'),
+        ),
+    ]
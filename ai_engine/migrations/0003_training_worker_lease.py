@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0002_incremental_feedback_training'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modeltrainingqueue',
+            name='attempts',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='modeltrainingqueue',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='modeltrainingqueue',
+            name='worker_id',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0003_training_worker_lease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modeltrainingqueue',
+            name='queue_wait_seconds',
+            field=models.FloatField(blank=True, help_text='Seconds between queueing and the latest start', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0004_training_queue_wait'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aimodelmetadata',
+            name='tuning_results',
+            field=models.JSONField(blank=True, default=dict, help_text='Hyperparameter search that chose this model: scoring, search time, candidates with CV scores and latency'),
+        ),
+    ]
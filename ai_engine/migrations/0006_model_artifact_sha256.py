@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0005_model_tuning_results'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aimodelmetadata',
+            name='artifact_sha256',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='Content-addressed store blob holding this version; rows referencing a blob keep it from garbage collection', max_length=64),
+        ),
+    ]
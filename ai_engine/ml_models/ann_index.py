@@ -0,0 +1,350 @@
+# ai_engine/ml_models/ann_index.py
+
+import time
+from collections import namedtuple
+
+import numpy as np
+from scipy import sparse
+
+from .logged_index import LoggedIndex, contains_sorted, save_npz
+
+# Width of the dense embeddings the index holds. A random projection
+# perturbs each cosine by about 1/sqrt(dim), while related resumes and
+# jobs score only 0.1-0.2: narrower embeddings rank mostly noise. The
+# index costs 4 * dim bytes per vector.
+DEFAULT_EMBEDDING_DIM = 1024
+
+# Nonzeros per input column of the sparse random projection
+PROJECTION_DENSITY = 4
+
+# Inverted lists probed per query: the recall / latency knob
+DEFAULT_NPROBE = 16
+
+# Nearest embeddings passed on to be reranked by exact similarity
+DEFAULT_SHORTLIST = 200
+
+# Training rows sampled per list and Lloyd iterations of the k-means quantizer
+TRAINING_ROWS_PER_LIST = 64
+KMEANS_ITERATIONS = 15
+
+# Rows assigned per matrix product when assigning vectors to lists
+ASSIGN_BATCH_SIZE = 65536
+
+# An indexed vector (float32, L2-normalized)
+VectorEntry = namedtuple('VectorEntry', 'id vector')
+
+_projections = {}
+
+def projection_matrix(n_features, dim=DEFAULT_EMBEDDING_DIM, density=PROJECTION_DENSITY, seed=0):
+    """
+    Fixed sparse random projection (n_features x dim): each input column
+    adds +-1/sqrt(density) to `density` output dimensions, which preserves
+    inner products of sparse vectors in expectation (Johnson-Lindenstrauss).
+    Deterministic, so every process embeds alike without a stored model.
+    """
+    key = (n_features, dim, density, seed)
+    if key not in _projections:
+        rng = np.random.default_rng(seed)
+        columns = rng.integers(0, dim, size=(n_features, density), dtype=np.int32)
+        signs = rng.choice(np.array([-1.0, 1.0], dtype=np.float32), size=(n_features, density))
+        _projections[key] = sparse.csr_matrix(
+            (signs.ravel() / np.sqrt(density), columns.ravel(), np.arange(0, n_features * density + 1, density)),
+            shape=(n_features, dim),
+        )
+    return _projections[key]
+
+def normalize_rows(vectors):
+    """Rows scaled to unit L2 norm (zero rows stay zero), float32."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+def embed(rows, dim=DEFAULT_EMBEDDING_DIM):
+    """Dense unit embeddings of sparse rows (CSR/CSC matrix) via projection_matrix."""
+    return normalize_rows((rows @ projection_matrix(rows.shape[1], dim)).toarray())
+
+def kmeans(vectors, n_clusters, n_iter=KMEANS_ITERATIONS, sample_size=None, seed=0):
+    """
+    Spherical k-means centroids (unit rows) of unit vectors: Lloyd's
+    iterations on a sample, seeded with distinct random rows. Empty
+    clusters are re-seeded with the rows farthest from their centroid.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    n_clusters = max(1, min(n_clusters, n))
+    sample_size = sample_size or n_clusters * TRAINING_ROWS_PER_LIST
+    sample = vectors[np.sort(rng.choice(n, size=min(n, sample_size), replace=False))] if n else vectors
+    centroids = sample[rng.choice(len(sample), size=n_clusters, replace=False)].copy() if len(sample) else sample
+    for _ in range(n_iter):
+        similarity = sample @ centroids.T
+        labels = similarity.argmax(axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        counts = np.bincount(labels, minlength=n_clusters)
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            worst = np.argsort(similarity[np.arange(len(sample)), labels])[:len(empty)]
+            sums[empty[:len(worst)]] = sample[worst]
+        centroids = normalize_rows(sums)
+    return centroids
+
+def assign(vectors, centroids, batch_size=ASSIGN_BATCH_SIZE):
+    """Nearest centroid (largest inner product) of each vector."""
+    labels = np.zeros(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), batch_size):
+        labels[start:start + batch_size] = (vectors[start:start + batch_size] @ centroids.T).argmax(axis=1)
+    return labels
+
+def default_n_lists(n):
+    """About sqrt(n) inverted lists: list scans and centroid scoring cost alike."""
+    return int(max(1, round(np.sqrt(n))))
+
+def top_k(ids, scores, limit):
+    """(ids, scores) of the `limit` best scores, best first (larger id first on ties)."""
+    if len(scores) > limit:
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        ids, scores = ids[best], scores[best]
+    order = np.lexsort((-ids, -scores))
+    return ids[order], scores[order]
+
+def exact_search(ids, vectors, query, limit=10):
+    """Brute-force inner product top-k: the ground truth approximate search is measured against."""
+    return top_k(ids, vectors @ query, limit)
+
+def recall_at_k(approximate_scores, exact_scores, tolerance=1e-5):
+    """
+    Share of the exact top-k the approximate search found, by true score:
+    a result counts if it scores at least the exact k-th best, so ties
+    (duplicate vectors) broken differently are not misses.
+    """
+    if not len(exact_scores):
+        return 1.0
+    hits = int(np.sum(np.asarray(approximate_scores) >= exact_scores[-1] - tolerance))
+    return min(hits, len(exact_scores)) / len(exact_scores)
+
+class IVFSegment:
+    """
+    Immutable inverted-file (IVF) index of unit vectors: k-means centroids
+    partition the vectors into lists stored contiguously (rows of list i
+    are offsets[i]:offsets[i + 1]); a query scores only the rows of the
+    lists whose centroids are closest. One list is an exact flat scan.
+    """
+
+    def __init__(self, ids, vectors, centroids, offsets):
+        self.ids = ids
+        self.vectors = vectors
+        self.centroids = centroids
+        self.offsets = offsets
+        self._order = np.argsort(ids, kind='stable')
+        self._sorted_ids = ids[self._order]
+
+    @classmethod
+    def build(cls, entries, n_lists=1):
+        """Segment of VectorEntry rows (ids must be unique), partitioned into n_lists lists by k-means."""
+        entries = list(entries)
+        ids = np.fromiter((entry.id for entry in entries), dtype=np.int64, count=len(entries))
+        if entries:
+            vectors = normalize_rows(np.stack([entry.vector for entry in entries]))
+        else:
+            vectors = np.zeros((0, DEFAULT_EMBEDDING_DIM), dtype=np.float32)
+        return cls.from_vectors(ids, vectors, n_lists)
+
+    @classmethod
+    def from_vectors(cls, ids, vectors, n_lists=1):
+        """Segment of unit vectors (a float32 array) and their unique ids, partitioned into n_lists lists."""
+        return cls.partition(ids, vectors, cls.train(vectors, n_lists))
+
+    @staticmethod
+    def train(vectors, n_lists):
+        """Centroids of n_lists lists (one list: the mean direction)."""
+        if n_lists > 1 and len(vectors) > n_lists:
+            return kmeans(vectors, n_lists)
+        return normalize_rows(vectors.mean(axis=0, keepdims=True) if len(vectors) else np.zeros((1, vectors.shape[1])))
+
+    @classmethod
+    def partition(cls, ids, vectors, centroids):
+        labels = assign(vectors, centroids) if len(centroids) > 1 else np.zeros(len(ids), dtype=np.int32)
+        order = np.argsort(labels, kind='stable')
+        offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(labels, minlength=len(centroids)))
+        return cls(ids=ids[order], vectors=vectors[order], centroids=centroids, offsets=offsets)
+
+    @classmethod
+    def merge(cls, base, delta, removed_ids):
+        """
+        New segment holding base without removed_ids (and without the ids
+        in delta, which replace their base rows), plus delta, partitioned
+        by the base centroids (no retraining).
+        """
+        removed = np.union1d(np.asarray(removed_ids, dtype=np.int64), delta.ids)
+        keep = ~base.contains(removed)
+        if not len(delta):
+            return cls.partition(base.ids[keep], base.vectors[keep], base.centroids)
+        if not len(base):
+            return cls.partition(delta.ids, delta.vectors, delta.centroids)
+        return cls.partition(
+            np.concatenate([base.ids[keep], delta.ids]),
+            np.concatenate([base.vectors[keep], delta.vectors]),
+            base.centroids,
+        )
+
+    @classmethod
+    def empty(cls):
+        return cls.build([])
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as archive:
+            return cls(**{name: archive[name] for name in archive.files})
+
+    def save(self, path):
+        """Write the segment as .npz under a temporary name, then rename it into place."""
+        save_npz(path, ids=self.ids, vectors=self.vectors, centroids=self.centroids, offsets=self.offsets)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    def contains(self, entity_ids):
+        """Boolean mask of rows whose id is in entity_ids."""
+        mask = np.zeros(len(self.ids), dtype=bool)
+        mask[self._order[contains_sorted(self._sorted_ids, entity_ids)]] = True
+        return mask
+
+    def probe(self, query, nprobe):
+        """(ids, scores) of the rows in the nprobe lists closest to query."""
+        if not len(self.ids):
+            return self.ids, np.zeros(0, dtype=np.float32)
+        if nprobe >= self.n_lists:
+            return self.ids, self.vectors @ query
+        lists = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        # Each list is a contiguous slice: scored in place, not gathered
+        slices = [slice(self.offsets[i], self.offsets[i + 1]) for i in lists]
+        return (
+            np.concatenate([self.ids[rows] for rows in slices]),
+            np.concatenate([self.vectors[rows] @ query for rows in slices]),
+        )
+
+class ANNIndex(LoggedIndex):
+    """
+    Per-tenant approximate nearest neighbor index of dense unit vectors
+    (`ann.<kind>.npz` plus its log, see LoggedIndex). rebuild() trains the
+    IVF lists; vectors added later are scanned exactly until a compaction
+    files them into the existing lists. nprobe trades recall for latency:
+    probing every list is an exact search.
+    """
+
+    segment_class = IVFSegment
+
+    def __init__(self, directory, kind='candidates', nprobe=DEFAULT_NPROBE, **kwargs):
+        self.name = f'ann.{kind}'
+        self.nprobe = nprobe
+        super().__init__(directory, **kwargs)
+
+    def entry_record(self, entry):
+        # [id, vector]
+        return [int(entry.id), [round(value, 6) for value in np.asarray(entry.vector, dtype=np.float32).tolist()]]
+
+    def record_entry(self, record):
+        return VectorEntry(record[0], np.asarray(record[1], dtype=np.float32))
+
+    def rebuild(self, entries, n_lists=None):
+        """
+        Replace the index with `entries`, training about sqrt(n) lists
+        unless n_lists is given. Returns the number of vectors.
+        """
+        entries = list(entries)
+        self._replace_snapshot(IVFSegment.build(entries, n_lists or default_n_lists(len(entries))))
+        return len(entries)
+
+    def rebuild_vectors(self, ids, vectors, n_lists=None):
+        """rebuild() from an id array and a float32 array of unit vectors, without copying them per entry."""
+        self._replace_snapshot(IVFSegment.from_vectors(ids, vectors, n_lists or default_n_lists(len(ids))))
+        return len(ids)
+
+    @property
+    def n_lists(self):
+        with self._lock:
+            self._refresh()
+            return self._base.n_lists
+
+    @property
+    def dim(self):
+        """Width of the indexed vectors."""
+        with self._lock:
+            self._refresh()
+            return self._base.vectors.shape[1]
+
+    def search(self, query, limit=10, nprobe=None, within=None):
+        """
+        Approximate top-k by inner product (cosine, for unit vectors): ids
+        and scores of the `limit` best vectors among the nprobe closest
+        lists and the vectors added since the last compaction, best first.
+        With `within` only those ids are considered.
+        """
+        query = normalize_rows(query)
+        with self._lock:
+            self._refresh()
+            base, delta, masked = self._base, self._delta, self._masked
+        base_ids, base_scores = base.probe(query, nprobe or self.nprobe)
+        if len(masked):
+            keep = ~np.isin(base_ids, masked)
+            base_ids, base_scores = base_ids[keep], base_scores[keep]
+        ids = np.concatenate([base_ids, delta.ids])
+        scores = np.concatenate([base_scores, delta.vectors @ query if len(delta) else base_scores[:0]])
+        if within is not None:
+            keep = np.isin(ids, np.asarray(within, dtype=np.int64))
+            ids, scores = ids[keep], scores[keep]
+        return top_k(ids, scores, limit)
+
+def synthetic_vectors(n, dim=DEFAULT_EMBEDDING_DIM, n_clusters=256, spread=0.6, seed=0):
+    """
+    n unit vectors drawn around n_clusters random directions (the larger
+    spread, the less clustered), a stand-in for real embeddings.
+    """
+    rng = np.random.default_rng(seed)
+    centers = normalize_rows(rng.standard_normal((n_clusters, dim)))
+    labels = rng.integers(0, n_clusters, size=n)
+    noise = rng.standard_normal((n, dim)).astype(np.float32) * (spread / np.sqrt(dim))
+    return normalize_rows(centers[labels] + noise)
+
+def benchmark_recall(vectors, queries, k=10, nprobes=(1, 2, 4, 8, 16, 32), n_lists=None):
+    """
+    recall@k and per-query latency of IVF search at each nprobe against
+    exact search over the same vectors. Returns {'n_lists', 'build_seconds',
+    'exact': {...}, 'ivf': [{'nprobe', 'recall', 'p50_ms', 'p99_ms'}, ...]}.
+    """
+    ids = np.arange(len(vectors), dtype=np.int64)
+    started = time.perf_counter()
+    segment = IVFSegment.build(
+        (VectorEntry(i, vector) for i, vector in zip(ids.tolist(), vectors)), n_lists or default_n_lists(len(vectors))
+    )
+    build_seconds = time.perf_counter() - started
+
+    def timed(search):
+        results, latencies = [], []
+        for query in queries:
+            started = time.perf_counter()
+            results.append(search(query))
+            latencies.append((time.perf_counter() - started) * 1000)
+        return results, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+    truth, exact_p50, exact_p99 = timed(lambda query: exact_search(ids, vectors, query, k)[1])
+    report = {
+        'n_lists': segment.n_lists,
+        'build_seconds': build_seconds,
+        'exact': {'recall': 1.0, 'p50_ms': float(exact_p50), 'p99_ms': float(exact_p99)},
+        'ivf': [],
+    }
+    for nprobe in nprobes:
+        found, p50, p99 = timed(lambda query: top_k(*segment.probe(query, nprobe), k)[1])
+        report['ivf'].append({
+            'nprobe': nprobe,
+            'recall': float(np.mean([recall_at_k(scores, exact) for scores, exact in zip(found, truth)])),
+            'p50_ms': float(p50),
+            'p99_ms': float(p99),
+        })
+    return report
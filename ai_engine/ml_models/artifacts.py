@@ -0,0 +1,515 @@
+# ai_engine/ml_models/artifacts.py
+
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+
+import joblib
+import numpy as np
+
+from .compiled_forest import COMPILED_FOREST_FORMAT, CompiledForest, compact_forest_arrays, compile_forest
+
+# Sidecar file holding the forest compiled to flat, uncompressed NumPy arrays.
+# Workers load it with mmap_mode='r' so all processes on a node share
+# one physical copy through the OS page cache.
+TREE_ARRAYS_SUFFIX = ".trees"
+
+# Sidecar describing a saved model (content hash, size, shape, classes,
+# library version) so it can be validated without unpickling
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_FORMAT = 1
+MODEL_DESCRIPTION_KEYS = ("model_class", "sklearn_version", "n_features", "classes", "n_estimators", "compact")
+
+# joblib compression level of compacted model pickles (only loaded for
+# retraining and the sklearn backend; serving reads the tree arrays)
+COMPACT_PICKLE_COMPRESSION = 3
+
+# Read size when hashing artifacts
+HASH_CHUNK_BYTES = 1024 * 1024
+
+# Inference backends accepted by load_model_artifact
+INFERENCE_BACKENDS = ("mmap", "compiled", "sklearn")
+DEFAULT_INFERENCE_BACKEND = "mmap"
+
+# model_path values starting with this prefix point at another model's
+# artifact instead of a file of their own (e.g. tenants sharing the global model)
+MODEL_REF_PREFIX = "ref:"
+
+# Versioned artifacts kept per model (older ones are pruned on save)
+DEFAULT_KEEP_VERSIONS = 3
+
+# Content-addressed store: versions are symlinks to <dir>/<sha[:2]>/<sha>.pkl
+# blobs (plus their sidecars), so identical models are stored once.
+# Blobs are never overwritten; unreferenced ones are garbage collected
+# (see utils/model_store.py).
+MODEL_STORE_DIR = "models/store"
+BLOB_SUFFIX = ".pkl"
+
+def tree_arrays_path(path):
+    """Return the sidecar path holding the tree arrays for a model file."""
+    return path + TREE_ARRAYS_SUFFIX
+
+def manifest_path(path):
+    """Return the manifest path for a model file."""
+    return path + MANIFEST_SUFFIX
+
+def file_digest(path):
+    """SHA-256 of a file, streamed in HASH_CHUNK_BYTES reads."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def describe_model(model):
+    """Manifest fields describing a fitted estimator."""
+    import sklearn
+
+    classes = getattr(model, "classes_", None)
+    return {
+        "model_class": f"{type(model).__module__}.{type(model).__name__}",
+        "sklearn_version": sklearn.__version__,
+        "n_features": getattr(model, "n_features_in_", None),
+        "classes": np.asarray(classes).tolist() if classes is not None else None,
+        "n_estimators": len(model.estimators_) if hasattr(model, "estimators_") else None,
+    }
+
+def export_tree_arrays(model):
+    """
+    Compile a fitted forest classifier into plain NumPy arrays.
+    Returns None for models that are not single-output tree ensembles.
+    """
+    try:
+        return compile_forest(model).to_arrays()
+    except ValueError:
+        return None
+
+def save_model_artifact(model, path, compact=False):
+    """
+    Persist a model: the full estimator pickle at `path` (used for retraining
+    and cloning) plus, for forests, the mmap-able tree arrays sidecar.
+    Each file is written to a temporary name and renamed into place, so
+    readers never see a partially written file.
+    The sidecar records the pickle's stat signature so a stale sidecar is
+    never paired with a newer pickle.
+    compact=True compresses the pickle and stores float32 thresholds and
+    leaf values (see compiled_forest.compact_forest_arrays).
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if os.path.islink(path):
+        # Replace the version pointer itself, never the version it points at
+        os.remove(path)
+    _atomic_dump(model, path, compress=COMPACT_PICKLE_COMPRESSION if compact else 0)
+    arrays = export_tree_arrays(model)
+    if arrays is not None and compact:
+        arrays = compact_forest_arrays(arrays)
+    sidecar = tree_arrays_path(path)
+    if arrays is None:
+        if os.path.exists(sidecar):
+            os.remove(sidecar)
+    else:
+        arrays["source_stamp"] = _file_stamp(path)
+        _atomic_dump(arrays, sidecar)
+    _write_manifest(path, {**describe_model(model), "compact": bool(compact)})
+    return path
+
+def model_version_path(path, version):
+    """Return the file holding `version` of the model published at `path`."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.v{version}{ext}"
+
+def list_model_versions(path):
+    """Return the version numbers saved for `path`, oldest first."""
+    root, ext = os.path.splitext(path)
+    versions = []
+    for candidate in glob.glob(f"{glob.escape(root)}.v*{ext}"):
+        version = _parse_version(path, candidate)
+        if version is not None:
+            versions.append(version)
+    return sorted(versions)
+
+def current_model_version(path):
+    """
+    Return (version, versioned_path) that `path` currently points at,
+    or None if `path` is not a published versioned model.
+    """
+    if not os.path.islink(path):
+        return None
+    version = _parse_version(path, os.readlink(path))
+    if version is None:
+        return None
+    return version, model_version_path(path, version)
+
+def save_model_version(model, path, keep=DEFAULT_KEEP_VERSIONS, compact=False):
+    """
+    Save `model` as a new immutable version next to `path` and atomically
+    repoint `path` (a symlink) at it. The version itself is a symlink into
+    the content-addressed store (see store_model). Loaders resolve the link once, so a
+    pickle and its sidecar always come from the same version, and running
+    workers pick up the new version through the registry's stat check.
+    Version links beyond the newest `keep` are deleted; their blobs stay in
+    the store until garbage collected.
+    compact is passed to save_model_artifact.
+    Returns (versioned_path, version).
+    """
+    versions = list_model_versions(path)
+    version = versions[-1] + 1 if versions else 1
+    digest = store_model(model, compact=compact)
+    versioned_path = link_model_version(path, version, digest)
+    _publish_version(path, versioned_path)
+    # Keep the new version plus the newest keep - 1 previous ones
+    for old_version in versions[:max(len(versions) - keep + 1, 0)]:
+        _remove_files(model_version_path(path, old_version))
+    return versioned_path, version
+
+def copy_model_artifact(src_path, dst_path):
+    """
+    Copy a saved model and its sidecar without unpickling either.
+    A model in the content-addressed store is not copied: dst_path becomes
+    another link to the same blob.
+    """
+    os.makedirs(os.path.dirname(dst_path) or ".", exist_ok=True)
+    src_path = os.path.realpath(src_path)
+    if store_digest(src_path) is not None:
+        _symlink(src_path, dst_path)
+        _remove_sidecars(dst_path)
+        return dst_path
+    if os.path.islink(dst_path):
+        os.remove(dst_path)
+    tmp_path = _temp_path(dst_path)
+    shutil.copyfile(src_path, tmp_path)
+    os.replace(tmp_path, dst_path)
+    dst_sidecar = tree_arrays_path(dst_path)
+    arrays = _load_sidecar(src_path, mmap_mode="r")
+    if arrays is not None:
+        arrays["source_stamp"] = _file_stamp(dst_path)
+        _atomic_dump(arrays, dst_sidecar)
+    elif os.path.exists(dst_sidecar):
+        os.remove(dst_sidecar)
+    src_manifest = read_manifest(src_path)
+    if src_manifest is not None:
+        _write_manifest(dst_path, {key: src_manifest.get(key) for key in MODEL_DESCRIPTION_KEYS})
+    elif os.path.exists(manifest_path(dst_path)):
+        os.remove(manifest_path(dst_path))
+    return dst_path
+
+def remove_model_artifact(path):
+    """
+    Delete a saved model, its sidecars and all of its versions if present.
+    Only links are removed for versions in the content-addressed store.
+    """
+    for version in list_model_versions(path):
+        _remove_files(model_version_path(path, version))
+    _remove_files(path)
+
+def blob_path(digest, store_dir=None):
+    """Return the store file holding the model pickle with SHA-256 `digest`."""
+    return os.path.join(store_dir or MODEL_STORE_DIR, digest[:2], digest + BLOB_SUFFIX)
+
+def store_digest(path):
+    """
+    Content hash of the store blob `path` resolves to, or None if it is
+    not in the content-addressed store (e.g. a legacy versioned file).
+    """
+    path = os.path.realpath(path)
+    name = os.path.basename(path)
+    digest = name[:-len(BLOB_SUFFIX)] if name.endswith(BLOB_SUFFIX) else ""
+    if len(digest) != 64 or os.path.realpath(blob_path(digest)) != path:
+        return None
+    return digest
+
+def list_store_blobs(store_dir=None):
+    """Return {digest: blob_path} for every complete blob in the store."""
+    blobs = {}
+    pattern = os.path.join(glob.escape(store_dir or MODEL_STORE_DIR), "??", "*" + BLOB_SUFFIX)
+    for candidate in glob.glob(pattern):
+        digest = os.path.basename(candidate)[:-len(BLOB_SUFFIX)]
+        if len(digest) == 64:
+            blobs[digest] = candidate
+    return blobs
+
+def blob_size(path):
+    """Bytes on disk of a saved model: pickle, tree arrays and manifest."""
+    return sum(
+        os.path.getsize(file_path)
+        for file_path in (path, tree_arrays_path(path), manifest_path(path))
+        if os.path.isfile(file_path)
+    )
+
+def remove_store_blob(digest, store_dir=None):
+    """
+    Delete a blob and its sidecars from the store. The pickle goes first,
+    so a half-removed blob is never taken for a complete one.
+    """
+    _remove_files(blob_path(digest, store_dir))
+
+def store_model(model, compact=False, store_dir=None):
+    """
+    Save `model` into the content-addressed store and return its digest
+    (SHA-256 of the pickle). If an identical model is already stored, the
+    new copy is discarded and the existing blob is reused.
+    """
+    store_dir = store_dir or MODEL_STORE_DIR
+    os.makedirs(store_dir, exist_ok=True)
+    staging = _temp_path(os.path.join(store_dir, "incoming")) + BLOB_SUFFIX
+    try:
+        save_model_artifact(model, staging, compact=compact)
+        digest = file_digest(staging)
+        target = blob_path(digest, store_dir)
+        # A blob damaged on disk is replaced by the fresh copy
+        if not os.path.isfile(target) or file_digest(target) != digest:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # The pickle goes last: a blob is complete once it exists.
+            # Renaming keeps its mtime, so the sidecar's stamp still matches.
+            for suffix in (TREE_ARRAYS_SUFFIX, MANIFEST_SUFFIX, ""):
+                if os.path.exists(staging + suffix):
+                    os.replace(staging + suffix, target + suffix)
+    finally:
+        _remove_files(staging)
+    return digest
+
+def store_model_file(path, store_dir=None):
+    """
+    Move an existing model file (with its sidecars) into the store and
+    replace it with a link to the blob. Returns the digest. Readers keep
+    seeing a complete model throughout: the blob is hard linked (or
+    copied) first and the file is then atomically swapped for the link.
+    """
+    digest = store_digest(path)
+    if digest is not None:
+        return digest
+    digest = file_digest(path)
+    target = blob_path(digest, store_dir)
+    if not os.path.isfile(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        for suffix in (TREE_ARRAYS_SUFFIX, MANIFEST_SUFFIX, ""):
+            if os.path.exists(path + suffix):
+                _link_or_copy(path + suffix, target + suffix)
+    _symlink(target, path)
+    _remove_sidecars(path)
+    return digest
+
+def link_model_version(path, version, digest, store_dir=None):
+    """
+    Point `version` of the model published at `path` at a store blob
+    (creating or replacing the version link). Returns the versioned path.
+    """
+    target = blob_path(digest, store_dir)
+    if not os.path.isfile(target):
+        raise FileNotFoundError(f"Model blob {digest} is not in the store")
+    versioned_path = model_version_path(path, version)
+    _symlink(target, versioned_path)
+    return versioned_path
+
+def publish_model_version(path, version, digest=None):
+    """
+    Atomically point `path` at an earlier (or any saved) version, e.g. to
+    roll back. With a digest the version link is recreated first, so
+    versions pruned from disk can be restored as long as their blob is
+    stored. Returns the versioned path.
+    """
+    if digest is not None:
+        versioned_path = link_model_version(path, version, digest)
+    else:
+        versioned_path = model_version_path(path, version)
+        if not os.path.isfile(versioned_path):
+            raise FileNotFoundError(f"No saved version {version} of {path}")
+    _publish_version(path, versioned_path)
+    return versioned_path
+
+def make_model_ref(path):
+    """Return a model_path value that references the artifact at `path`."""
+    return MODEL_REF_PREFIX + path
+
+def load_model_artifact(path, backend=DEFAULT_INFERENCE_BACKEND):
+    """
+    Load a model for inference with the given backend:
+        'mmap'     -- CompiledForest over the memory-mapped tree arrays,
+                      shared between worker processes
+        'compiled' -- CompiledForest with the tree arrays read into
+                      private memory (no page faults on first use)
+        'sklearn'  -- the full unpickled estimator
+    Falls back to the full estimator when no matching sidecar exists.
+    """
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown inference backend {backend!r}, expected one of {INFERENCE_BACKENDS}")
+    # Resolve a version pointer once so pickle and sidecar match
+    path = os.path.realpath(path)
+    if backend != "sklearn":
+        arrays = _load_sidecar(path, mmap_mode="r" if backend == "mmap" else None)
+        if arrays is not None:
+            return CompiledForest(arrays)
+    return joblib.load(path)
+
+def load_estimator(path):
+    """Load the full estimator (e.g. for retraining), bypassing the sidecar."""
+    return joblib.load(path)
+
+def artifact_stamp(path):
+    """
+    Cheap version stamp for a saved model: the version it points at plus
+    stat of the pickle and sidecar.
+    Raises FileNotFoundError if the model file is missing.
+    """
+    path = os.path.realpath(path)
+    stamp = (path,) + _file_stamp(path)
+    try:
+        return stamp + _file_stamp(tree_arrays_path(path))
+    except FileNotFoundError:
+        return stamp
+
+def read_manifest(path):
+    """Manifest of the model file `path` resolves to, or None if absent or unreadable."""
+    try:
+        with open(manifest_path(os.path.realpath(path))) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("format") == MANIFEST_FORMAT else None
+
+def verify_model_artifact(path):
+    """
+    Check a saved model against its manifest without unpickling it:
+    the pickle (and tree arrays sidecar) must exist with the recorded size
+    and SHA-256. Returns (ok, detail); ok is None when the model has no
+    manifest (saved before manifests existed) and could not be checked.
+    """
+    import sklearn
+
+    path = os.path.realpath(path)
+    if not os.path.isfile(path):
+        return False, "model file missing"
+    manifest = read_manifest(path)
+    if manifest is None:
+        return None, "no manifest"
+    for label, file_path, expected in (
+        ("model", path, manifest.get("model")),
+        ("tree arrays", tree_arrays_path(path), manifest.get("tree_arrays")),
+    ):
+        if expected is None:
+            continue
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return False, f"{label} file missing"
+        if size != expected["size"]:
+            return False, f"{label} size {size} != {expected['size']}"
+        if file_digest(file_path) != expected["sha256"]:
+            return False, f"{label} content hash mismatch"
+    detail = f"{manifest.get('n_features')} features, classes {manifest.get('classes')}"
+    if manifest.get("sklearn_version") != sklearn.__version__:
+        detail += f" (saved with scikit-learn {manifest.get('sklearn_version')}, running {sklearn.__version__})"
+    return True, detail
+
+def deep_validate_model(path):
+    """
+    Fully unpickle a saved model and check it against its manifest, then
+    score one row. Slow and memory-hungry; meant for a process pool.
+    Returns (ok, detail).
+    """
+    path = os.path.realpath(path)
+    try:
+        model = joblib.load(path)
+    except Exception as e:
+        return False, f"load failed: {type(e).__name__}: {e}"
+    manifest = read_manifest(path)
+    found = describe_model(model)
+    if manifest is not None:
+        for key in ("n_features", "classes"):
+            if manifest.get(key) != found[key]:
+                return False, f"{key} {found[key]} != manifest {manifest.get(key)}"
+    try:
+        if found["n_features"]:
+            model.predict_proba(np.zeros((1, found["n_features"])))
+    except Exception as e:
+        return False, f"predict failed: {type(e).__name__}: {e}"
+    return True, f"{found['n_features']} features, classes {found['classes']}"
+
+def _write_manifest(path, description):
+    """Record hashes and sizes of the model (and sidecar) next to it."""
+    manifest = {"format": MANIFEST_FORMAT, **description}
+    for key, file_path in (("model", path), ("tree_arrays", tree_arrays_path(path))):
+        if os.path.isfile(file_path):
+            manifest[key] = {"size": os.path.getsize(file_path), "sha256": file_digest(file_path)}
+    tmp_path = _temp_path(manifest_path(path))
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path(path))
+
+def _file_stamp(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+def _parse_version(path, versioned_path):
+    root, ext = os.path.splitext(os.path.basename(path))
+    pattern = re.escape(root) + r"\.v(\d+)" + re.escape(ext)
+    match = re.fullmatch(pattern, os.path.basename(versioned_path))
+    return int(match.group(1)) if match else None
+
+def _temp_path(path):
+    return f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+
+def _atomic_dump(obj, path, compress=0):
+    """joblib.dump to a temporary file, then rename it over `path`."""
+    tmp_path = _temp_path(path)
+    try:
+        joblib.dump(obj, tmp_path, compress=compress)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _symlink(target, path):
+    """Atomically make `path` a relative symlink to `target`."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_link = _temp_path(path)
+    os.symlink(os.path.relpath(target, os.path.dirname(os.path.abspath(path))), tmp_link)
+    os.replace(tmp_link, path)
+
+def _link_or_copy(src, dst):
+    """Hard link src to dst, copying (with its mtime) across filesystems."""
+    tmp_path = _temp_path(dst)
+    try:
+        os.link(src, tmp_path)
+    except OSError:
+        shutil.copy2(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+def _publish_version(path, versioned_path):
+    """Atomically point the symlink `path` at `versioned_path`."""
+    tmp_link = _temp_path(path)
+    os.symlink(os.path.basename(versioned_path), tmp_link)
+    os.replace(tmp_link, path)
+    # A sidecar or manifest left over from an unversioned save would no longer match
+    _remove_sidecars(path)
+
+def _remove_sidecars(path):
+    for file_path in (tree_arrays_path(path), manifest_path(path)):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+def _remove_files(path):
+    for file_path in (path, tree_arrays_path(path), manifest_path(path)):
+        if os.path.lexists(file_path):
+            os.remove(file_path)
+
+def _load_sidecar(path, mmap_mode="r"):
+    """Load the tree arrays for `path`, or None if missing or stale."""
+    sidecar = tree_arrays_path(path)
+    if not os.path.isfile(sidecar):
+        return None
+    try:
+        arrays = joblib.load(sidecar, mmap_mode=mmap_mode)
+    except Exception:
+        return None
+    if arrays.get("format") != COMPILED_FOREST_FORMAT:
+        return None
+    if tuple(arrays.get("source_stamp", ())) != _file_stamp(path):
+        return None
+    return arrays
+
@@ -0,0 +1,314 @@
+# ai_engine/ml_models/candidate_index.py
+
+from collections import namedtuple
+from itertools import chain
+
+import numpy as np
+
+from .logged_index import LoggedIndex, contains_sorted, save_npz
+from .pair_features import skill_set, text_code
+
+# A candidate as indexed: normalized skills plus the attributes hard
+# filters test (location and visa as pair_features.text_code codes)
+IndexEntry = namedtuple('IndexEntry', 'id skills experience location visa')
+
+# Hard filters of candidate generation; None (or empty) means no filter.
+# locations / visas are tuples of text codes, any of which may match.
+CandidateFilters = namedtuple(
+    'CandidateFilters', 'min_experience max_experience locations visas', defaults=(None, None, (), ())
+)
+
+def candidate_entry(candidate_id, skills, experience_years, location, visa_status, profile=None):
+    """IndexEntry of a candidate; skills found by resume parsing are merged in."""
+    profile = profile if isinstance(profile, dict) else {}
+    return IndexEntry(
+        int(candidate_id),
+        tuple(sorted(skill_set(skills) | skill_set(profile.get('skills')))),
+        float(max(experience_years or 0, 0)),
+        text_code(location),
+        text_code(visa_status),
+    )
+
+def candidate_filters(location=None, visa_status=None, min_experience_years=None, max_experience_years=None):
+    """
+    CandidateFilters from request-style values: location and visa_status are
+    a string or a list of accepted values. Returns None if nothing is filtered.
+    """
+    def codes(values):
+        if values is None:
+            return ()
+        if isinstance(values, str):
+            values = [values]
+        return tuple(code for code in (text_code(value) for value in values) if code)
+
+    filters = CandidateFilters(
+        min_experience=float(min_experience_years) if min_experience_years is not None else None,
+        max_experience=float(max_experience_years) if max_experience_years is not None else None,
+        locations=codes(location),
+        visas=codes(visa_status),
+    )
+    return filters if filters != CandidateFilters() else None
+
+def parse_skill_query(text):
+    """
+    Parse a skill query: comma-separated clauses that must all match, each
+    a |-separated list of alternatives, e.g. 'kubernetes,python|go' ->
+    (('kubernetes',), ('go', 'python')). Skills are normalized like
+    candidate skills.
+    """
+    clauses = []
+    for clause in text.split(','):
+        alternatives = tuple(sorted(skill_set(clause.split('|'))))
+        if alternatives:
+            clauses.append(alternatives)
+    return tuple(clauses)
+
+def sorted_member(a, b):
+    """Boolean mask of the elements of sorted array a present in sorted array b."""
+    if not len(a) or not len(b):
+        return np.zeros(len(a), dtype=bool)
+    positions = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    return b[positions] == a
+
+def intersect_sorted(a, b):
+    """
+    Intersection of two sorted unique id arrays: the smaller one is
+    binary-searched in the larger, O(m log n) with no re-sort.
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    return a[sorted_member(a, b)]
+
+def union_sorted(arrays):
+    """Union of sorted unique id arrays, sorted."""
+    arrays = [array for array in arrays if len(array)]
+    if not arrays:
+        return np.zeros(0, dtype=np.int64)
+    if len(arrays) == 1:
+        return arrays[0]
+    return np.unique(np.concatenate(arrays))
+
+class IndexSegment:
+    """
+    Immutable columnar index of candidates sorted by id: experience,
+    location and visa columns for hard filters, and an inverted index from
+    skill to the (sorted) row positions of candidates having it, stored
+    CSR-style as a sorted vocabulary, offsets and one postings array.
+    """
+
+    def __init__(self, ids, experience, location, visa, vocabulary, offsets, postings):
+        self.ids = ids
+        self.experience = experience
+        self.location = location
+        self.visa = visa
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.postings = postings
+        self._terms = {term: i for i, term in enumerate(vocabulary.tolist())}
+
+    @classmethod
+    def build(cls, entries):
+        """Segment of IndexEntry rows (ids must be unique)."""
+        entries = sorted(entries, key=lambda entry: entry.id)
+        n = len(entries)
+        lists = {}
+        for position, entry in enumerate(entries):
+            for skill in entry.skills:
+                lists.setdefault(skill, []).append(position)
+        vocabulary = sorted(lists)
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(lists[term]) for term in vocabulary])
+        return cls(
+            ids=np.fromiter((entry.id for entry in entries), dtype=np.int64, count=n),
+            experience=np.fromiter((entry.experience for entry in entries), dtype=np.float32, count=n),
+            location=np.fromiter((entry.location for entry in entries), dtype=np.uint32, count=n),
+            visa=np.fromiter((entry.visa for entry in entries), dtype=np.uint32, count=n),
+            vocabulary=np.array(vocabulary, dtype=str) if vocabulary else np.zeros(0, dtype='<U1'),
+            offsets=offsets,
+            postings=np.fromiter(
+                chain.from_iterable(lists[term] for term in vocabulary), dtype=np.int32, count=int(offsets[-1])
+            ),
+        )
+
+    @classmethod
+    def merge(cls, base, delta, removed_ids):
+        """
+        New segment holding base without removed_ids (and without the ids
+        in delta, which replace their base rows), plus delta.
+        """
+        removed = np.union1d(np.asarray(removed_ids, dtype=np.int64), delta.ids)
+        keep = ~base.contains(removed)
+        kept = int(keep.sum())
+        ids = np.concatenate([base.ids[keep], delta.ids])
+        order = np.argsort(ids, kind='stable')
+        # Old position (base rows, then delta rows) -> new position
+        new_position = np.empty(len(ids), dtype=np.int64)
+        new_position[order] = np.arange(len(ids))
+        base_map = np.full(len(base), -1, dtype=np.int64)
+        base_map[keep] = new_position[:kept]
+        delta_map = new_position[kept:]
+
+        vocabulary = sorted(set(base._terms) | set(delta._terms))
+        lists = []
+        for term in vocabulary:
+            positions = base_map[base.positions(term)]
+            merged = np.concatenate([positions[positions >= 0], delta_map[delta.positions(term)]])
+            merged.sort()
+            lists.append(merged)
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(positions) for positions in lists])
+        return cls(
+            ids=ids[order],
+            experience=np.concatenate([base.experience[keep], delta.experience])[order],
+            location=np.concatenate([base.location[keep], delta.location])[order],
+            visa=np.concatenate([base.visa[keep], delta.visa])[order],
+            vocabulary=np.array(vocabulary, dtype=str) if vocabulary else np.zeros(0, dtype='<U1'),
+            offsets=offsets,
+            postings=np.concatenate(lists).astype(np.int32) if lists else np.zeros(0, dtype=np.int32),
+        )
+
+    @classmethod
+    def empty(cls):
+        return cls.build([])
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as archive:
+            return cls(**{name: archive[name] for name in archive.files})
+
+    def save(self, path):
+        """Write the segment as .npz under a temporary name, then rename it into place."""
+        save_npz(
+            path, ids=self.ids, experience=self.experience, location=self.location, visa=self.visa,
+            vocabulary=self.vocabulary, offsets=self.offsets, postings=self.postings,
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def positions(self, skill):
+        """Sorted row positions of candidates with `skill` (int32)."""
+        term = self._terms.get(skill)
+        if term is None:
+            return self.postings[:0]
+        return self.postings[self.offsets[term]:self.offsets[term + 1]]
+
+    def contains(self, entity_ids):
+        """Boolean mask of rows whose id is in entity_ids."""
+        return contains_sorted(self.ids, entity_ids)
+
+    def filter_mask(self, filters):
+        """Boolean mask of rows passing the hard filters, or None if there are none."""
+        if filters is None:
+            return None
+        mask = np.ones(len(self.ids), dtype=bool)
+        if filters.min_experience is not None:
+            mask &= self.experience >= filters.min_experience
+        if filters.max_experience is not None:
+            mask &= self.experience <= filters.max_experience
+        if filters.locations:
+            mask &= np.isin(self.location, filters.locations)
+        if filters.visas:
+            mask &= np.isin(self.visa, filters.visas)
+        return mask
+
+    def match(self, skills, filters=None, exclude=None):
+        """
+        (ids, overlap) of rows with at least one of `skills` (every row if
+        skills is empty) that pass the filters and are not in `exclude`;
+        overlap counts the skills each candidate has.
+        """
+        n = len(self.ids)
+        if skills:
+            overlap = np.bincount(np.concatenate([self.positions(skill) for skill in skills]), minlength=n)
+            keep = overlap > 0
+        else:
+            overlap = np.zeros(n, dtype=np.int64)
+            keep = np.ones(n, dtype=bool)
+        mask = self.filter_mask(filters)
+        if mask is not None:
+            keep &= mask
+        if exclude is not None and len(exclude):
+            keep &= ~self.contains(exclude)
+        positions = np.flatnonzero(keep)
+        return self.ids[positions], overlap[positions]
+
+class CandidateIndex(LoggedIndex):
+    """
+    Per-tenant candidate retrieval index: skill -> candidates inverted index
+    plus hard filter columns (experience, location, visa status), kept as
+    the snapshot `candidates.index.npz` and log `candidates.index.log`
+    (see LoggedIndex).
+    """
+
+    name = 'candidates.index'
+    segment_class = IndexSegment
+
+    def entry_record(self, entry):
+        # [id, skills, experience, location, visa]
+        return [int(entry.id), list(entry.skills), float(entry.experience), int(entry.location), int(entry.visa)]
+
+    def record_entry(self, record):
+        return IndexEntry(record[0], tuple(record[1]), *record[2:])
+
+    def skill_ids(self, skill):
+        """Sorted ids of the candidates with `skill` (a normalized skill name)."""
+        return self.query([(skill,)])
+
+    def _clause_ids(self, clause):
+        """Sorted ids of the candidates with any skill of `clause`."""
+        lists = [self._base.positions(skill) for skill in clause]
+        if len(lists) == 1:
+            positions = lists[0]
+        else:
+            # Union in row space: a bitmap over the segment, no sorting
+            hit = np.zeros(len(self._base), dtype=bool)
+            for positions in lists:
+                hit[positions] = True
+            positions = np.flatnonzero(hit)
+        base = self._base.ids[positions]
+        if len(self._masked):
+            base = base[~sorted_member(base, self._masked)]
+        return union_sorted([base] + [self._delta.ids[self._delta.positions(skill)] for skill in clause])
+
+    def query(self, clauses):
+        """
+        Sorted ids of the candidates matching every clause, where a clause
+        is a collection of skills any of which matches (see
+        parse_skill_query). Clauses are intersected smallest first, stopping
+        as soon as the result is empty.
+        """
+        with self._lock:
+            self._refresh()
+            lists = [self._clause_ids(clause) for clause in clauses]
+        if not lists:
+            return np.zeros(0, dtype=np.int64)
+        lists.sort(key=len)
+        result = lists[0]
+        for ids in lists[1:]:
+            if not len(result):
+                break
+            result = intersect_sorted(result, ids)
+        return result
+
+    def generate(self, skills, filters=None, limit=None):
+        """
+        Candidate generation: ids of candidates with any of `skills` (all
+        candidates if none are given) that pass the hard filters, with the
+        number of skills each has. With a limit only the `limit` candidates
+        with the largest overlap (newest first on ties) are returned.
+        Returns (ids, overlap) ordered best first.
+        """
+        skills = tuple(skills)
+        with self._lock:
+            self._refresh()
+            base_ids, base_overlap = self._base.match(skills, filters, exclude=self._masked)
+            delta_ids, delta_overlap = self._delta.match(skills, filters)
+        ids = np.concatenate([base_ids, delta_ids])
+        overlap = np.concatenate([base_overlap, delta_overlap])
+        key = overlap.astype(np.int64) << 40 | ids
+        if limit is not None and len(ids) > limit:
+            top = np.argpartition(-key, limit - 1)[:limit]
+            ids, overlap, key = ids[top], overlap[top], key[top]
+        order = np.argsort(-key, kind='stable')
+        return ids[order], overlap[order].astype(np.int32)
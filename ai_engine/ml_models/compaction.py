@@ -0,0 +1,147 @@
+# ai_engine/ml_models/compaction.py
+
+import copy
+import heapq
+import os
+import time
+
+import numpy as np
+from sklearn.tree._tree import Tree
+
+from .artifacts import load_model_artifact, tree_arrays_path
+from .compiled_forest import TREE_LEAF, compile_forest
+
+# Feature/threshold of a leaf in sklearn's node arrays
+TREE_UNDEFINED = -2
+
+def prune_tree(estimator, max_depth=None, max_leaf_nodes=None):
+    """
+    Copy of a fitted decision tree cut back to max_depth and at most
+    max_leaf_nodes leaves. Splits are kept best-first by weighted impurity
+    decrease (the order sklearn grows trees in when max_leaf_nodes is set);
+    a removed subtree's root becomes a leaf predicting its stored class
+    distribution. Returns the estimator itself if nothing is cut.
+    """
+    tree = estimator.tree_
+    state = tree.__getstate__()
+    nodes = state["nodes"]
+    left, right = nodes["left_child"], nodes["right_child"]
+    weighted = nodes["weighted_n_node_samples"]
+    impurity = nodes["impurity"]
+
+    def gain(node):
+        l, r = left[node], right[node]
+        return weighted[node] * impurity[node] - weighted[l] * impurity[l] - weighted[r] * impurity[r]
+
+    # Original node -> depth; expanded nodes keep their split
+    expanded = set()
+    depth = {0: 0}
+    n_leaves = 1
+    frontier = [] if left[0] == TREE_LEAF else [(-gain(0), 0)]
+    while frontier:
+        _, node = heapq.heappop(frontier)
+        if max_depth is not None and depth[node] >= max_depth:
+            continue
+        if max_leaf_nodes is not None and n_leaves + 1 > max_leaf_nodes:
+            break
+        expanded.add(node)
+        n_leaves += 1
+        for child in (left[node], right[node]):
+            depth[child] = depth[node] + 1
+            if left[child] != TREE_LEAF:
+                heapq.heappush(frontier, (-gain(child), child))
+    if len(depth) == tree.node_count:
+        return estimator
+
+    # Renumber the kept nodes depth-first, as sklearn lays them out
+    kept, stack = [], [0]
+    while stack:
+        node = stack.pop()
+        kept.append(node)
+        if node in expanded:
+            stack.extend((right[node], left[node]))
+    new_index = {node: i for i, node in enumerate(kept)}
+    new_nodes = nodes[kept].copy()
+    for i, node in enumerate(kept):
+        if node in expanded:
+            new_nodes["left_child"][i] = new_index[left[node]]
+            new_nodes["right_child"][i] = new_index[right[node]]
+        else:
+            new_nodes["left_child"][i] = new_nodes["right_child"][i] = TREE_LEAF
+            new_nodes["feature"][i] = TREE_UNDEFINED
+            new_nodes["threshold"][i] = TREE_UNDEFINED
+    state.update(
+        nodes=new_nodes,
+        values=state["values"][kept],
+        node_count=len(kept),
+        max_depth=max(depth[node] for node in kept),
+    )
+    pruned_tree = Tree(tree.n_features, np.atleast_1d(np.asarray(estimator.n_classes_, dtype=np.intp)), tree.n_outputs)
+    pruned_tree.__setstate__(state)
+    pruned = copy.copy(estimator)
+    pruned.tree_ = pruned_tree
+    return pruned
+
+def select_trees(model, X, y, n_trees):
+    """
+    Indices of the n_trees trees whose average best fits (X, y), chosen by
+    greedy forward selection on log loss. Trees that add little beyond
+    the ones already chosen are the ones left out.
+    """
+    compiled = compile_forest(model)
+    leaf_values = compiled.value[compiled.apply(X)]  # rows x trees x classes
+    y_index = np.searchsorted(model.classes_, np.asarray(y))
+    rows = np.arange(len(y_index))
+    total = np.zeros((len(y_index), len(model.classes_)))
+    remaining = list(range(compiled.n_trees))
+    chosen = []
+    for k in range(min(n_trees, compiled.n_trees)):
+        candidates = leaf_values[:, remaining, :]
+        proba_true = (total[rows, y_index][:, None] + candidates[rows, :, y_index]) / (k + 1)
+        loss = -np.log(np.clip(proba_true, 1e-15, None)).mean(axis=0)
+        best = remaining.pop(int(np.argmin(loss)))
+        chosen.append(best)
+        total += leaf_values[:, best, :]
+    return sorted(chosen)
+
+def compact_forest(model, max_depth=None, max_leaf_nodes=None, max_trees=None, X=None, y=None):
+    """
+    Size-optimized copy of a fitted forest classifier: every tree pruned to
+    max_depth / max_leaf_nodes, then (given evaluation data X, y) only the
+    max_trees trees that best preserve its predictions kept.
+    """
+    if max_trees is not None and X is None:
+        raise ValueError("Selecting trees needs evaluation data (X, y)")
+    compacted = copy.copy(model)
+    compacted.estimators_ = [prune_tree(tree, max_depth, max_leaf_nodes) for tree in model.estimators_]
+    if max_trees is not None and max_trees < len(compacted.estimators_):
+        keep = select_trees(compacted, X, y, max_trees)
+        compacted.estimators_ = [compacted.estimators_[i] for i in keep]
+    compacted.n_estimators = len(compacted.estimators_)
+    return compacted
+
+def artifact_report(path, X, y, repeats=200):
+    """
+    Size, load time, serving latency and accuracy of a saved model loaded
+    with the memory-mapped backend (falls back to the pickle).
+    """
+    from .tuning import measure_latency
+
+    path = os.path.realpath(path)
+    sidecar = tree_arrays_path(path)
+    started = time.perf_counter()
+    model = load_model_artifact(path)
+    load_seconds = time.perf_counter() - started
+    compiled = compile_forest(model)
+    p50, p99 = measure_latency(compiled, X, repeats=repeats)
+    return {
+        "pickle_bytes": os.path.getsize(path),
+        "tree_arrays_bytes": os.path.getsize(sidecar) if os.path.exists(sidecar) else 0,
+        "in_memory_bytes": int(sum(np.asarray(a).nbytes for a in compiled.to_arrays().values() if hasattr(a, "nbytes"))),
+        "trees": compiled.n_trees,
+        "nodes": int(len(compiled.feature)),
+        "load_seconds": load_seconds,
+        "latency_p50_ms": p50,
+        "latency_p99_ms": p99,
+        "accuracy": float(np.mean(model.predict(X) == np.asarray(y))),
+    }
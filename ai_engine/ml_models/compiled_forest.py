@@ -0,0 +1,174 @@
+# ai_engine/ml_models/compiled_forest.py
+
+import numpy as np
+from scipy import sparse
+
+TREE_LEAF = -1
+
+# Identifies the array layout written by CompiledForest.to_arrays
+COMPILED_FOREST_FORMAT = "compiled-forest-v1"
+
+# Rows traversed at once; bounds the (rows x trees x classes) leaf value buffer
+COMPILED_CHUNK_SIZE = 4096
+
+def compile_forest(model):
+    """
+    Compile a fitted forest classifier into a CompiledForest.
+    Raises ValueError for models that are not single-output tree ensembles.
+    """
+    if isinstance(model, CompiledForest):
+        return model
+    estimators = getattr(model, "estimators_", None)
+    classes = getattr(model, "classes_", None)
+    if not estimators or classes is None or np.ndim(classes) != 1:
+        raise ValueError(f"Cannot compile {type(model).__name__}: not a single-output tree ensemble")
+
+    roots, feature, threshold, left, right, missing_left, value = [], [], [], [], [], [], []
+    offset = 0
+    for estimator in estimators:
+        tree = getattr(estimator, "tree_", None)
+        if tree is None or tree.n_outputs != 1:
+            raise ValueError(f"Cannot compile {type(model).__name__}: not a single-output tree ensemble")
+        is_leaf = tree.children_left == TREE_LEAF
+        roots.append(offset)
+        feature.append(tree.feature)
+        threshold.append(tree.threshold)
+        # Child indices are shifted into the concatenated node arrays
+        left.append(np.where(is_leaf, TREE_LEAF, tree.children_left + offset))
+        right.append(np.where(is_leaf, TREE_LEAF, tree.children_right + offset))
+        missing_go_to_left = getattr(tree, "missing_go_to_left", None)
+        if missing_go_to_left is None:
+            missing_go_to_left = np.zeros(tree.node_count, dtype=bool)
+        missing_left.append(np.asarray(missing_go_to_left, dtype=bool))
+        # Same normalization DecisionTreeClassifier.predict_proba applies
+        tree_value = np.array(tree.value[:, 0, :], dtype=np.float64)
+        normalizer = tree_value.sum(axis=1)[:, np.newaxis]
+        normalizer[normalizer == 0.0] = 1.0
+        tree_value /= normalizer
+        value.append(tree_value)
+        offset += tree.node_count
+
+    return CompiledForest({
+        "format": COMPILED_FOREST_FORMAT,
+        "classes": np.asarray(classes),
+        "n_features": int(model.n_features_in_),
+        "roots": np.array(roots, dtype=np.intp),
+        "feature": np.concatenate(feature).astype(np.intp),
+        "threshold": np.concatenate(threshold).astype(np.float64),
+        "children_left": np.concatenate(left).astype(np.intp),
+        "children_right": np.concatenate(right).astype(np.intp),
+        "missing_go_to_left": np.concatenate(missing_left),
+        "value": np.concatenate(value),
+    })
+
+def compact_forest_arrays(arrays):
+    """
+    Shrink compiled forest arrays to float32 thresholds and leaf values.
+    Node indices stay intp: NumPy converts narrower index arrays on every
+    fancy-indexing step, which costs more traversal time than it saves.
+    Thresholds are rounded down to the nearest float32, which keeps every
+    split decision exact because inputs are compared as float32: for a
+    float32 x, x <= t holds exactly when x <= round_down(t). Leaf values
+    lose precision beyond ~7 digits.
+    """
+    threshold64 = np.asarray(arrays["threshold"], dtype=np.float64)
+    threshold = threshold64.astype(np.float32)
+    rounded_up = threshold.astype(np.float64) > threshold64
+    threshold[rounded_up] = np.nextafter(threshold[rounded_up], np.float32(-np.inf))
+    compact = dict(arrays)
+    compact.update(threshold=threshold, value=np.asarray(arrays["value"]).astype(np.float32))
+    return compact
+
+def validate_compiled_forest(model, compiled, X):
+    """
+    Check that the compiled evaluator reproduces the model's probabilities
+    bit for bit on X. Returns bool.
+    """
+    return np.array_equal(model.predict_proba(X), compiled.predict_proba(X))
+
+
+class CompiledForest:
+    """
+    Forest classifier flattened into contiguous node arrays spanning all
+    trees (feature, threshold, children, per-node class probabilities).
+    Every row walks every tree at once, one tree level per vectorized step,
+    instead of a Python-level call per tree. The arrays may be memory-mapped.
+    Reproduces RandomForestClassifier.predict_proba exactly: float32 inputs,
+    per-tree normalized leaf values accumulated in tree order, then averaged.
+    """
+
+    def __init__(self, arrays):
+        self.classes_ = np.asarray(arrays["classes"])
+        self.n_features_in_ = int(arrays["n_features"])
+        self.n_classes_ = len(self.classes_)
+        self.roots = arrays["roots"]
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.children_left = arrays["children_left"]
+        self.children_right = arrays["children_right"]
+        self.missing_go_to_left = arrays["missing_go_to_left"]
+        self.value = arrays["value"]
+        self.n_trees = len(self.roots)
+
+    def to_arrays(self):
+        """Return the flat arrays, e.g. for persisting with joblib."""
+        return {
+            "format": COMPILED_FOREST_FORMAT,
+            "classes": self.classes_,
+            "n_features": self.n_features_in_,
+            "roots": self.roots,
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "children_left": self.children_left,
+            "children_right": self.children_right,
+            "missing_go_to_left": self.missing_go_to_left,
+            "value": self.value,
+        }
+
+    def predict_proba(self, X):
+        X = self._validate_X(X)
+        n_rows = X.shape[0]
+        proba = np.empty((n_rows, self.n_classes_), dtype=np.float64)
+        for start in range(0, n_rows, COMPILED_CHUNK_SIZE):
+            stop = min(start + COMPILED_CHUNK_SIZE, n_rows)
+            leaves = self.apply(X[start:stop])
+            # cumsum adds trees strictly in order, matching sklearn's accumulation
+            leaf_values = self.value[leaves]
+            proba[start:stop] = np.cumsum(leaf_values, axis=1)[:, -1]
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def apply(self, X):
+        """Return the (rows x trees) matrix of leaf indices reached."""
+        X = self._validate_X(X)
+        n_rows, n_features = X.shape
+        X_flat = X.ravel()
+        node = np.tile(self.roots, n_rows)
+        row_base = np.repeat(np.arange(n_rows, dtype=np.intp) * n_features, self.n_trees)
+        # Only (row, tree) pairs still at an internal node are advanced
+        active = np.flatnonzero(self.children_left[node] != TREE_LEAF)
+        while active.size:
+            current = node[active]
+            values = X_flat[row_base[active] + self.feature[current]]
+            go_left = values <= self.threshold[current]
+            is_missing = np.isnan(values)
+            if is_missing.any():
+                go_left[is_missing] = self.missing_go_to_left[current[is_missing]]
+            current = np.where(go_left, self.children_left[current], self.children_right[current])
+            node[active] = current
+            active = active[self.children_left[current] != TREE_LEAF]
+        return node.reshape(n_rows, self.n_trees)
+
+    def _validate_X(self, X):
+        if sparse.issparse(X):
+            X = X.toarray()
+        # sklearn evaluates trees on float32 inputs
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X has shape {X.shape}, expected {self.n_features_in_} features"
+            )
+        return X
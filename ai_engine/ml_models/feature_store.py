@@ -0,0 +1,179 @@
+# ai_engine/ml_models/feature_store.py
+
+import fcntl
+import os
+from contextlib import contextmanager
+import numpy as np
+
+from .pair_features import VECTOR_DIM
+
+# Rows allocated when a store file is first created
+INITIAL_CAPACITY = 1024
+
+# Index value of a free row
+EMPTY_ID = -1
+
+class FeatureStore:
+    """
+    Fixed-width float32 vectors of one kind of entity (candidates or jobs)
+    of one tenant, kept in `<kind>.vectors.npy` (memory-mapped by readers)
+    plus an int64 id index `<kind>.ids.npy` aligned with its rows.
+    Writers serialize on a lock file and update rows in place, so readers
+    in other processes see new values through the shared mapping; adding
+    or removing ids touches the index, which readers stat before each read
+    to refresh their id -> row map. When full, both files are rewritten at
+    twice the capacity and swapped in with os.replace.
+    """
+
+    def __init__(self, directory, kind, dim=VECTOR_DIM):
+        self.directory = directory
+        self.kind = kind
+        self.dim = dim
+        self.vectors_path = os.path.join(directory, f"{kind}.vectors.npy")
+        self.ids_path = os.path.join(directory, f"{kind}.ids.npy")
+        self.lock_path = os.path.join(directory, f"{kind}.lock")
+        self._stamp = None
+        self._vectors = None
+        self._rows = {}
+
+    def _index_stamp(self):
+        try:
+            st = os.stat(self.ids_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _refresh(self):
+        stamp = self._index_stamp()
+        if stamp == self._stamp:
+            return
+        if stamp is None:
+            self._vectors, self._rows = None, {}
+        else:
+            # Index before vectors: a grown vectors file is swapped in
+            # first, so the rows named by the index always exist
+            ids = np.load(self.ids_path)
+            self._vectors = np.load(self.vectors_path, mmap_mode='r')
+            valid = np.flatnonzero(ids != EMPTY_ID)
+            self._rows = dict(zip(ids[valid].tolist(), valid.tolist()))
+        self._stamp = stamp
+
+    def __len__(self):
+        self._refresh()
+        return len(self._rows)
+
+    def __contains__(self, entity_id):
+        self._refresh()
+        return entity_id in self._rows
+
+    def get_many(self, entity_ids):
+        """
+        Vectors for entity_ids as a (len, dim) float32 copy plus a boolean
+        mask of the ids that were found (missing rows are zeros).
+        """
+        self._refresh()
+        rows = np.array([self._rows.get(entity_id, -1) for entity_id in entity_ids], dtype=np.int64)
+        found = rows >= 0
+        vectors = np.zeros((len(rows), self.dim), dtype=np.float32)
+        if found.any():
+            vectors[found] = self._vectors[rows[found]]
+        return vectors, found
+
+    def get(self, entity_id):
+        vectors, found = self.get_many([entity_id])
+        return vectors[0] if found[0] else None
+
+    def all(self):
+        """(ids, vectors) of every stored entity, for bulk reads."""
+        self._refresh()
+        if not self._rows:
+            return np.zeros(0, dtype=np.int64), np.zeros((0, self.dim), dtype=np.float32)
+        ids = np.fromiter(self._rows.keys(), dtype=np.int64, count=len(self._rows))
+        rows = np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+        order = np.argsort(ids)
+        return ids[order], np.asarray(self._vectors[rows[order]])
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.lock_path, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _open_for_write(self, needed):
+        """Writable (ids, vectors) memmaps with room for `needed` more rows."""
+        if not os.path.exists(self.ids_path):
+            self._allocate(INITIAL_CAPACITY, needed)
+        ids = np.lib.format.open_memmap(self.ids_path, mode='r+')
+        free = int(np.count_nonzero(ids == EMPTY_ID))
+        if free < needed:
+            capacity = len(ids)
+            del ids
+            self._allocate(capacity, needed - free)
+            ids = np.lib.format.open_memmap(self.ids_path, mode='r+')
+        vectors = np.lib.format.open_memmap(self.vectors_path, mode='r+')
+        return ids, vectors
+
+    def _allocate(self, capacity, extra):
+        """Create or grow the store files to fit `extra` more rows."""
+        old_ids = np.load(self.ids_path) if os.path.exists(self.ids_path) else np.zeros(0, dtype=np.int64)
+        size = max(INITIAL_CAPACITY, 2 * capacity, len(old_ids) + extra)
+        vectors_tmp, ids_tmp = f"{self.vectors_path}.tmp", f"{self.ids_path}.tmp"
+        vectors = np.lib.format.open_memmap(vectors_tmp, mode='w+', dtype=np.float32, shape=(size, self.dim))
+        if len(old_ids):
+            vectors[:len(old_ids)] = np.load(self.vectors_path, mmap_mode='r')
+        vectors.flush()
+        del vectors
+        ids = np.full(size, EMPTY_ID, dtype=np.int64)
+        ids[:len(old_ids)] = old_ids
+        with open(ids_tmp, 'wb') as f:
+            np.save(f, ids)
+        # Vectors first: readers load the index, then map the vectors
+        os.replace(vectors_tmp, self.vectors_path)
+        os.replace(ids_tmp, self.ids_path)
+
+    def upsert_many(self, entity_ids, vectors):
+        """Insert or overwrite the vectors of entity_ids."""
+        entity_ids = [int(entity_id) for entity_id in entity_ids]
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(entity_ids), self.dim)
+        if not entity_ids:
+            return
+        with self._locked():
+            current = np.load(self.ids_path) if os.path.exists(self.ids_path) else np.zeros(0, dtype=np.int64)
+            rows = {entity_id: row for row, entity_id in enumerate(current.tolist()) if entity_id != EMPTY_ID}
+            new_ids = list(dict.fromkeys(entity_id for entity_id in entity_ids if entity_id not in rows))
+            ids, store = self._open_for_write(len(new_ids))
+            free = iter(np.flatnonzero(ids == EMPTY_ID).tolist())
+            for entity_id in new_ids:
+                rows[entity_id] = next(free)
+            targets = np.array([rows[entity_id] for entity_id in entity_ids], dtype=np.int64)
+            # Vectors before ids, so a reader never maps an id to a stale row
+            store[targets] = vectors
+            store.flush()
+            if new_ids:
+                ids[[rows[entity_id] for entity_id in new_ids]] = new_ids
+                ids.flush()
+                os.utime(self.ids_path)
+
+    def upsert(self, entity_id, vector):
+        self.upsert_many([entity_id], [vector])
+
+    def delete_many(self, entity_ids):
+        """Free the rows of entity_ids (unknown ids are ignored)."""
+        if not os.path.exists(self.ids_path):
+            return
+        with self._locked():
+            ids, store = self._open_for_write(0)
+            rows = np.flatnonzero(np.isin(ids, [int(entity_id) for entity_id in entity_ids]))
+            if len(rows):
+                ids[rows] = EMPTY_ID
+                ids.flush()
+                store[rows] = 0
+                store.flush()
+                os.utime(self.ids_path)
+
+    def delete(self, entity_id):
+        self.delete_many([entity_id])
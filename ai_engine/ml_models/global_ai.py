@@ -1,30 +1,65 @@
 # ai_engine/ml_models/global_ai.py
 
 import os
-import joblib
+import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 import pandas as pd
 
+from .artifacts import save_model_version
+from .inference import DEFAULT_CHUNK_SIZE, predict_fit_proba_batch
+from .registry import model_registry
+
 GLOBAL_MODEL_PATH = "models/global/global_ai_model.pkl"
 
-def train_global_model(X, y):
+def train_global_model(X, y, params=None):
     """
-    Train a global RandomForest model and save it to disk.
+    Train a global RandomForest model and save it to disk as a new version.
     Args:
         X: Features (pandas DataFrame or numpy array)
         y: Labels (Series or array)
+        params: RandomForestClassifier hyperparameters (e.g. from tuning); defaults if None
     Returns:
         Trained model object.
     """
-    model = RandomForestClassifier()
+    model = RandomForestClassifier(**(params or {}))
     model.fit(X, y)
-    os.makedirs(os.path.dirname(GLOBAL_MODEL_PATH), exist_ok=True)
-    joblib.dump(model, GLOBAL_MODEL_PATH)
+    save_model_version(model, GLOBAL_MODEL_PATH)
+    model_registry.invalidate(GLOBAL_MODEL_PATH)
     return model
 
+def train_global_model_from_batches(batches, trees_per_batch=10):
+    """
+    Train the global RandomForest out of core: each (X, y) batch adds
+    trees_per_batch trees fit on that batch only (warm_start), so memory
+    stays at one batch however large the training export is.
+    Batches missing a class seen in the first batch are skipped, since
+    their trees could not vote on it.
+    Returns (model, batches_used, batches_skipped); the model is saved as
+    a new version.
+    """
+    model = None
+    used = skipped = 0
+    for X, y in batches:
+        classes = np.unique(y)
+        if model is None:
+            model = RandomForestClassifier(n_estimators=trees_per_batch, warm_start=True)
+        elif not np.array_equal(classes, model.classes_):
+            skipped += 1
+            continue
+        else:
+            model.set_params(n_estimators=len(model.estimators_) + trees_per_batch)
+        model.fit(X, y)
+        used += 1
+    if model is None:
+        raise ValueError("No training batches")
+    model.set_params(warm_start=False)
+    save_model_version(model, GLOBAL_MODEL_PATH)
+    model_registry.invalidate(GLOBAL_MODEL_PATH)
+    return model, used, skipped
+
 def load_global_model():
     """
-    Loads the global candidate model from disk.
+    Loads the global candidate model, cached in the process-wide registry.
     Returns:
         Loaded model object.
     Raises:
@@ -32,7 +67,7 @@ def load_global_model():
     """
     if not os.path.isfile(GLOBAL_MODEL_PATH):
         raise FileNotFoundError(f"Global model not found at {GLOBAL_MODEL_PATH}")
-    return joblib.load(GLOBAL_MODEL_PATH)
+    return model_registry.get(GLOBAL_MODEL_PATH)
 
 def predict_candidate_fit(features):
     """
@@ -45,3 +80,15 @@ def predict_candidate_fit(features):
     model = load_global_model()
     probability = model.predict_proba([features])[0][1]  # assumes 'fit' is class 1
     return probability
+
+def predict_candidate_fit_batch(matrix, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Predict candidate 'fit' probabilities for many candidates using the global model.
+    Args:
+        matrix: 2-D NumPy array or CSR matrix, one row per candidate
+        chunk_size: max rows per predict_proba call (caps peak memory)
+    Returns:
+        float32 array of 'fit' probabilities aligned with the rows of matrix.
+    """
+    model = load_global_model()
+    return predict_fit_proba_batch(model, matrix, chunk_size=chunk_size)
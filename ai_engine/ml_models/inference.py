@@ -0,0 +1,40 @@
+# ai_engine/ml_models/inference.py
+
+import numpy as np
+from scipy import sparse
+
+# Rows scored per predict_proba call; bounds peak memory of the
+# intermediate (rows x classes) probability arrays for large batches.
+DEFAULT_CHUNK_SIZE = 10000
+
+def as_feature_matrix(X):
+    """
+    Coerce a batch of feature vectors to a 2-D NumPy array or CSR matrix.
+    """
+    if sparse.issparse(X):
+        return X.tocsr()
+    X = np.asarray(X)
+    if X.ndim != 2:
+        raise ValueError(f"Expected a 2-D feature matrix, got shape {X.shape}")
+    return X
+
+def predict_fit_proba_batch(model, X, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Score many feature vectors with one model.
+    Args:
+        model: fitted classifier exposing predict_proba
+        X: 2-D NumPy array or scipy CSR matrix, one row per candidate
+        chunk_size: max rows per predict_proba call
+    Returns:
+        float32 array of 'fit' (class 1) probabilities, one per row.
+    """
+    X = as_feature_matrix(X)
+    n_rows = X.shape[0]
+    scores = np.empty(n_rows, dtype=np.float32)
+    if n_rows == 0:
+        return scores
+    chunk_size = max(1, int(chunk_size))
+    for start in range(0, n_rows, chunk_size):
+        stop = min(start + chunk_size, n_rows)
+        scores[start:stop] = model.predict_proba(X[start:stop])[:, 1]
+    return scores
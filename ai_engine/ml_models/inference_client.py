@@ -0,0 +1,146 @@
+# ai_engine/ml_models/inference_client.py
+
+import json
+import socket
+import struct
+import threading
+import time
+
+import numpy as np
+from scipy import sparse
+
+# Wire format: 4-byte big-endian JSON header length, JSON header, then
+# `payload_bytes` of raw little-endian array data (float64 rows / scores).
+_LENGTH = struct.Struct("!I")
+
+DEFAULT_TIMEOUT = 5.0
+
+# After a failed connection, skip the server for this many seconds
+DEFAULT_RETRY_INTERVAL = 5.0
+
+
+class InferenceServerError(RuntimeError):
+    """The inference server received the request but could not score it."""
+
+
+def send_message(sock, header, payload=b""):
+    header = dict(header, payload_bytes=len(payload))
+    encoded = json.dumps(header).encode("utf-8")
+    sock.sendall(_LENGTH.pack(len(encoded)) + encoded + payload)
+
+def recv_message(sock):
+    """
+    Read one message. Returns (header, payload), or (None, b"") if the peer
+    closed the connection before a new message started.
+    """
+    prefix = _recv_exact(sock, _LENGTH.size, allow_eof=True)
+    if prefix is None:
+        return None, b""
+    header = json.loads(_recv_exact(sock, _LENGTH.unpack(prefix)[0]).decode("utf-8"))
+    payload = _recv_exact(sock, header.get("payload_bytes", 0))
+    return header, payload
+
+def _recv_exact(sock, n_bytes, allow_eof=False):
+    buf = bytearray()
+    while len(buf) < n_bytes:
+        chunk = sock.recv(n_bytes - len(buf))
+        if not chunk:
+            if allow_eof and not buf:
+                return None
+            raise ConnectionError("Inference server connection closed mid-message")
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+class InferenceClient:
+    """
+    Client for the local inference server (see inference_server.py).
+    Keeps one Unix socket connection per thread. Connection failures raise
+    OSError and make the client report itself unavailable for
+    retry_interval seconds, so callers can fall back to in-process scoring
+    without paying a connect attempt on every request.
+    """
+
+    def __init__(self, socket_path, timeout=DEFAULT_TIMEOUT, retry_interval=DEFAULT_RETRY_INTERVAL):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self._local = threading.local()
+        self._retry_at = 0.0
+
+    @property
+    def available(self):
+        return time.monotonic() >= self._retry_at
+
+    def predict(self, tenant_id, X):
+        """
+        Return float64 'fit' probabilities for the rows of X scored by the
+        tenant's model (the global model when tenant_id is None).
+        """
+        if sparse.issparse(X):
+            X = X.toarray()
+        X = np.ascontiguousarray(X, dtype="<f8")
+        if X.ndim != 2:
+            raise ValueError(f"Expected a 2-D feature matrix, got shape {X.shape}")
+        header, payload = self._request(
+            {"op": "predict", "tenant_id": tenant_id, "shape": list(X.shape)}, X.tobytes()
+        )
+        return np.frombuffer(payload, dtype="<f8")
+
+    def stats(self):
+        """Return the server's batching counters."""
+        header, _ = self._request({"op": "stats"})
+        return header["stats"]
+
+    def close(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            self._local.sock = None
+            sock.close()
+
+    def _request(self, header, payload=b""):
+        try:
+            sock = self._connection()
+            send_message(sock, header, payload)
+            response, data = recv_message(sock)
+            if response is None:
+                raise ConnectionError("Inference server closed the connection")
+        except OSError:
+            self.close()
+            self._retry_at = time.monotonic() + self.retry_interval
+            raise
+        if "error" in response:
+            raise InferenceServerError(response["error"])
+        return response, data
+
+    def _connection(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+
+# Client used by predict_job_fit; None means score in-process
+_client = None
+
+def configure_inference_client(socket_path, **kwargs):
+    """Route single predictions through the server at socket_path (None disables)."""
+    global _client
+    if _client is not None:
+        _client.close()
+    _client = InferenceClient(socket_path, **kwargs) if socket_path else None
+    return _client
+
+def get_inference_client():
+    """Return the configured client if the server is currently considered reachable."""
+    client = _client
+    if client is None or not client.available:
+        return None
+    return client
@@ -0,0 +1,166 @@
+# ai_engine/ml_models/inference_server.py
+
+import os
+import queue
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from .global_ai import GLOBAL_MODEL_PATH
+from .inference_client import recv_message, send_message
+from .registry import model_registry
+from .tenant_ai import resolve_tenant_model_path
+
+# How long the batcher waits for more requests after the first one arrives
+DEFAULT_MAX_WAIT = 0.002
+
+# Upper bound on rows coalesced into one predict_proba call
+DEFAULT_MAX_BATCH_ROWS = 4096
+
+
+class MicroBatcher:
+    """
+    Coalesces scoring requests that arrive within max_wait seconds of each
+    other into one batched call per model.
+    score_fn(key, X) must return one score per row of X; requests with the
+    same key (the resolved model path) are stacked into a single X.
+    """
+
+    def __init__(self, score_fn, max_wait=DEFAULT_MAX_WAIT, max_batch_rows=DEFAULT_MAX_BATCH_ROWS):
+        self.score_fn = score_fn
+        self.max_wait = max_wait
+        self.max_batch_rows = max_batch_rows
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self._thread = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, key, X):
+        """Queue rows for scoring. Returns a Future resolving to their scores."""
+        future = Future()
+        self._queue.put((key, X, future))
+        return future
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "rows": self.rows,
+                "batches": self.batches,
+                "avg_requests_per_batch": self.requests / self.batches if self.batches else 0.0,
+            }
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]
+            n_rows = pending[0][1].shape[0]
+            deadline = time.monotonic() + self.max_wait
+            while n_rows < self.max_batch_rows:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                n_rows += item[1].shape[0]
+            self._score(pending)
+
+    def _score(self, pending):
+        groups = {}
+        for key, X, future in pending:
+            groups.setdefault(key, []).append((X, future))
+        for key, items in groups.items():
+            try:
+                X = items[0][0] if len(items) == 1 else np.vstack([X for X, _ in items])
+                scores = self.score_fn(key, X)
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            start = 0
+            for X, future in items:
+                stop = start + X.shape[0]
+                future.set_result(scores[start:stop])
+                start = stop
+        with self._lock:
+            self.requests += len(pending)
+            self.rows += sum(X.shape[0] for _, X, _ in pending)
+            self.batches += len(groups)
+
+
+def score_with_registry(path, X, registry=model_registry):
+    """Probability of the 'fit' class for each row of X using the model at path."""
+    return registry.get(path).predict_proba(X)[:, 1]
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                header, payload = recv_message(self.request)
+            except (OSError, ValueError):
+                return
+            if header is None:
+                return
+            try:
+                response_header, response = self._dispatch(header, payload)
+            except Exception as e:
+                response_header, response = {"error": f"{type(e).__name__}: {e}"}, b""
+            try:
+                send_message(self.request, response_header, response)
+            except OSError:
+                return
+
+    def _dispatch(self, header, payload):
+        server = self.server
+        if header.get("op") == "stats":
+            return {"stats": server.stats()}, b""
+        X = np.frombuffer(payload, dtype="<f8").reshape(header["shape"])
+        path = server.resolve_model_path(header.get("tenant_id"))
+        scores = server.batcher.submit(os.path.abspath(path), X).result()
+        return {"n_rows": X.shape[0]}, np.ascontiguousarray(scores, dtype="<f8").tobytes()
+
+
+class InferenceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Out-of-process scoring service on a Unix socket. Holds tenant and global
+    models in its own registry and micro-batches concurrent requests so that
+    bursts from many web workers become one predict_proba call per model.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, max_wait=DEFAULT_MAX_WAIT,
+                 max_batch_rows=DEFAULT_MAX_BATCH_ROWS, registry=model_registry):
+        if os.path.exists(socket_path):
+            # Left behind by a previous server that did not shut down cleanly
+            os.remove(socket_path)
+        self.socket_path = socket_path
+        self.registry = registry
+        self.batcher = MicroBatcher(
+            lambda path, X: score_with_registry(path, X, registry=registry),
+            max_wait=max_wait,
+            max_batch_rows=max_batch_rows,
+        )
+        super().__init__(socket_path, _RequestHandler)
+
+    def resolve_model_path(self, tenant_id):
+        if tenant_id is None:
+            return GLOBAL_MODEL_PATH
+        return resolve_tenant_model_path(tenant_id)
+
+    def stats(self):
+        return {**self.batcher.stats(), "model_cache": self.registry.stats()}
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
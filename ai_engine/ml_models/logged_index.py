@@ -0,0 +1,178 @@
+# ai_engine/ml_models/logged_index.py
+
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+# Logged changes after which the log is folded into a new snapshot
+DEFAULT_COMPACT_THRESHOLD = 5000
+
+class LoggedIndex:
+    """
+    Per-tenant index kept as an immutable snapshot `<name>.npz` plus an
+    append-only log `<name>.log` of upserts and deletes since. Writers
+    append under a lock file; readers in any process replay new log lines
+    into a small delta segment before each query, so updates are visible at
+    once. Once the log holds compact_threshold changes it is folded into a
+    new snapshot (written aside and swapped in with os.replace) and truncated.
+
+    Subclasses set `name` and `segment_class` (with build / merge / empty /
+    load / save and an `ids` array) and map entries to and from log records.
+    """
+
+    name = None
+    segment_class = None
+
+    def __init__(self, directory, compact_threshold=DEFAULT_COMPACT_THRESHOLD):
+        self.directory = directory
+        self.compact_threshold = compact_threshold
+        self.snapshot_path = os.path.join(directory, f'{self.name}.npz')
+        self.log_path = os.path.join(directory, f'{self.name}.log')
+        self.lock_path = os.path.join(directory, f'{self.name}.lock')
+        self._lock = threading.RLock()
+        self._snapshot_stamp = None
+        self._log_ino = None
+        self._log_offset = 0
+        self._log_entries = 0
+        self._base = self.segment_class.empty()
+        self._overlay = {}  # id -> entry, or None if deleted since the snapshot
+        self._delta = self.segment_class.empty()
+        self._masked = np.zeros(0, dtype=np.int64)
+        self._loaded = False
+
+    def entry_record(self, entry):
+        """JSON-serializable log record (a list) of an upserted entry."""
+        raise NotImplementedError
+
+    def record_entry(self, record):
+        """Entry of a logged upsert record (without its leading "u" tag)."""
+        raise NotImplementedError
+
+    def exists(self):
+        """Whether the index was ever built or written to."""
+        return os.path.exists(self.snapshot_path) or os.path.exists(self.log_path)
+
+    def _refresh(self):
+        with self._lock:
+            snapshot_stamp = _stamp(self.snapshot_path)
+            try:
+                log_stat = os.stat(self.log_path)
+            except FileNotFoundError:
+                log_stat = None
+            log_ino = log_stat.st_ino if log_stat else None
+            changed = not self._loaded
+            if snapshot_stamp != self._snapshot_stamp or log_ino != self._log_ino or not self._loaded:
+                self._base = self.segment_class.load(self.snapshot_path) if snapshot_stamp else self.segment_class.empty()
+                self._overlay = {}
+                self._log_offset = self._log_entries = 0
+                self._snapshot_stamp, self._log_ino = snapshot_stamp, log_ino
+                self._loaded = changed = True
+            if log_stat is not None and log_stat.st_size > self._log_offset:
+                with open(self.log_path, 'rb') as f:
+                    f.seek(self._log_offset)
+                    data = f.read()
+                # Only whole lines; a writer may be mid-append
+                end = data.rfind(b'\n') + 1
+                for line in data[:end].splitlines():
+                    self._apply(json.loads(line))
+                    self._log_entries += 1
+                self._log_offset += end
+                changed = changed or end > 0
+            if changed:
+                self._delta = self.segment_class.build(entry for entry in self._overlay.values() if entry is not None)
+                self._masked = np.array(sorted(self._overlay), dtype=np.int64)
+
+    def _apply(self, record):
+        # ["u", id, ...] or ["d", id]
+        if record[0] == 'u':
+            self._overlay[record[1]] = self.record_entry(record[1:])
+        else:
+            self._overlay[record[1]] = None
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.lock_path, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _append(self, records):
+        if not records:
+            return
+        data = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records).encode('utf-8')
+        with self._lock, self._locked():
+            with open(self.log_path, 'ab') as f:
+                f.write(data)
+            self._refresh()
+            if self._log_entries >= self.compact_threshold:
+                self._compact_locked()
+
+    def upsert_many(self, entries):
+        """Add or replace entries."""
+        self._append([['u'] + self.entry_record(entry) for entry in entries])
+
+    def delete_many(self, entity_ids):
+        """Drop entries (unknown ids are ignored)."""
+        self._append([['d', int(entity_id)] for entity_id in entity_ids])
+
+    def rebuild(self, entries):
+        """Replace the whole index with `entries` (e.g. rebuilt from the database)."""
+        self._replace_snapshot(self.segment_class.build(entries))
+
+    def _replace_snapshot(self, segment):
+        with self._lock, self._locked():
+            segment.save(self.snapshot_path)
+            self._truncate_log()
+            self._refresh()
+
+    def compact(self):
+        """Fold the log into a new snapshot."""
+        with self._lock, self._locked():
+            self._refresh()
+            self._compact_locked()
+
+    def _compact_locked(self):
+        self.segment_class.merge(self._base, self._delta, self._masked).save(self.snapshot_path)
+        self._truncate_log()
+        self._refresh()
+
+    def _truncate_log(self):
+        # A new (empty) file: readers see the inode change and reload
+        tmp_path = f"{self.log_path}.tmp.{os.getpid()}"
+        open(tmp_path, 'wb').close()
+        os.replace(tmp_path, self.log_path)
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return int(len(self._base) - self._base.contains(self._masked).sum() + len(self._delta))
+
+def contains_sorted(ids, entity_ids):
+    """Boolean mask of the entries of sorted `ids` that are in entity_ids."""
+    mask = np.zeros(len(ids), dtype=bool)
+    entity_ids = np.asarray(entity_ids, dtype=np.int64)
+    if len(ids) and len(entity_ids):
+        positions = np.minimum(np.searchsorted(ids, entity_ids), len(ids) - 1)
+        mask[positions[ids[positions] == entity_ids]] = True
+    return mask
+
+def save_npz(path, **arrays):
+    """Write arrays as .npz under a temporary name, then rename it into place."""
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
@@ -1,9 +1,281 @@
 # ai_engine/ml_models/matching.py
 
-class JobCandidateMatchingEngine:
-    def __init__(self, tenant_id):
+import time
+
+import numpy as np
+
+from .pair_features import PAIR_FEATURES, candidate_vector, pair_features_from_vectors, skill_set
+from .semantic_index import candidate_document, job_document
+
+# Candidates passed from candidate generation to model scoring
+DEFAULT_MAX_CANDIDATES = 3000
+
+# Rows scored per model call
+SCORING_BATCH_SIZE = 1024
+
+class MatchingEngine:
+    """
+    Tenant model scoring shared by both matching directions. Per-stage
+    timings and counts of the last search are in last_search.
+    """
+
+    def __init__(self, tenant_id, batch_size=SCORING_BATCH_SIZE):
         self.tenant_id = tenant_id
+        self.batch_size = batch_size
+        self.last_search = None
+
+    def score_features(self, matrix):
+        """
+        Score job-candidate feature rows with the tenant model, reusing
+        cached scores for rows already seen by the current model version.
+        """
+        from ai_engine.utils.prediction_cache import prediction_cache
+        return prediction_cache.predict_job_fit_batch(self.tenant_id, matrix)
+
+    def rank(self, X, limit):
+        """
+        [(score, row)] of the best `limit` feature rows, best first (lower
+        row first on ties). Pair features take few distinct values (skill
+        share, capped experience, flags), so only the distinct rows are
+        scored, in batches of batch_size, and their scores broadcast back.
+        """
+        if not len(X):
+            return []
+        distinct, inverse = np.unique(X, axis=0, return_inverse=True)
+        distinct_scores = np.concatenate([
+            self.score_features(distinct[start:start + self.batch_size])
+            for start in range(0, len(distinct), self.batch_size)
+        ])
+        scores = distinct_scores[inverse.ravel()]
+        rows = np.arange(len(scores))
+        if len(scores) > limit:
+            # Partial selection, then sort only what survives; every row
+            # tying the limit-th score is kept so ties still go to the lower row
+            kth = -np.partition(-scores, limit - 1)[limit - 1]
+            rows = np.flatnonzero(scores >= kth)
+        best = rows[np.lexsort((rows, -scores[rows]))[:limit]]
+        return [(float(scores[row]), int(row)) for row in best]
+
+class JobCandidateMatchingEngine(MatchingEngine):
+    """
+    Two-stage job -> candidates matching for one tenant:
+    1. candidate generation narrows the tenant's pool with its candidate
+       index (skill inverted index plus hard filters) to at most
+       max_candidates, preferring the largest skill overlap;
+    2. ranking scores the distinct feature rows of those candidates with
+       the tenant model in batches and sorts them, keeping the best `limit`
+       (see MatchingEngine.rank).
+    find_similar_candidates is the semantic alternative, ranking by
+    similarity of hashed TF-IDF text vectors instead.
+    """
+
+    def __init__(self, tenant_id, max_candidates=DEFAULT_MAX_CANDIDATES, batch_size=SCORING_BATCH_SIZE):
+        super().__init__(tenant_id, batch_size)
+        self.max_candidates = max_candidates
+
+    def pair_features(self, job_id, candidate_ids):
+        """
+        Feature rows of one job against many candidates, built from the
+        tenant's feature store vectors instead of the candidate records.
+        """
+        from ai_engine.utils.entity_features import candidate_vectors, job_vectors
+        return pair_features_from_vectors(
+            job_vectors(self.tenant_id, [job_id])[0],
+            candidate_vectors(self.tenant_id, [int(candidate_id) for candidate_id in candidate_ids]),
+        )
+
+    def find_best_candidates(self, job, limit=10, filters=None):
+        """
+        Best `limit` candidates for a job, best first, as dicts with the
+        candidate's fields, match_score, skill_overlap and the pair features.
+        filters -- candidate_index.CandidateFilters applied in generation
+        """
+        from ai_engine.utils.candidate_retrieval import ensure_candidate_index, fetch_candidates
+
+        timings = {}
+        started = time.perf_counter()
+        index = ensure_candidate_index(self.tenant_id)
+        candidate_ids, overlap = index.generate(skill_set(job.skills_required), filters, limit=self.max_candidates)
+        timings['generate_ms'] = _elapsed_ms(started)
+
+        stage = time.perf_counter()
+        X = self.pair_features(job.id, candidate_ids) if len(candidate_ids) else np.zeros((0, len(PAIR_FEATURES)))
+        timings['features_ms'] = _elapsed_ms(stage)
+
+        stage = time.perf_counter()
+        # On equal scores the candidate ranked earlier by generation wins
+        ranked = self.rank(X, limit)
+        timings['score_ms'] = _elapsed_ms(stage)
+
+        stage = time.perf_counter()
+        records = fetch_candidates(self.tenant_id, [int(candidate_ids[row]) for _, row in ranked])
+        matches = []
+        for score, row in ranked:
+            record = records.get(int(candidate_ids[row]))
+            if record is None:
+                # Deleted since it was indexed
+                continue
+            matches.append({
+                'candidate_id': record.pop('id'),
+                **record,
+                'match_score': score,
+                'skill_overlap': int(overlap[row]),
+                'features': dict(zip(PAIR_FEATURES, X[row].tolist())),
+            })
+        timings['fetch_ms'] = _elapsed_ms(stage)
+        timings['total_ms'] = _elapsed_ms(started)
+
+        self.last_search = {
+            'pool_size': len(index),
+            'generated': len(candidate_ids),
+            'scored': len(candidate_ids),
+            'timings': timings,
+        }
+        return matches
+
+    def find_similar_candidates(self, job, limit=10, filters=None, approximate=False):
+        """
+        Semantic mode: best `limit` candidates by cosine similarity of the
+        job's text (title, description, required skills) with each
+        candidate's skills and parsed resume, computed offline from the
+        tenant's hashed TF-IDF vectors. Catches matches without a shared
+        skill string ("k8s" / "Kubernetes"). Dicts with the candidate's
+        fields and similarity, best first.
+        filters -- candidate_index.CandidateFilters, applied before ranking
+        approximate -- shortlist candidates with the tenant's ANN index of
+            projected vectors and rerank them by exact similarity instead:
+            sublinear in the pool size, at the cost of some recall
+        """
+        from ai_engine.utils.candidate_retrieval import ensure_candidate_index, fetch_candidates
+        from ai_engine.utils.semantic_matching import approximate_search, ensure_semantic_index
+
+        timings = {}
+        started = time.perf_counter()
+        index = ensure_semantic_index(self.tenant_id, 'candidates')
+        within = None
+        if filters is not None:
+            within, _ = ensure_candidate_index(self.tenant_id).generate((), filters)
+        timings['generate_ms'] = _elapsed_ms(started)
+
+        stage = time.perf_counter()
+        query = index.vectorize(job_document(job.title, job.description, job.skills_required))
+        if approximate:
+            candidate_ids, similarity = approximate_search(self.tenant_id, 'candidates', query, limit, within=within)
+        else:
+            candidate_ids, similarity = index.search(query, limit, within=within)
+        timings['score_ms'] = _elapsed_ms(stage)
+
+        stage = time.perf_counter()
+        records = fetch_candidates(self.tenant_id, candidate_ids.tolist())
+        matches = []
+        for candidate_id, score in zip(candidate_ids.tolist(), similarity.tolist()):
+            record = records.get(candidate_id)
+            if record is None:
+                continue
+            matches.append({'candidate_id': record.pop('id'), **record, 'similarity': round(score, 4)})
+        timings['fetch_ms'] = _elapsed_ms(stage)
+        timings['total_ms'] = _elapsed_ms(started)
+
+        pool_size = len(index)
+        self.last_search = {
+            'pool_size': pool_size,
+            'generated': pool_size if within is None else len(within),
+            'scored': pool_size if within is None else len(within),
+            'timings': timings,
+        }
+        return matches
+
+class CandidateJobMatchingEngine(MatchingEngine):
+    """
+    Reverse candidate -> jobs matching for one tenant: the open jobs that
+    best fit a candidate, saved or not. Job vectors are precomputed in the
+    feature store, so the candidate's vector is broadcast against all of
+    them in one pass and every open job is scored in batches (tenants
+    have thousands of open jobs, not millions, so no generation stage).
+    find_similar_jobs ranks by text similarity instead.
+    """
+
+    def find_best_jobs(self, candidate, limit=10):
+        """
+        Best `limit` open jobs for a candidate (a Candidate, which need not
+        be saved), best first, as dicts with the job's fields, match_score
+        and the pair features.
+        """
+        from ai_engine.utils.entity_features import job_vectors
+        from ai_engine.utils.job_retrieval import fetch_jobs, open_job_ids
+
+        timings = {}
+        started = time.perf_counter()
+        job_ids = open_job_ids(self.tenant_id)
+        timings['generate_ms'] = _elapsed_ms(started)
+
+        stage = time.perf_counter()
+        X = pair_features_from_vectors(
+            job_vectors(self.tenant_id, job_ids.tolist()),
+            candidate_vector(
+                candidate.skills, candidate.experience_years, candidate.location, candidate.ai_learning_profile
+            ),
+        ) if len(job_ids) else np.zeros((0, len(PAIR_FEATURES)), dtype=np.float32)
+        timings['features_ms'] = _elapsed_ms(stage)
+
+        stage = time.perf_counter()
+        ranked = self.rank(X, limit)
+        timings['score_ms'] = _elapsed_ms(stage)
+
+        stage = time.perf_counter()
+        records = fetch_jobs(self.tenant_id, [int(job_ids[row]) for _, row in ranked])
+        matches = []
+        for score, row in ranked:
+            record = records.get(int(job_ids[row]))
+            if record is None:
+                # Deleted or closed since the ids were read
+                continue
+            matches.append({
+                'job_id': record.pop('id'),
+                **record,
+                'match_score': score,
+                'features': dict(zip(PAIR_FEATURES, X[row].tolist())),
+            })
+        timings['fetch_ms'] = _elapsed_ms(stage)
+        timings['total_ms'] = _elapsed_ms(started)
+
+        self.last_search = {'pool_size': len(job_ids), 'scored': len(job_ids), 'timings': timings}
+        return matches
+
+    def find_similar_jobs(self, candidate, limit=10, resume_text=''):
+        """
+        Semantic mode: best `limit` open jobs by cosine similarity of their
+        text with the candidate's skills, parsed resume and resume_text
+        (pasted text not stored anywhere). Dicts with the job's fields and
+        similarity, best first.
+        """
+        from ai_engine.utils.job_retrieval import fetch_jobs, open_job_ids
+        from ai_engine.utils.semantic_matching import ensure_semantic_index
+
+        timings = {}
+        started = time.perf_counter()
+        index = ensure_semantic_index(self.tenant_id, 'jobs')
+        job_ids = open_job_ids(self.tenant_id)
+        timings['generate_ms'] = _elapsed_ms(started)
+
+        stage = time.perf_counter()
+        text = '\n'.join(filter(None, [candidate_document(candidate.skills, candidate.ai_learning_profile), resume_text]))
+        ids, similarity = index.search(text, limit, within=job_ids)
+        timings['score_ms'] = _elapsed_ms(stage)
+
+        stage = time.perf_counter()
+        records = fetch_jobs(self.tenant_id, ids.tolist())
+        matches = []
+        for job_id, score in zip(ids.tolist(), similarity.tolist()):
+            record = records.get(job_id)
+            if record is None:
+                continue
+            matches.append({'job_id': record.pop('id'), **record, 'similarity': round(score, 4)})
+        timings['fetch_ms'] = _elapsed_ms(stage)
+        timings['total_ms'] = _elapsed_ms(started)
+
+        self.last_search = {'pool_size': len(job_ids), 'scored': len(job_ids), 'timings': timings}
+        return matches
 
-    def find_best_candidates(self, job, limit=10):
-        # Implement the logic to find the best candidates for the job
-        pass
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 2)
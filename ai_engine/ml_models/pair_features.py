@@ -0,0 +1,98 @@
+# ai_engine/ml_models/pair_features.py
+
+import zlib
+import numpy as np
+
+# Column order of job-candidate pair features; matches the AIMatchingResult
+# score fields the tenant models are trained on
+PAIR_FEATURES = ['skills_score', 'experience_score', 'location_score', 'education_score']
+
+# Years of experience at which experience_score saturates at 1.0
+EXPERIENCE_SATURATION_YEARS = 10
+
+# Entity vector layout: hashed multi-hot skills followed by scalar slots.
+# Candidates and jobs share the layout; slots that don't apply stay 0.
+SKILL_BINS = 128
+SKILL_COUNT = SKILL_BINS      # distinct skills (exact, unlike the hashed bins)
+EXPERIENCE = SKILL_BINS + 1   # years of experience
+LOCATION = SKILL_BINS + 2     # 24-bit location code, 0 = unknown
+EDUCATION = SKILL_BINS + 3    # education entries in the parsed resume
+VECTOR_DIM = SKILL_BINS + 4
+
+def skill_set(skills):
+    """
+    Normalize a skills JSON value (dict keyed by skill, list of skills or
+    comma-separated string) to a set of lower-cased skill names.
+    """
+    if not skills:
+        return frozenset()
+    if isinstance(skills, str):
+        skills = skills.split(',')
+    return frozenset(str(skill).strip().lower() for skill in skills if str(skill).strip())
+
+def normalize_location(location):
+    return (location or '').strip().lower()
+
+def _stable_hash(text):
+    return zlib.crc32(text.encode('utf-8'))
+
+def text_code(text):
+    """
+    24-bit code of a normalized short string (location, visa status), 0 if
+    empty; 24 bits keep the code exact in float32.
+    """
+    text = normalize_location(text)
+    return (_stable_hash(text) & 0xFFFFFF) + 1 if text else 0
+
+def _base_vector(skills, location):
+    vector = np.zeros(VECTOR_DIM, dtype=np.float32)
+    for skill in skills:
+        vector[_stable_hash(skill) % SKILL_BINS] = 1.0
+    vector[SKILL_COUNT] = len(skills)
+    vector[LOCATION] = text_code(location)
+    return vector
+
+def candidate_vector(skills, experience_years, location, profile=None):
+    """
+    Fixed-width float32 vector of a candidate. Skills and education found
+    by resume parsing (ai_learning_profile) are merged in.
+    """
+    profile = profile if isinstance(profile, dict) else {}
+    vector = _base_vector(skill_set(skills) | skill_set(profile.get('skills')), location)
+    vector[EXPERIENCE] = max(experience_years or 0, 0)
+    education = profile.get('education')
+    vector[EDUCATION] = len(education) if isinstance(education, (list, tuple)) else 0
+    return vector
+
+def job_vector(skills_required, location):
+    """Fixed-width float32 vector of a job."""
+    return _base_vector(skill_set(skills_required), location)
+
+def pair_features_from_vectors(job_vectors, candidate_vectors):
+    """
+    Pair feature rows in PAIR_FEATURES order from entity vectors.
+    job_vectors -- (n, VECTOR_DIM) array, or one job vector broadcast to all candidates
+    candidate_vectors -- (n, VECTOR_DIM) array, or one candidate vector broadcast to all jobs
+    skills_score is the share of the job's required skills the candidate
+    has (hash collisions can only overcount, so it is clipped to 1.0);
+    education_score is 1.0 if the candidate's resume lists education.
+    Returns a float32 array of shape (n, len(PAIR_FEATURES)).
+    """
+    jobs = np.atleast_2d(np.asarray(job_vectors, dtype=np.float32))
+    candidates = np.atleast_2d(np.asarray(candidate_vectors, dtype=np.float32))
+    n = 0 if not len(jobs) or not len(candidates) else max(len(jobs), len(candidates))
+    X = np.zeros((n, len(PAIR_FEATURES)), dtype=np.float32)
+    if not n:
+        return X
+    if len(jobs) > 1 and len(candidates) > 1:
+        shared = np.einsum('ij,ij->i', jobs[:, :SKILL_BINS], candidates[:, :SKILL_BINS])
+    elif len(jobs) == 1:
+        shared = candidates[:, :SKILL_BINS] @ jobs[0, :SKILL_BINS]
+    else:
+        shared = jobs[:, :SKILL_BINS] @ candidates[0, :SKILL_BINS]
+    required = jobs[:, SKILL_COUNT]
+    X[:, 0] = np.minimum(np.divide(shared, required, out=np.zeros_like(shared), where=required > 0), 1.0)
+    X[:, 1] = np.clip(candidates[:, EXPERIENCE], 0, EXPERIENCE_SATURATION_YEARS) / EXPERIENCE_SATURATION_YEARS
+    X[:, 2] = (candidates[:, LOCATION] > 0) & (candidates[:, LOCATION] == jobs[:, LOCATION])
+    X[:, 3] = candidates[:, EDUCATION] > 0
+    return X
@@ -0,0 +1,184 @@
+# ai_engine/ml_models/registry.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+
+from .artifacts import DEFAULT_INFERENCE_BACKEND, artifact_stamp, load_model_artifact
+
+# Default memory budget for loaded models (512 MB)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded model objects.
+    Entries are keyed by absolute file path and validated against the
+    artifact's stat stamp, so a retrained model on disk is picked up on the
+    next lookup. With a check_interval, a cached entry is re-validated at
+    most once per interval, so hot lookups skip the stat calls and a new
+    version is swapped in within that interval.
+    Least recently used models are evicted once the memory budget is exceeded.
+    The in-memory size of a model is approximated by its artifact size on disk.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, loader=load_model_artifact,
+                 stamp=artifact_stamp, check_interval=0.0):
+        self.max_bytes = max_bytes
+        self.check_interval = check_interval
+        self.backend = DEFAULT_INFERENCE_BACKEND
+        self._loader = loader
+        self._stamp = stamp
+        self._entries = OrderedDict()  # path -> (stamp, model, nbytes)
+        self._checked_at = {}  # path -> monotonic time of last stamp check
+        self._lock = threading.RLock()
+        self._path_locks = {}
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path):
+        """
+        Return the model stored at `path`, loading it from disk on a miss.
+        Raises FileNotFoundError if the file does not exist.
+        """
+        return self.get_versioned(path)[0]
+
+    def get_versioned(self, path):
+        """
+        (model, stamp) of the model stored at `path`: the stamp is that of
+        the artifact the returned model was loaded from, which may lag the
+        file on disk by up to check_interval. Key anything derived from the
+        model's output (e.g. cached scores) by this stamp.
+        """
+        path = os.path.abspath(path)
+        entry = self._lookup_fresh(path)
+        if entry is not None:
+            return entry[1], entry[0]
+        stamp = self._stamp(path)
+        entry = self._lookup(path, stamp)
+        if entry is not None:
+            return entry[1], entry[0]
+
+        # Serialize loads of the same file so concurrent misses unpickle once
+        with self._path_lock(path):
+            stamp = self._stamp(path)
+            entry = self._lookup(path, stamp, count=False)
+            if entry is not None:
+                return entry[1], entry[0]
+            model = self._loader(path)
+            self._store(path, stamp, model, os.path.getsize(path))
+        return model, stamp
+
+    def invalidate(self, path):
+        """Drop a cached model, e.g. after its file has been rewritten."""
+        path = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            self._checked_at.pop(path, None)
+            if entry is not None:
+                self.current_bytes -= entry[2]
+
+    def clear(self):
+        """Drop all cached models and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._checked_at.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def configure(self, max_bytes=None, backend=None, check_interval=None):
+        """
+        Update the memory budget, evicting models if it shrank, switch the
+        inference backend (see artifacts.load_model_artifact) and/or set how
+        often cached models are checked for a new version on disk.
+        """
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if check_interval is not None:
+                self.check_interval = check_interval
+            if backend is not None and backend != self.backend:
+                self._loader = partial(load_model_artifact, backend=backend)
+                self.backend = backend
+                self._entries.clear()
+                self.current_bytes = 0
+            self._evict()
+
+    def stats(self):
+        """Return cache counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'current_bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'backend': self.backend,
+                'check_interval': self.check_interval,
+            }
+
+    def _path_lock(self, path):
+        with self._lock:
+            return self._path_locks.setdefault(path, threading.Lock())
+
+    def _lookup_fresh(self, path):
+        """Return the cached (stamp, model, nbytes) entry if it was validated within check_interval."""
+        if self.check_interval <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(path)
+            checked_at = self._checked_at.get(path)
+            if entry is None or checked_at is None:
+                return None
+            if time.monotonic() - checked_at >= self.check_interval:
+                return None
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry
+
+    def _lookup(self, path, stamp, count=True):
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(path)
+                self._checked_at[path] = time.monotonic()
+                if count:
+                    self.hits += 1
+                return entry
+            if count:
+                self.misses += 1
+            return None
+
+    def _store(self, path, stamp, model, nbytes):
+        with self._lock:
+            self.invalidate(path)
+            if nbytes > self.max_bytes:
+                # Larger than the whole budget: serve it but don't cache it
+                return
+            self._entries[path] = (stamp, model, nbytes)
+            self._checked_at[path] = time.monotonic()
+            self.current_bytes += nbytes
+            self._evict()
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._entries:
+            path, (_, _, nbytes) = self._entries.popitem(last=False)
+            self._checked_at.pop(path, None)
+            self.current_bytes -= nbytes
+            self.evictions += 1
+
+
+# Shared registry used by global and tenant model loaders
+model_registry = ModelRegistry()
+
+
+def get_model(path):
+    """Load a model through the process-wide registry."""
+    return model_registry.get(path)
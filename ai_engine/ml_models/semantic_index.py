@@ -0,0 +1,355 @@
+# ai_engine/ml_models/semantic_index.py
+
+import re
+import zlib
+from collections import Counter, namedtuple
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+
+from .logged_index import LoggedIndex, contains_sorted, save_npz
+
+# Dimension of the hashed term space (unigrams and bigrams)
+HASH_FEATURES = 2 ** 20
+
+# Heaviest query terms kept when scoring; the rest add little to the cosine
+# but their (often long) posting columns dominate the sparse product
+DEFAULT_MAX_QUERY_TERMS = 64
+
+# Spellings of the same skill mapped to one term, so "k8s" in a resume
+# matches "Kubernetes" in a job description
+TERM_ALIASES = {
+    'k8s': 'kubernetes', 'kube': 'kubernetes',
+    'js': 'javascript', 'ecmascript': 'javascript', 'es6': 'javascript',
+    'ts': 'typescript',
+    'py': 'python', 'python3': 'python', 'python2': 'python',
+    'golang': 'go',
+    'postgres': 'postgresql', 'psql': 'postgresql', 'pg': 'postgresql',
+    'mongo': 'mongodb',
+    'tf': 'tensorflow', 'sklearn': 'scikit-learn', 'scikit': 'scikit-learn',
+    'ml': 'machine-learning', 'dl': 'deep-learning', 'nlp': 'natural-language-processing',
+    'ai': 'artificial-intelligence',
+    'aws': 'amazon-web-services', 'gcp': 'google-cloud', 'azure': 'microsoft-azure',
+    'ci': 'ci-cd', 'cd': 'ci-cd', 'cicd': 'ci-cd',
+    'c++': 'cpp', 'c#': 'csharp', 'dotnet': '.net',
+    'rn': 'react-native',
+}
+
+# Multi-word spellings folded into the same terms before tokenizing
+PHRASE_ALIASES = {
+    'machine learning': 'machine-learning',
+    'deep learning': 'deep-learning',
+    'natural language processing': 'natural-language-processing',
+    'artificial intelligence': 'artificial-intelligence',
+    'amazon web services': 'amazon-web-services',
+    'google cloud platform': 'google-cloud', 'google cloud': 'google-cloud',
+    'microsoft azure': 'microsoft-azure',
+    'ci/cd': 'ci-cd', 'continuous integration': 'ci-cd', 'continuous delivery': 'ci-cd',
+    'react native': 'react-native',
+    'scikit learn': 'scikit-learn',
+}
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the this to was we were will with
+you your years year experience work working strong knowledge skills ability etc
+""".split())
+
+_PHRASE_RE = re.compile(
+    r'(?<![\w-])(' + '|'.join(re.escape(phrase) for phrase in sorted(PHRASE_ALIASES, key=len, reverse=True)) + r')(?![\w-])'
+)
+_TOKEN_RE = re.compile(r'[a-z0-9.][a-z0-9+#./-]*')
+
+# Parsed resume fields (ai_learning_profile keys) that say nothing about fit
+PROFILE_EXCLUDED_FIELDS = frozenset({'name', 'email', 'phone', 'links'})
+
+# A document vector: hashed term columns (sorted) and their weights
+SemanticEntry = namedtuple('SemanticEntry', 'id indices values')
+
+def _text_parts(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key not in PROFILE_EXCLUDED_FIELDS:
+                yield from _text_parts(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _text_parts(item)
+
+def candidate_document(skills, profile=None):
+    """
+    Text of a candidate: their skills (dict keys, list or comma string)
+    and the text fields of the parsed resume in ai_learning_profile.
+    """
+    names = list(skills) if isinstance(skills, dict) else skills
+    return '\n'.join(_text_parts([names or [], profile if isinstance(profile, dict) else []]))
+
+def job_document(title, description, skills_required):
+    """Text of a job: title, description and required skills."""
+    names = list(skills_required) if isinstance(skills_required, dict) else skills_required
+    return '\n'.join(_text_parts([title or '', description or '', names or []]))
+
+def normalize_token(token):
+    """Canonical form of a token: aliases resolved, "reactjs" / "node.js" -> "react" / "node"."""
+    token = token.strip('./-')
+    if token in TERM_ALIASES:
+        return TERM_ALIASES[token]
+    if token.endswith('.js') and len(token) > 3:
+        token = token[:-3]
+    elif token.endswith('js') and len(token) > 4:
+        token = token[:-2]
+    return TERM_ALIASES.get(token, token)
+
+def analyze(text):
+    """Terms of a text: normalized tokens without stop words, plus adjacent-token bigrams."""
+    text = _PHRASE_RE.sub(lambda m: PHRASE_ALIASES[m.group(1)], (text or '').lower())
+    tokens = [normalize_token(token) for token in _TOKEN_RE.findall(text)]
+    tokens = [token for token in tokens if token and token not in STOP_WORDS]
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+@lru_cache(maxsize=2 ** 18)
+def term_column(term):
+    """Hashed column of a term."""
+    return zlib.crc32(term.encode('utf-8')) % HASH_FEATURES
+
+def term_counts(text):
+    """(columns, sublinear term frequencies 1 + log tf) of a text, columns sorted."""
+    counts = Counter(term_column(term) for term in analyze(text))
+    columns = np.fromiter(sorted(counts), dtype=np.int32, count=len(counts))
+    tf = np.fromiter((counts[column] for column in columns.tolist()), dtype=np.float32, count=len(columns))
+    return columns, 1.0 + np.log(tf)
+
+def sorted_positions(sorted_ids, entity_ids):
+    """(positions, found) of entity_ids in the sorted id array sorted_ids."""
+    if not len(sorted_ids):
+        return np.zeros(len(entity_ids), dtype=np.int64), np.zeros(len(entity_ids), dtype=bool)
+    positions = np.minimum(np.searchsorted(sorted_ids, entity_ids), len(sorted_ids) - 1)
+    return positions, sorted_ids[positions] == entity_ids
+
+def inverse_document_frequency(document_frequency, n_documents):
+    """Smoothed idf, as sklearn's TfidfTransformer: log((1 + n) / (1 + df)) + 1."""
+    return (np.log((1.0 + n_documents) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+
+def weigh(columns, tf, idf=None):
+    """L2-normalized TF-IDF weights of a term count vector (idf None: plain tf)."""
+    values = tf * idf[columns] if idf is not None and len(idf) else tf.astype(np.float32)
+    norm = float(np.sqrt(np.dot(values, values)))
+    return values / norm if norm else values
+
+class SemanticSegment:
+    """
+    Immutable set of L2-normalized TF-IDF document vectors sorted by id,
+    stored column-major (CSC: each hashed term's posting column) so a
+    query only touches the columns of its own terms, and the idf the rows
+    were weighted with (empty: unweighted).
+    """
+
+    def __init__(self, ids, matrix, idf):
+        self.ids = ids
+        self.matrix = matrix
+        self.idf = idf
+        self._rows = None
+
+    @classmethod
+    def build(cls, entries, idf=None):
+        """Segment of SemanticEntry rows (ids must be unique)."""
+        entries = sorted(entries, key=lambda entry: entry.id)
+        indptr = np.zeros(len(entries) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(entry.indices) for entry in entries])
+        rows = sparse.csr_matrix(
+            (
+                np.concatenate([entry.values for entry in entries]).astype(np.float32) if entries else np.zeros(0, np.float32),
+                np.concatenate([entry.indices for entry in entries]).astype(np.int32) if entries else np.zeros(0, np.int32),
+                indptr,
+            ),
+            shape=(len(entries), HASH_FEATURES),
+        )
+        return cls(
+            ids=np.fromiter((entry.id for entry in entries), dtype=np.int64, count=len(entries)),
+            matrix=rows.tocsc(),
+            idf=np.zeros(0, dtype=np.float32) if idf is None else idf,
+        )
+
+    @classmethod
+    def merge(cls, base, delta, removed_ids):
+        """
+        New segment holding base without removed_ids (and without the ids
+        in delta, which replace their base rows), plus delta. Rows keep
+        their weights and the base idf is kept.
+        """
+        removed = np.union1d(np.asarray(removed_ids, dtype=np.int64), delta.ids)
+        keep = np.flatnonzero(~base.contains(removed))
+        ids = np.concatenate([base.ids[keep], delta.ids])
+        rows = sparse.vstack([base.matrix.tocsr()[keep], delta.matrix.tocsr()], format='csr')
+        order = np.argsort(ids, kind='stable')
+        return cls(ids=ids[order], matrix=rows[order].tocsc(), idf=base.idf)
+
+    @classmethod
+    def empty(cls):
+        return cls.build([])
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as archive:
+            matrix = sparse.csc_matrix(
+                (archive['data'], archive['indices'], archive['indptr']), shape=(len(archive['ids']), HASH_FEATURES)
+            )
+            return cls(ids=archive['ids'], matrix=matrix, idf=archive['idf'])
+
+    def save(self, path):
+        """Write the segment as .npz under a temporary name, then rename it into place."""
+        save_npz(
+            path, ids=self.ids, data=self.matrix.data, indices=self.matrix.indices, indptr=self.matrix.indptr,
+            idf=self.idf,
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def contains(self, entity_ids):
+        """Boolean mask of rows whose id is in entity_ids."""
+        return contains_sorted(self.ids, entity_ids)
+
+    def scores(self, columns, values):
+        """Dot product of every row with a sparse query (dense, one score per row)."""
+        if not len(self.ids) or not len(columns):
+            return np.zeros(len(self.ids), dtype=np.float32)
+        return np.asarray(self.matrix[:, columns] @ values, dtype=np.float32).ravel()
+
+    def row_scores(self, positions, columns, values):
+        """
+        Dot product of the rows at `positions` with a sparse query. Rows are
+        read from a row-major copy of the matrix, made on first use.
+        """
+        if not len(positions) or not len(columns):
+            return np.zeros(len(positions), dtype=np.float32)
+        if self._rows is None:
+            self._rows = self.matrix.tocsr()
+        rows = self._rows[positions]
+        # Query weight of each stored term (columns are sorted), summed per row
+        found = np.minimum(np.searchsorted(columns, rows.indices), len(columns) - 1)
+        weights = np.where(columns[found] == rows.indices, values[found], 0)
+        return np.bincount(
+            np.repeat(np.arange(len(positions)), np.diff(rows.indptr)), weights=rows.data * weights, minlength=len(positions)
+        ).astype(np.float32)
+
+class SemanticIndex(LoggedIndex):
+    """
+    Per-tenant hashed TF-IDF vectors of one kind of document (candidates or
+    jobs) for offline semantic matching: `semantic.<kind>.npz` plus its log
+    (see LoggedIndex). Documents added after the last rebuild are weighted
+    with the snapshot's idf, so they go in without touching the other rows;
+    rebuild() refreshes the idf from the whole corpus.
+    """
+
+    segment_class = SemanticSegment
+
+    def __init__(self, directory, kind='candidates', max_query_terms=DEFAULT_MAX_QUERY_TERMS, **kwargs):
+        self.name = f'semantic.{kind}'
+        self.max_query_terms = max_query_terms
+        super().__init__(directory, **kwargs)
+
+    def entry_record(self, entry):
+        # [id, columns, weights]
+        return [int(entry.id), entry.indices.tolist(), [round(value, 6) for value in entry.values.tolist()]]
+
+    def record_entry(self, record):
+        return SemanticEntry(
+            record[0], np.asarray(record[1], dtype=np.int32), np.asarray(record[2], dtype=np.float32)
+        )
+
+    @property
+    def idf(self):
+        with self._lock:
+            self._refresh()
+            return self._base.idf
+
+    def vectorize(self, text, idf=None):
+        """(columns, weights) of a text, weighted with the index idf."""
+        columns, tf = term_counts(text)
+        return columns, weigh(columns, tf, self.idf if idf is None else idf)
+
+    def rebuild(self, documents):
+        """
+        Replace the index with (id, text) documents, computing the idf from
+        them. Returns the number of documents.
+        """
+        counted = [(int(document_id), *term_counts(text)) for document_id, text in documents]
+        document_frequency = np.bincount(
+            np.concatenate([columns for _, columns, _ in counted]) if counted else np.zeros(0, np.int64),
+            minlength=HASH_FEATURES,
+        )
+        idf = inverse_document_frequency(document_frequency, len(counted))
+        entries = [SemanticEntry(document_id, columns, weigh(columns, tf, idf)) for document_id, columns, tf in counted]
+        self._replace_snapshot(SemanticSegment.build(entries, idf))
+        return len(entries)
+
+    def add_documents(self, documents):
+        """Add or replace (id, text) documents without rebuilding. Returns their SemanticEntry rows."""
+        idf = self.idf
+        entries = [SemanticEntry(int(document_id), *self.vectorize(text, idf)) for document_id, text in documents]
+        self.upsert_many(entries)
+        return entries
+
+    def export(self):
+        """(ids, CSR matrix of their vectors) of every indexed document."""
+        with self._lock:
+            self._refresh()
+            base, delta, masked = self._base, self._delta, self._masked
+        keep = np.flatnonzero(~base.contains(masked))
+        return (
+            np.concatenate([base.ids[keep], delta.ids]),
+            sparse.vstack([base.matrix.tocsr()[keep], delta.matrix.tocsr()], format='csr'),
+        )
+
+    def query_terms(self, query):
+        """(columns, weights) scored for a text or vector query: its max_query_terms heaviest terms."""
+        columns, values = self.vectorize(query) if isinstance(query, str) else query
+        if len(columns) > self.max_query_terms:
+            top = np.sort(np.argpartition(-values, self.max_query_terms - 1)[:self.max_query_terms])
+            columns, values = columns[top], values[top]
+        return columns, values
+
+    def similarity(self, query, document_ids):
+        """
+        Cosine similarity of `query` (as in search) with each of the given
+        documents, aligned with document_ids; 0 for ids not indexed. Only
+        those rows are read, so scoring a shortlist costs little.
+        """
+        columns, values = self.query_terms(query)
+        document_ids = np.asarray(document_ids, dtype=np.int64)
+        with self._lock:
+            self._refresh()
+            base, delta, masked = self._base, self._delta, self._masked
+        base_positions, in_base = sorted_positions(base.ids, document_ids)
+        delta_positions, in_delta = sorted_positions(delta.ids, document_ids)
+        in_base &= ~np.isin(document_ids, masked)
+        scores = np.zeros(len(document_ids), dtype=np.float32)
+        scores[in_base] = base.row_scores(base_positions[in_base], columns, values)
+        scores[in_delta] = delta.row_scores(delta_positions[in_delta], columns, values)
+        return scores
+
+    def search(self, query, limit=10, within=None):
+        """
+        Cosine top-k: ids of the `limit` documents most similar to `query`
+        (a text or a (columns, weights) vector) and their similarity, best
+        first; documents sharing no term are left out. With `within` only
+        those ids are considered.
+        """
+        columns, values = self.query_terms(query)
+        with self._lock:
+            self._refresh()
+            base, delta, masked = self._base, self._delta, self._masked
+        base_scores = base.scores(columns, values)
+        if len(masked):
+            base_scores[base.contains(masked)] = 0
+        ids = np.concatenate([base.ids, delta.ids])
+        scores = np.concatenate([base_scores, delta.scores(columns, values)])
+        if within is not None:
+            scores[~np.isin(ids, np.asarray(within, dtype=np.int64))] = 0
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) > limit:
+            hits = hits[np.argpartition(-scores[hits], limit - 1)[:limit]]
+        order = np.lexsort((-ids[hits], -scores[hits]))
+        return ids[hits][order], scores[hits][order]
@@ -1,59 +1,143 @@
 # ai_engine/ml_models/tenant_ai.py
 
-import joblib
 from sklearn.ensemble import RandomForestClassifier
 import os
 
+import numpy as np
+
+from .artifacts import load_estimator, make_model_ref, remove_model_artifact, save_model_version
+from .inference import DEFAULT_CHUNK_SIZE, predict_fit_proba_batch
+from .inference_client import InferenceServerError, get_inference_client
+from .registry import model_registry
+
 GLOBAL_MODEL_PATH = "models/global/global_ai_model.pkl"
 TENANT_MODEL_DIR = "models/tenants"
 
+# Trees added to a tenant forest by one incremental update
+DEFAULT_INCREMENTAL_TREES = 10
+
+def get_tenant_model_path(tenant_id):
+    """
+    Path of the tenant's own model file. It only exists once the tenant
+    has been trained; until then the tenant shares the global model.
+    """
+    return os.path.join(TENANT_MODEL_DIR, f"tenant_{tenant_id}_ai_model.pkl")
+
 def clone_global_model_for_tenant(tenant_id):
     """
-    Clone the global candidate model for a new tenant.
-    Returns the model file path for database reference.
+    Clone the global candidate model for a new tenant (copy-on-write).
+    No file is written: the tenant references the global artifact until its
+    first train_tenant_model call materializes a tenant-specific model.
+    Returns the model reference for database reference.
     """
-    # Load global model
-    global_model = joblib.load(GLOBAL_MODEL_PATH)
-    # Path for tenant model
-    tenant_model_path = os.path.join(TENANT_MODEL_DIR, f"tenant_{tenant_id}_ai_model.pkl")
-    os.makedirs(TENANT_MODEL_DIR, exist_ok=True)
-    joblib.dump(global_model, tenant_model_path)
+    # Drop any earlier tenant-specific model so the tenant follows the global one
+    tenant_model_path = get_tenant_model_path(tenant_id)
+    remove_model_artifact(tenant_model_path)
+    model_registry.invalidate(tenant_model_path)
+    return make_model_ref(GLOBAL_MODEL_PATH)
+
+def resolve_tenant_model_path(tenant_id):
+    """
+    Return the artifact file serving the tenant: its own model if trained,
+    otherwise the shared global model.
+    """
+    tenant_model_path = get_tenant_model_path(tenant_id)
+    if not os.path.isfile(tenant_model_path):
+        return GLOBAL_MODEL_PATH
     return tenant_model_path
 
 def load_tenant_model(tenant_id):
     """
     Load the tenant-specific model for job matching.
-    Falls back to global model if tenant model missing.
+    Falls back to global model if tenant model missing; tenants sharing the
+    global model get the same cached object from the process-wide registry.
     """
-    tenant_model_path = os.path.join(TENANT_MODEL_DIR, f"tenant_{tenant_id}_ai_model.pkl")
-    if not os.path.isfile(tenant_model_path):
-        # Fallback to global model
-        return joblib.load(GLOBAL_MODEL_PATH)
-    return joblib.load(tenant_model_path)
+    return model_registry.get(resolve_tenant_model_path(tenant_id))
 
-def train_tenant_model(tenant_id, X, y):
+def load_tenant_model_versioned(tenant_id):
+    """
+    (model, stamp) of the model serving the tenant (see load_tenant_model):
+    the registry stamp identifies the artifact version that model was
+    loaded from (ModelRegistry.get_versioned).
+    """
+    return model_registry.get_versioned(resolve_tenant_model_path(tenant_id))
+
+def train_tenant_model(tenant_id, X, y, params=None):
     """
     Retrain tenant model with local job matching feedback.
     X -- features for job-candidate pairs
     y -- job fit labels (e.g., short-list vs. reject)
+    params -- RandomForestClassifier hyperparameters (e.g. from tuning); defaults if None
+    The first call materializes the tenant's own model file, ending the
+    copy-on-write sharing of the global model.
+    Each call publishes a new model version; running workers swap to it
+    on their next registry check.
+    """
+    model = RandomForestClassifier(**(params or {}))
+    model.fit(X, y)
+    tenant_model_path = get_tenant_model_path(tenant_id)
+    save_model_version(model, tenant_model_path)
+    model_registry.invalidate(tenant_model_path)
+    return model
+
+def update_tenant_model(tenant_id, X, y, n_new_trees=DEFAULT_INCREMENTAL_TREES):
     """
-    model = RandomForestClassifier()
+    Incrementally update the tenant model with newly labeled rows only.
+    Uses warm_start to append n_new_trees trees fit on X, y to the tenant's
+    current forest (or a copy of the global one while it is shared), so
+    the update costs seconds instead of a retrain over all history.
+    X -- features for the new job-candidate pairs, same columns as the model
+    y -- job fit labels for those pairs; every class the model knows must occur
+    Raises ValueError if the model is not a forest or the rows don't fit it.
+    """
+    model = load_estimator(resolve_tenant_model_path(tenant_id))
+    if not hasattr(model, "estimators_") or not hasattr(model, "warm_start"):
+        raise ValueError(f"Cannot update {type(model).__name__} incrementally; retrain it instead")
+    if np.shape(X)[1] != model.n_features_in_:
+        raise ValueError(f"Expected {model.n_features_in_} features, got {np.shape(X)[1]}")
+    # warm_start refits classes_ from y, so new rows must cover every known class
+    if not np.array_equal(np.unique(y), model.classes_):
+        raise ValueError(f"New labels must cover all classes {list(model.classes_)}")
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_new_trees)
     model.fit(X, y)
-    tenant_model_path = os.path.join(TENANT_MODEL_DIR, f"tenant_{tenant_id}_ai_model.pkl")
-    joblib.dump(model, tenant_model_path)
+    model.set_params(warm_start=False)
+    tenant_model_path = get_tenant_model_path(tenant_id)
+    save_model_version(model, tenant_model_path)
+    model_registry.invalidate(tenant_model_path)
     return model
 
 def predict_job_fit(tenant_id, features):
     """
     Predict the candidate-job fit probability using tenant AI model.
     Falls back to global model if tenant model missing.
+    Uses the local inference server when one is configured and reachable,
+    otherwise scores in-process.
     features -- 1D array-like feature vector
     """
+    client = get_inference_client()
+    if client is not None:
+        try:
+            return client.predict(tenant_id, [features])[0]
+        except (OSError, InferenceServerError):
+            pass
     model = load_tenant_model(tenant_id)
     score = model.predict_proba([features])[0][1]  # Probability of 'fit' class
     return score
 
+def predict_job_fit_batch(tenant_id, matrix, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Predict fit probabilities for many candidate-job feature vectors at once.
+    Falls back to global model if tenant model missing.
+    matrix -- 2-D NumPy array or CSR matrix, one row per candidate
+    chunk_size -- max rows per predict_proba call (caps peak memory)
+    Returns a float32 array of scores aligned with the rows of matrix.
+    """
+    model = load_tenant_model(tenant_id)
+    return predict_fit_proba_batch(model, matrix, chunk_size=chunk_size)
+
 # Example usage:
-# model_path = clone_global_model_for_tenant(tenant_id)
+# model_ref = clone_global_model_for_tenant(tenant_id)
 # model = train_tenant_model(tenant_id, X, y)
+# model = update_tenant_model(tenant_id, X_new, y_new)
 # score = predict_job_fit(tenant_id, candidate_job_features)
+# scores = predict_job_fit_batch(tenant_id, candidate_job_matrix)
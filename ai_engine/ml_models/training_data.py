@@ -0,0 +1,198 @@
+# ai_engine/ml_models/training_data.py
+
+import os
+import time
+import zipfile
+import numpy as np
+import pandas as pd
+
+LABEL_COLUMN = "fit_label"
+
+# Rows read per chunk while streaming a training export
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Default cap on the in-memory training matrix
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far, or None if unknown."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def downcast_frame(df):
+    """
+    Shrink a DataFrame chunk in place: floats to float32 and integers to
+    the smallest integer type holding their range (e.g. int8 labels).
+    Other columns are left as read (features must be numeric). Returns df.
+    """
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_float_dtype(series):
+            df[col] = series.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="integer")
+    return df
+
+def iter_training_chunks(path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Stream a training export as downcast DataFrame chunks.
+    Supports CSV, Parquet (needs pyarrow) and NumPy .npz archives holding
+    `X` and `y` arrays (plus optional `feature_names`), read a block of
+    rows at a time; .npz labels are exposed as the LABEL_COLUMN column.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npz":
+        yield from _iter_npz_chunks(path, chunk_rows)
+    elif ext in (".parquet", ".pq"):
+        yield from _iter_parquet_chunks(path, chunk_rows)
+    else:
+        for chunk in pd.read_csv(path, chunksize=chunk_rows, low_memory=True):
+            yield downcast_frame(chunk)
+
+def _iter_parquet_chunks(path, chunk_rows):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet training data requires pyarrow (pip install pyarrow)")
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+        yield downcast_frame(batch.to_pandas())
+
+def _iter_npz_chunks(path, chunk_rows):
+    with zipfile.ZipFile(path) as archive:
+        if "feature_names.npy" in archive.namelist():
+            with archive.open("feature_names.npy") as f:
+                columns = [str(name) for name in np.lib.format.read_array(f, allow_pickle=False)]
+        else:
+            columns = None
+        blocks = zip(_iter_npy_rows(archive, "X", chunk_rows), _iter_npy_rows(archive, "y", chunk_rows), strict=True)
+        for X, y in blocks:
+            if columns is None:
+                columns = [f"f{i}" for i in range(X.shape[1])]
+            chunk = pd.DataFrame(X, columns=columns)
+            chunk[LABEL_COLUMN] = y
+            yield downcast_frame(chunk)
+
+def _iter_npy_rows(archive, name, chunk_rows):
+    """
+    Blocks of chunk_rows rows of the `name` array of an open .npz archive,
+    decoded as the member is read (compressed or not), so only one block
+    is in memory. Fortran-ordered arrays (not stored row by row) and
+    other .npy format versions are read whole, then sliced.
+    """
+    read_header = {
+        (1, 0): np.lib.format.read_array_header_1_0,
+        (2, 0): np.lib.format.read_array_header_2_0,
+    }
+    with archive.open(name + ".npy") as f:
+        version = np.lib.format.read_magic(f)
+        shape, fortran_order, dtype = read_header[version](f) if version in read_header else (None, True, None)
+        if dtype is not None and dtype.hasobject:
+            raise ValueError(f"Training array '{name}' holds Python objects")
+        if fortran_order:
+            f.seek(0)
+            array = np.lib.format.read_array(f, allow_pickle=False)
+            for start in range(0, len(array), chunk_rows):
+                yield array[start:start + chunk_rows]
+            return
+        row_bytes = int(np.prod(shape[1:], dtype=np.int64)) * dtype.itemsize
+        for start in range(0, shape[0], chunk_rows):
+            rows = min(chunk_rows, shape[0] - start)
+            data = f.read(rows * row_bytes)
+            if len(data) < rows * row_bytes:
+                raise ValueError(f"Training array '{name}' is truncated")
+            yield np.frombuffer(data, dtype=dtype).reshape((rows,) + tuple(shape[1:]))
+
+def _split_chunk(chunk, label):
+    if label not in chunk.columns:
+        raise ValueError(f"Training data has no '{label}' column")
+    features = chunk.drop(columns=[label])
+    non_numeric = [c for c in features.columns if not pd.api.types.is_numeric_dtype(features[c])]
+    if non_numeric:
+        raise ValueError(f"Non-numeric feature columns: {non_numeric}")
+    return features.to_numpy(dtype=np.float32), chunk[label].to_numpy(), list(features.columns)
+
+def load_training_matrix(path, max_bytes=DEFAULT_MAX_BYTES, chunk_rows=DEFAULT_CHUNK_ROWS,
+                         label=LABEL_COLUMN, random_state=0):
+    """
+    Load a training export into a float32 feature matrix no larger than
+    max_bytes. Chunks are streamed and, once the cap is reached, rows are
+    kept by a uniform random sample over the whole file (bottom-k on random
+    keys) updated in place. Peak memory is about twice the cap plus a
+    chunk: the chunks read until the cap is reached (each row with an
+    8-byte sampling key) are held while the sample, or for a file under
+    the cap the concatenated matrix, is copied out of them.
+    Returns (X, y, feature_names, stats) where stats holds rows_read,
+    rows_used, load_seconds and peak_rss_bytes.
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(random_state)
+    feature_names = None
+    pending = []  # chunks read before the cap is reached
+    pending_rows = 0
+    X = y = keys = None  # the sample, once the cap is reached
+    rows_read = 0
+    for chunk in iter_training_chunks(path, chunk_rows):
+        chunk_X, chunk_y, names = _split_chunk(chunk, label)
+        if feature_names is None:
+            feature_names = names
+            max_rows = max(1, max_bytes // max(1, chunk_X.shape[1] * chunk_X.itemsize))
+        elif names != feature_names:
+            raise ValueError("Training data columns change between chunks")
+        rows_read += len(chunk_X)
+        chunk_keys = rng.random(len(chunk_X))
+
+        if X is None:
+            pending.append((chunk_X, chunk_y, chunk_keys))
+            pending_rows += len(chunk_X)
+            if pending_rows > max_rows:
+                X, y, keys = _bottom_k(pending, max_rows)
+                pending = []
+            continue
+        # Rows of the chunk that beat the current sample's largest keys
+        # replace those sample rows in place
+        combined = np.concatenate([keys, chunk_keys])
+        kept = np.argpartition(combined, max_rows - 1)[:max_rows]
+        incoming = kept[kept >= len(keys)] - len(keys)
+        if len(incoming):
+            evicted = np.setdiff1d(np.arange(len(keys)), kept[kept < len(keys)], assume_unique=True)
+            X[evicted], y[evicted], keys[evicted] = chunk_X[incoming], chunk_y[incoming], chunk_keys[incoming]
+    if feature_names is None:
+        raise ValueError(f"No training rows in {path}")
+    if X is None:
+        X = np.concatenate([part[0] for part in pending])
+        y = np.concatenate([part[1] for part in pending])
+    stats = {
+        "rows_read": rows_read,
+        "rows_used": len(X),
+        "load_seconds": time.perf_counter() - started,
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+    return X, y, feature_names, stats
+
+def _bottom_k(parts, k):
+    """Rows of the (X, y, keys) parts with the k smallest keys, in file order."""
+    keys = np.concatenate([part[2] for part in parts])
+    keep = np.sort(np.argpartition(keys, k - 1)[:k])
+    X = np.empty((k, parts[0][0].shape[1]), dtype=parts[0][0].dtype)
+    y = np.empty(k, dtype=np.result_type(*(part[1] for part in parts)))
+    offset = filled = 0
+    while parts:
+        part_X, part_y, _ = parts.pop(0)
+        rows = keep[(keep >= offset) & (keep < offset + len(part_X))] - offset
+        X[filled:filled + len(rows)] = part_X[rows]
+        y[filled:filled + len(rows)] = part_y[rows]
+        filled += len(rows)
+        offset += len(part_X)
+    return X, y, keys[keep]
+
+def iter_training_batches(path, chunk_rows=DEFAULT_CHUNK_ROWS, label=LABEL_COLUMN):
+    """
+    Stream (X, y, feature_names) float32 batches of a training export for
+    estimators that train chunk by chunk.
+    """
+    for chunk in iter_training_chunks(path, chunk_rows):
+        yield _split_chunk(chunk, label)
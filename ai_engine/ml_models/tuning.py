@@ -0,0 +1,137 @@
+# ai_engine/ml_models/tuning.py
+
+import time
+from collections import namedtuple
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV, HalvingRandomSearchCV, StratifiedKFold, cross_validate
+
+from .compiled_forest import compile_forest
+
+# Search space used when none is configured
+DEFAULT_PARAM_SPACE = {
+    "n_estimators": [50, 100, 200],
+    "max_depth": [None, 8, 16],
+    "min_samples_leaf": [1, 2, 5],
+    "max_features": ["sqrt", 0.5],
+}
+
+# Metrics recorded for the winning configuration (AIModelMetadata fields)
+CV_METRICS = ("accuracy", "precision", "recall", "f1")
+
+# Top configurations of the final halving round refit on all rows to
+# measure serving latency
+DEFAULT_FINALISTS = 3
+
+# Single-row predictions timed per finalist
+LATENCY_REPEATS = 200
+
+TuningResult = namedtuple("TuningResult", "best_params cv_metrics candidates search_seconds n_fits")
+
+def measure_latency(model, X, repeats=LATENCY_REPEATS):
+    """
+    Single-row predict_proba latency (p50, p99 in ms) of a fitted model as
+    served: through CompiledForest when the model compiles to one.
+    """
+    try:
+        scorer = compile_forest(model)
+    except ValueError:
+        scorer = model
+    X = np.asarray(X, dtype=np.float64)
+    rows = X[np.arange(repeats) % len(X)]
+    timings = np.empty(repeats)
+    for i in range(repeats):
+        started = time.perf_counter()
+        scorer.predict_proba(rows[i:i + 1])
+        timings[i] = time.perf_counter() - started
+    return float(np.percentile(timings, 50) * 1000), float(np.percentile(timings, 99) * 1000)
+
+def search_hyperparameters(X, y, param_space=None, n_candidates=None, cv=3, scoring="f1",
+                           n_jobs=-1, latency_budget_ms=None, finalists=DEFAULT_FINALISTS,
+                           random_state=0):
+    """
+    Cross-validated successive-halving search for RandomForestClassifier.
+    param_space -- {param: [values]}; DEFAULT_PARAM_SPACE if None
+    n_candidates -- sample this many configurations at random instead of the full grid
+    Candidates start on a small share of the rows and only the best third
+    of each round moves on to three times as many, so poor configurations
+    cost a fraction of a full fit. CV fits run in parallel (n_jobs).
+    The top `finalists` configurations are then refit on all rows and
+    their single-row serving latency measured; the winner is the best
+    scoring finalist whose p99 latency fits latency_budget_ms (the
+    fastest finalist if none does).
+    Returns a TuningResult; cv_metrics are CV means of CV_METRICS for the winner.
+    """
+    started = time.perf_counter()
+    param_space = param_space or DEFAULT_PARAM_SPACE
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    splitter = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state)
+    estimator = RandomForestClassifier(random_state=random_state)
+    common = dict(cv=splitter, scoring=scoring, n_jobs=n_jobs, factor=3, random_state=random_state, refit=False)
+    # Every halving round must hold at least one row per class per fold
+    common["min_resources"] = min(len(y), max(cv * len(np.unique(y)) * 2, 20))
+    if n_candidates:
+        search = HalvingRandomSearchCV(estimator, param_space, n_candidates=n_candidates, **common)
+    else:
+        search = HalvingGridSearchCV(estimator, param_space, **common)
+    search.fit(X, y)
+
+    results = search.cv_results_
+    last_round = results["iter"] == results["iter"].max()
+    order = sorted(np.flatnonzero(last_round), key=lambda i: -results["mean_test_score"][i])
+    candidates = []
+    # Furthest halving round first, best score first within a round
+    for i in np.lexsort((-results["mean_test_score"], -results["iter"])):
+        candidates.append({
+            "params": _jsonable(results["params"][i]),
+            "round": int(results["iter"][i]),
+            "n_samples": int(results["n_resources"][i]),
+            "mean_score": float(results["mean_test_score"][i]),
+            "std_score": float(results["std_test_score"][i]),
+            "mean_fit_seconds": float(results["mean_fit_time"][i]),
+            # Batch scoring time per row; cheap latency proxy for every config
+            "score_ms_per_row": float(results["mean_score_time"][i] * 1000 * cv / max(int(results["n_resources"][i]), 1)),
+        })
+    # A configuration appears once per round it reached; keep its furthest
+    by_params = {}
+    for candidate in candidates:
+        by_params.setdefault(repr(candidate["params"]), candidate)
+
+    timed = []
+    for i in order[:finalists]:
+        params = results["params"][i]
+        model = RandomForestClassifier(random_state=random_state, n_jobs=n_jobs, **params).fit(X, y)
+        model.set_params(n_jobs=None)
+        p50, p99 = measure_latency(model, X)
+        entry = by_params[repr(_jsonable(params))]
+        entry.update(latency_p50_ms=p50, latency_p99_ms=p99, finalist=True)
+        timed.append((i, entry))
+    within_budget = [
+        (i, entry) for i, entry in timed
+        if latency_budget_ms is None or entry["latency_p99_ms"] <= latency_budget_ms
+    ]
+    if within_budget:
+        winner = max(within_budget, key=lambda item: item[1]["mean_score"])[0]
+    else:
+        winner = min(timed, key=lambda item: item[1]["latency_p99_ms"])[0]
+    best_params = results["params"][winner]
+
+    scores = cross_validate(
+        RandomForestClassifier(random_state=random_state, **best_params), X, y,
+        cv=splitter, scoring=list(CV_METRICS), n_jobs=n_jobs,
+    )
+    cv_metrics = {metric: float(np.mean(scores[f"test_{metric}"])) for metric in CV_METRICS}
+    n_fits = int(len(results["params"]) * cv + len(timed) + cv)
+    return TuningResult(
+        best_params=_jsonable(best_params),
+        cv_metrics=cv_metrics,
+        candidates=candidates,
+        search_seconds=time.perf_counter() - started,
+        n_fits=n_fits,
+    )
+
+def _jsonable(params):
+    return {key: value.item() if isinstance(value, np.generic) else value for key, value in params.items()}
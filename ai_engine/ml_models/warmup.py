@@ -0,0 +1,68 @@
+# ai_engine/ml_models/warmup.py
+
+import importlib
+import os
+import time
+
+import numpy as np
+
+from .global_ai import GLOBAL_MODEL_PATH
+from .registry import model_registry
+from .tenant_ai import resolve_tenant_model_path
+
+def prime_model(path, registry=model_registry):
+    """
+    Load the model at `path` into the registry and run one dummy prediction
+    so lazy imports, memory-mapped pages and inference code paths are warm.
+    Returns the elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    model = registry.get(path)
+    n_features = getattr(model, "n_features_in_", None)
+    if n_features and hasattr(model, "predict_proba"):
+        model.predict_proba(np.zeros((1, n_features), dtype=np.float32))
+    return time.perf_counter() - start
+
+def prime_nlp():
+    """
+    Import the spaCy-backed feature extractor (loads the language model)
+    and parse a short text. Returns the elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    features = importlib.import_module("ai_engine.ml_models.features")
+    features.extract_resume_features("Warm-up: Python developer with 3 years of experience")
+    return time.perf_counter() - start
+
+def warm_up_models(tenant_ids=(), include_nlp=True, registry=model_registry):
+    """
+    Preload the global model and the models serving `tenant_ids`.
+    Tenants sharing the global model are primed once. Failures are recorded
+    in the report rather than raised, so warm-up never blocks startup.
+    Returns a report dict: total duration, per-model timings and errors.
+    """
+    start = time.perf_counter()
+    report = {"models": [], "errors": [], "nlp_seconds": None}
+
+    targets = [(None, GLOBAL_MODEL_PATH)]
+    targets += [(tenant_id, resolve_tenant_model_path(tenant_id)) for tenant_id in tenant_ids]
+    primed = set()
+    for tenant_id, path in targets:
+        key = os.path.abspath(path)
+        if key in primed:
+            continue
+        primed.add(key)
+        try:
+            seconds = prime_model(path, registry=registry)
+        except Exception as e:
+            report["errors"].append({"tenant_id": tenant_id, "path": path, "error": str(e)})
+            continue
+        report["models"].append({"tenant_id": tenant_id, "path": path, "seconds": seconds})
+
+    if include_nlp:
+        try:
+            report["nlp_seconds"] = prime_nlp()
+        except Exception as e:
+            report["errors"].append({"tenant_id": None, "path": "nlp", "error": str(e)})
+
+    report["duration"] = time.perf_counter() - start
+    return report
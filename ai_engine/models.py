@@ -32,6 +32,13 @@ class AIModelMetadata(models.Model):
     )
     model_type = models.CharField(max_length=20, choices=MODEL_TYPES)
     model_path = models.CharField(max_length=512)
+    artifact_sha256 = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        db_index=True,
+        help_text="Content-addressed store blob holding this version; rows referencing a blob keep it from garbage collection"
+    )
     version = models.CharField(max_length=50, default='1.0.0')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='training')
     
@@ -51,9 +58,25 @@ class AIModelMetadata(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     last_trained = models.DateTimeField(null=True, blank=True)
     
+    # Incremental learning from recruiter feedback
+    feedback_watermark = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="updated_at of the newest AIMatchingResult feedback already learned from"
+    )
+    incremental_samples = models.IntegerField(
+        default=0,
+        help_text="Labeled samples added by the incremental update that produced this version"
+    )
+    
     # Configuration and hyperparameters
     hyperparameters = models.JSONField(default=dict, blank=True)
     feature_config = models.JSONField(default=dict, blank=True)
+    tuning_results = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Hyperparameter search that chose this model: scoring, search time, candidates with CV scores and latency"
+    )
     
     class Meta:
         unique_together = ['tenant', 'model_type', 'version']
@@ -175,6 +198,7 @@ class AIMatchingResult(models.Model):
         indexes = [
             models.Index(fields=['tenant', 'job_id', '-match_score']),
             models.Index(fields=['tenant', 'candidate_id']),
+            models.Index(fields=['tenant', 'updated_at']),
         ]
     
     def __str__(self):
@@ -246,6 +270,17 @@ class ModelTrainingQueue(models.Model):
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     
+    # Worker lease: a running job whose heartbeat is older than the lease
+    # timeout is reclaimed by another worker
+    worker_id = models.CharField(max_length=100, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.IntegerField(default=0)
+    queue_wait_seconds = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Seconds between queueing and the latest start"
+    )
+    
     # Associated model
     ai_model = models.ForeignKey(
         AIModelMetadata,
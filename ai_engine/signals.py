@@ -1,19 +1,25 @@
 # ai_engine/signals.py
 
-from django.db.models.signals import post_save
+import logging
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from core.models import Tenant  # Adjust if Tenant is elsewhere
+from core.models import Candidate, Job, Tenant  # Adjust if Tenant is elsewhere
 from ai_engine.ml_models.tenant_ai import clone_global_model_for_tenant
 from ai_engine.models import AIModelMetadata
 
+logger = logging.getLogger(__name__)
+
 @receiver(post_save, sender=Tenant)
 def initialize_tenant_ai_model(sender, instance, created, **kwargs):
     """
     On tenant creation, clone the global AI model for the tenant
     and register a new AIModelMetadata entry.
+    The clone is copy-on-write: model_path references the global artifact
+    until the tenant's model is first trained.
     """
     if created:
-        # Clone the global AI model for tenant (creates a new pkl file)
+        # Reference the global AI model for tenant (no file is copied)
         model_path = clone_global_model_for_tenant(instance.id)
         # Create metadata entry for the new tenant model
         AIModelMetadata.objects.create(
@@ -23,3 +29,67 @@ def initialize_tenant_ai_model(sender, instance, created, **kwargs):
             version="1.0.0",
             status="active",  # or "training" if you trigger async retrain
         )
+
+
+def _store_candidate(candidate):
+    from ai_engine.utils.candidate_retrieval import index_candidates
+    from ai_engine.utils.entity_features import store_candidates
+    from ai_engine.utils.semantic_matching import index_semantic_candidates
+    store_candidates(candidate.tenant_id, [(
+        candidate.id, candidate.skills, candidate.experience_years,
+        candidate.location, candidate.ai_learning_profile,
+    )])
+    index_candidates(candidate.tenant_id, [(
+        candidate.id, candidate.skills, candidate.experience_years,
+        candidate.location, candidate.visa_status, candidate.ai_learning_profile,
+    )])
+    index_semantic_candidates(candidate.tenant_id, [(candidate.id, candidate.skills, candidate.ai_learning_profile)])
+
+def _remove_candidate(tenant_id, candidate_id):
+    from ai_engine.utils.candidate_retrieval import remove_candidates
+    from ai_engine.utils.entity_features import get_feature_store
+    from ai_engine.utils.semantic_matching import remove_semantic_documents
+    get_feature_store(tenant_id, 'candidates').delete(candidate_id)
+    remove_candidates(tenant_id, [candidate_id])
+    remove_semantic_documents(tenant_id, 'candidates', [candidate_id])
+
+def _store_job(job):
+    from ai_engine.utils.entity_features import store_jobs
+    from ai_engine.utils.semantic_matching import index_semantic_jobs
+    store_jobs(job.tenant_id, [(job.id, job.skills_required, job.location)])
+    index_semantic_jobs(job.tenant_id, [(job.id, job.title, job.description, job.skills_required)])
+
+def _remove_job(tenant_id, job_id):
+    from ai_engine.utils.entity_features import get_feature_store
+    from ai_engine.utils.semantic_matching import remove_semantic_documents
+    get_feature_store(tenant_id, 'jobs').delete(job_id)
+    remove_semantic_documents(tenant_id, 'jobs', [job_id])
+
+def _on_commit_safely(fn, description):
+    def run():
+        try:
+            fn()
+        except Exception as e:
+            # The stores self-heal on read / rebuild; never fail the user's save
+            logger.warning(f"Feature store update failed for {description}: {e}")
+    transaction.on_commit(run)
+
+@receiver(post_save, sender=Candidate)
+def update_candidate_features(sender, instance, **kwargs):
+    """Keep the candidate's feature store vector and index entries in step with its profile."""
+    _on_commit_safely(lambda: _store_candidate(instance), f"candidate {instance.id}")
+
+@receiver(post_save, sender=Job)
+def update_job_features(sender, instance, **kwargs):
+    """Keep the job's feature store vector and semantic vector in step with its requirements."""
+    _on_commit_safely(lambda: _store_job(instance), f"job {instance.id}")
+
+@receiver(post_delete, sender=Candidate)
+def remove_candidate_features(sender, instance, **kwargs):
+    tenant_id, candidate_id = instance.tenant_id, instance.id
+    _on_commit_safely(lambda: _remove_candidate(tenant_id, candidate_id), f"candidate {candidate_id}")
+
+@receiver(post_delete, sender=Job)
+def remove_job_features(sender, instance, **kwargs):
+    tenant_id, job_id = instance.tenant_id, instance.id
+    _on_commit_safely(lambda: _remove_job(tenant_id, job_id), f"job {job_id}")
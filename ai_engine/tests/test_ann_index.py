@@ -0,0 +1,86 @@
+# ai_engine/tests/test_ann_index.py
+
+import tempfile
+import unittest
+import numpy as np
+from scipy import sparse
+from ai_engine.ml_models.ann_index import (
+    ANNIndex,
+    IVFSegment,
+    VectorEntry,
+    benchmark_recall,
+    embed,
+    exact_search,
+    synthetic_vectors,
+)
+
+def _entries(vectors):
+    return [VectorEntry(i, vector) for i, vector in enumerate(vectors)]
+
+class TestANNIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.vectors = synthetic_vectors(4000, dim=32, n_clusters=20, seed=0)
+        self.queries = synthetic_vectors(20, dim=32, n_clusters=20, seed=1)
+        self.index = ANNIndex(self.tmpdir.name, nprobe=4)
+        self.index.rebuild(_entries(self.vectors), n_lists=40)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_probing_every_list_is_exact(self):
+        ids = np.arange(len(self.vectors))
+        for query in self.queries:
+            exact_ids, exact_scores = exact_search(ids, self.vectors, query, 10)
+            found_ids, found_scores = self.index.search(query, 10, nprobe=40)
+            np.testing.assert_array_equal(found_ids, exact_ids)
+            np.testing.assert_allclose(found_scores, exact_scores, rtol=1e-5)
+
+    def test_recall_grows_with_nprobe(self):
+        report = benchmark_recall(self.vectors, self.queries, k=10, nprobes=(1, 4, 40), n_lists=40)
+        recalls = [row['recall'] for row in report['ivf']]
+        self.assertEqual(report['n_lists'], 40)
+        self.assertEqual(recalls, sorted(recalls))
+        self.assertGreater(recalls[1], 0.8)
+        self.assertEqual(recalls[-1], 1.0)
+
+    def test_persisted_with_incremental_updates(self):
+        reader = ANNIndex(self.tmpdir.name)
+        self.assertEqual((len(reader), reader.n_lists), (4000, 40))
+        query = self.queries[0]
+        nearest = int(self.index.search(query, 1, nprobe=40)[0][0])
+        self.index.upsert_many([VectorEntry(9999, query)])
+        self.index.delete_many([nearest])
+        ids, scores = reader.search(query, 2, nprobe=40)
+        self.assertEqual(ids[0], 9999)
+        self.assertAlmostEqual(float(scores[0]), 1.0, places=5)
+        self.assertNotIn(nearest, ids)
+        self.assertEqual(len(reader), 4000)
+        self.index.compact()
+        np.testing.assert_array_equal(ANNIndex(self.tmpdir.name).search(query, 2, nprobe=40)[0], ids)
+
+    def test_segment_lists_partition_rows(self):
+        segment = IVFSegment.build(_entries(self.vectors), n_lists=40)
+        self.assertEqual(segment.offsets[-1], len(self.vectors))
+        self.assertEqual(sorted(segment.ids.tolist()), list(range(len(self.vectors))))
+
+    def test_rebuild_from_arrays(self):
+        index = ANNIndex(self.tmpdir.name, 'arrays')
+        index.rebuild_vectors(np.arange(len(self.vectors)), self.vectors, n_lists=40)
+        for query in self.queries[:5]:
+            np.testing.assert_array_equal(index.search(query, 10, nprobe=40)[0], self.index.search(query, 10, nprobe=40)[0])
+        self.assertEqual(index.dim, 32)
+
+    def test_embedding_preserves_cosine(self):
+        rows = sparse.random(50, 2 ** 20, density=1e-4, random_state=1, format='csr', dtype=np.float32)
+        rows.data = np.abs(rows.data)
+        embedded = embed(rows, dim=512)
+        exact = (rows @ rows.T).toarray()
+        norms = np.sqrt(np.diag(exact))
+        cosine = exact / np.outer(norms, norms)
+        error = np.abs(embedded @ embedded.T - cosine)[np.triu_indices(50, 1)]
+        self.assertLess(float(error.mean()), 0.06)
+        self.assertTrue(np.allclose(np.linalg.norm(embedded, axis=1), 1, atol=1e-5))
+
+if __name__ == '__main__':
+    unittest.main()
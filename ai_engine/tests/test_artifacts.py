@@ -0,0 +1,124 @@
+# ai_engine/tests/test_artifacts.py
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from ai_engine.ml_models import artifacts
+from ai_engine.ml_models.compiled_forest import CompiledForest
+
+class TestModelArtifacts(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'model.pkl')
+        self.store_dir = tempfile.TemporaryDirectory()
+        store = mock.patch.object(artifacts, 'MODEL_STORE_DIR', self.store_dir.name)
+        store.start()
+        self.addCleanup(store.stop)
+        self.addCleanup(self.store_dir.cleanup)
+        rng = np.random.default_rng(0)
+        self.X = rng.random((200, 4))
+        y = (self.X[:, 0] + self.X[:, 1] > 1).astype(int)
+        self.model = RandomForestClassifier(n_estimators=10, random_state=0).fit(self.X, y)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_saved_forest_loads_memory_mapped(self):
+        artifacts.save_model_artifact(self.model, self.path)
+        loaded = artifacts.load_model_artifact(self.path)
+        self.assertIsInstance(loaded, CompiledForest)
+        self.assertIsInstance(loaded.threshold, np.memmap)
+        np.testing.assert_array_equal(
+            loaded.predict_proba(self.X), self.model.predict_proba(self.X)
+        )
+
+    def test_sklearn_backend_loads_estimator(self):
+        artifacts.save_model_artifact(self.model, self.path)
+        loaded = artifacts.load_model_artifact(self.path, backend='sklearn')
+        self.assertIsInstance(loaded, RandomForestClassifier)
+
+    def test_stale_sidecar_is_ignored(self):
+        artifacts.save_model_artifact(self.model, self.path)
+        joblib.dump(self.model, self.path)
+        os.utime(self.path, ns=(0, 0))
+        loaded = artifacts.load_model_artifact(self.path)
+        self.assertIsInstance(loaded, RandomForestClassifier)
+
+    def test_copy_keeps_sidecar(self):
+        artifacts.save_model_artifact(self.model, self.path)
+        copy_path = os.path.join(self.tmpdir.name, 'copy.pkl')
+        artifacts.copy_model_artifact(self.path, copy_path)
+        loaded = artifacts.load_model_artifact(copy_path)
+        self.assertIsInstance(loaded, CompiledForest)
+
+    def test_save_model_version_publishes_and_prunes(self):
+        for expected in range(1, 5):
+            versioned_path, version = artifacts.save_model_version(self.model, self.path, keep=2)
+            self.assertEqual(version, expected)
+        self.assertEqual(artifacts.list_model_versions(self.path), [3, 4])
+        self.assertEqual(artifacts.current_model_version(self.path), (4, versioned_path))
+        self.assertTrue(os.path.exists(artifacts.tree_arrays_path(os.path.realpath(versioned_path))))
+        self.assertIsInstance(artifacts.load_model_artifact(self.path), CompiledForest)
+        # No temporary files are left behind; identical versions share one blob
+        self.assertEqual(sorted(os.listdir(self.tmpdir.name)), ['model.pkl', 'model.v3.pkl', 'model.v4.pkl'])
+        digest = artifacts.store_digest(self.path)
+        self.assertEqual(list(artifacts.list_store_blobs()), [digest])
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.store_dir.name, digest[:2]))),
+            [name % digest for name in ('%s.pkl', '%s.pkl.manifest.json', '%s.pkl.trees')],
+        )
+
+    def test_remove_model_artifact_removes_versions(self):
+        artifacts.save_model_version(self.model, self.path)
+        artifacts.save_model_version(self.model, self.path)
+        artifacts.remove_model_artifact(self.path)
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+    def test_manifest_verifies_without_unpickling(self):
+        artifacts.save_model_version(self.model, self.path)
+        manifest = artifacts.read_manifest(self.path)
+        self.assertEqual(manifest['n_features'], 4)
+        self.assertEqual(manifest['classes'], [0, 1])
+        ok, _ = artifacts.verify_model_artifact(self.path)
+        self.assertTrue(ok)
+        self.assertTrue(artifacts.deep_validate_model(self.path)[0])
+
+    def test_corrupted_model_fails_verification(self):
+        versioned_path, _ = artifacts.save_model_version(self.model, self.path)
+        with open(versioned_path, 'r+b') as f:
+            f.seek(100)
+            f.write(b'\x00\x01\x02')
+        ok, detail = artifacts.verify_model_artifact(self.path)
+        self.assertFalse(ok)
+        self.assertIn('hash', detail)
+
+    def test_model_without_manifest_is_unverified(self):
+        joblib.dump(self.model, self.path)
+        self.assertIsNone(artifacts.verify_model_artifact(self.path)[0])
+        self.assertTrue(artifacts.deep_validate_model(self.path)[0])
+
+    def test_rollback_relinks_pruned_version(self):
+        first, _ = artifacts.save_model_version(self.model, self.path, keep=1)
+        digest = artifacts.store_digest(first)
+        other = RandomForestClassifier(n_estimators=3, random_state=1).fit(self.X, self.model.predict(self.X))
+        artifacts.save_model_version(other, self.path, keep=1)
+        self.assertEqual(artifacts.list_model_versions(self.path), [2])
+        artifacts.publish_model_version(self.path, 1, digest)
+        self.assertEqual(artifacts.current_model_version(self.path)[0], 1)
+        self.assertEqual(artifacts.load_model_artifact(self.path).n_trees, 10)
+
+    def test_store_model_file_adopts_legacy_version(self):
+        legacy = artifacts.model_version_path(self.path, 1)
+        artifacts.save_model_artifact(self.model, legacy)
+        digest = artifacts.file_digest(legacy)
+        self.assertEqual(artifacts.store_model_file(legacy), digest)
+        self.assertTrue(os.path.islink(legacy))
+        self.assertFalse(os.path.exists(artifacts.tree_arrays_path(legacy)))
+        # The sidecar still matches the blob, so the fast path is kept
+        self.assertIsInstance(artifacts.load_model_artifact(legacy), CompiledForest)
+        self.assertTrue(artifacts.verify_model_artifact(legacy)[0])
+
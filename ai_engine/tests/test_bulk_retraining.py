@@ -0,0 +1,39 @@
+# ai_engine/tests/test_bulk_retraining.py
+
+import os
+import tempfile
+import unittest
+from ai_engine.utils.bulk_retraining import RetrainState, estimate_training_bytes
+
+class TestBulkRetraining(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'state.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_state_resumes_finished_tenants(self):
+        state = RetrainState.load(self.path)
+        state.record({'tenant_id': 1, 'status': 'completed', 'seconds': 1.0})
+        state.record({'tenant_id': 2, 'status': 'skipped', 'seconds': 0.0})
+        state.record({'tenant_id': 3, 'status': 'failed', 'seconds': 0.5})
+
+        resumed = RetrainState.load(self.path)
+        self.assertTrue(resumed.is_done(1))
+        self.assertTrue(resumed.is_done(2))
+        self.assertFalse(resumed.is_done(3))
+        self.assertFalse(resumed.is_done(4))
+
+    def test_clear_removes_state_file(self):
+        state = RetrainState.load(self.path)
+        state.record({'tenant_id': 1, 'status': 'completed', 'seconds': 1.0})
+        state.clear()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(RetrainState.load(self.path).is_done(1))
+
+    def test_estimate_grows_with_rows(self):
+        self.assertLess(estimate_training_bytes(1000, 4), estimate_training_bytes(100000, 4))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+# ai_engine/tests/test_candidate_index.py
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from ai_engine.ml_models.candidate_index import (
+    CandidateIndex,
+    candidate_entry,
+    candidate_filters,
+    intersect_sorted,
+    parse_skill_query,
+)
+
+def _entries():
+    return [
+        candidate_entry(1, {'Python': 1, 'Django': 1}, 5, 'Austin', 'H1B'),
+        candidate_entry(2, ['python'], 1, 'Boston', 'Citizen'),
+        candidate_entry(3, 'java, sql', 8, 'austin ', 'Citizen'),
+        candidate_entry(4, {}, 3, 'Austin', 'Citizen', {'skills': ['Django', 'SQL']}),
+    ]
+
+class TestCandidateIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.index = CandidateIndex(self.tmpdir.name)
+        self.index.rebuild(_entries())
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_generate_ranks_by_skill_overlap(self):
+        ids, overlap = self.index.generate({'python', 'django'})
+        np.testing.assert_array_equal(ids, [1, 4, 2])
+        np.testing.assert_array_equal(overlap, [2, 1, 1])
+        ids, _ = self.index.generate({'python', 'django'}, limit=2)
+        np.testing.assert_array_equal(ids, [1, 4])
+        # No skills: every candidate, newest first
+        np.testing.assert_array_equal(self.index.generate(())[0], [4, 3, 2, 1])
+
+    def test_hard_filters(self):
+        filters = candidate_filters(location='AUSTIN', visa_status=['citizen'], min_experience_years=4)
+        np.testing.assert_array_equal(self.index.generate({'sql'}, filters)[0], [3])
+        self.assertIsNone(candidate_filters())
+
+    def test_updates_visible_to_other_instances(self):
+        reader = CandidateIndex(self.tmpdir.name)
+        self.assertEqual(len(reader), 4)
+        self.index.upsert_many([candidate_entry(2, ['go'], 1, 'Boston', 'Citizen'), candidate_entry(9, ['python'], 2, '', '')])
+        self.index.delete_many([1])
+        np.testing.assert_array_equal(reader.generate({'python'})[0], [9])
+        np.testing.assert_array_equal(reader.generate({'go'})[0], [2])
+        self.assertEqual(len(reader), 4)
+
+    def test_compaction_preserves_results(self):
+        index = CandidateIndex(self.tmpdir.name, compact_threshold=3)
+        index.upsert_many([candidate_entry(5, ['python', 'sql'], 4, 'Austin', 'H1B')])
+        index.delete_many([3])
+        before = [index.generate(skills) for skills in ({'python'}, {'sql'}, {'django'}, ())]
+        index.upsert_many([candidate_entry(6, ['rust'], 1, '', '')])  # third change triggers a compaction
+        self.assertEqual(os.path.getsize(index.log_path), 0)
+        reader = CandidateIndex(self.tmpdir.name)
+        for skills, (ids, overlap) in zip(({'python'}, {'sql'}, {'django'}), before):
+            np.testing.assert_array_equal(reader.generate(skills)[0], ids)
+            np.testing.assert_array_equal(reader.generate(skills)[1], overlap)
+        np.testing.assert_array_equal(reader.generate(())[0], [6, 5, 4, 2, 1])
+
+    def test_skill_queries(self):
+        self.assertEqual(parse_skill_query(' SQL , python|Django,'), (('sql',), ('django', 'python')))
+        np.testing.assert_array_equal(self.index.query(parse_skill_query('sql')), [3, 4])
+        np.testing.assert_array_equal(self.index.query(parse_skill_query('django,sql|python')), [1, 4])
+        np.testing.assert_array_equal(self.index.query(parse_skill_query('python|java')), [1, 2, 3])
+        self.assertEqual(len(self.index.query(parse_skill_query('python,cobol'))), 0)
+        # Logged updates are reflected without a rebuild
+        self.index.upsert_many([candidate_entry(4, ['go'], 3, '', ''), candidate_entry(7, ['sql'], 1, '', '')])
+        np.testing.assert_array_equal(self.index.query(parse_skill_query('sql')), [3, 7])
+        np.testing.assert_array_equal(self.index.skill_ids('go'), [4])
+
+    def test_intersect_sorted(self):
+        rng = np.random.default_rng(0)
+        a = np.unique(rng.integers(0, 1000, 300))
+        b = np.unique(rng.integers(0, 1000, 40))
+        np.testing.assert_array_equal(intersect_sorted(a, b), np.intersect1d(a, b))
+        np.testing.assert_array_equal(intersect_sorted(b, a[:0]), [])
+
+class TestCandidateIndexBootstrap(unittest.TestCase):
+    """The tenant's index is built from every saved candidate, however it is first touched."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.index = CandidateIndex(self.tmpdir.name)
+        # Candidates saved before the tenant's index was first written
+        self.database = [
+            (1, ['python'], 5, 'Austin', 'H1B', None),
+            (2, ['java'], 2, 'Boston', 'Citizen', None),
+            (3, ['python', 'sql'], 7, 'Austin', 'Citizen', None),
+        ]
+        patches = [
+            mock.patch('ai_engine.utils.candidate_retrieval.get_candidate_index', return_value=self.index),
+            mock.patch(
+                'ai_engine.utils.candidate_retrieval.rebuild_candidate_index',
+                side_effect=lambda tenant_id: self.index.rebuild([candidate_entry(*row) for row in self.database]),
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _save(self, row):
+        from ai_engine.utils.candidate_retrieval import index_candidates
+        self.database.append(row)
+        index_candidates(1, [row])
+
+    def test_save_before_first_match(self):
+        from ai_engine.utils.candidate_retrieval import ensure_candidate_index
+        self._save((4, ['python'], 1, 'Austin', 'Citizen', None))
+        np.testing.assert_array_equal(ensure_candidate_index(1).generate({'python'})[0], [4, 3, 1])
+        self.assertEqual(len(self.index), 4)
+        # Once built, saves are applied incrementally
+        self._save((5, ['python'], 1, '', '', None))
+        self.assertEqual(len(ensure_candidate_index(1)), 5)
+
+    def test_delete_before_first_match(self):
+        from ai_engine.utils.candidate_retrieval import ensure_candidate_index, remove_candidates
+        del self.database[0]
+        remove_candidates(1, [1])
+        self.assertFalse(self.index.exists())
+        np.testing.assert_array_equal(ensure_candidate_index(1).generate(())[0], [3, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
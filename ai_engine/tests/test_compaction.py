@@ -0,0 +1,51 @@
+# ai_engine/tests/test_compaction.py
+
+import unittest
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from ai_engine.ml_models.compaction import compact_forest, prune_tree, select_trees
+from ai_engine.ml_models.compiled_forest import CompiledForest, compact_forest_arrays, compile_forest
+
+class TestForestCompaction(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = rng.random((500, 4))
+        self.y = (self.X[:, 0] + self.X[:, 1] > 1).astype(int)
+        self.model = RandomForestClassifier(n_estimators=10, random_state=0).fit(self.X, self.y)
+
+    def test_prune_caps_depth_and_leaves(self):
+        tree = self.model.estimators_[0]
+        by_depth = prune_tree(tree, max_depth=3)
+        self.assertEqual(by_depth.tree_.max_depth, 3)
+        by_leaves = prune_tree(tree, max_leaf_nodes=5)
+        self.assertLessEqual(by_leaves.tree_.n_leaves, 5)
+        # The original tree is untouched and uncut trees are returned as is
+        self.assertGreater(tree.tree_.max_depth, 3)
+        self.assertIs(prune_tree(tree, max_depth=100), tree)
+
+    def test_pruned_forest_is_consistent(self):
+        compacted = compact_forest(self.model, max_depth=4)
+        # sklearn and the compiled evaluator agree on the rebuilt trees
+        np.testing.assert_array_equal(
+            compacted.predict_proba(self.X), compile_forest(compacted).predict_proba(self.X)
+        )
+        self.assertGreater(np.mean(compacted.predict(self.X) == self.y), 0.9)
+
+    def test_select_trees(self):
+        keep = select_trees(self.model, self.X, self.y, 4)
+        self.assertEqual(len(keep), 4)
+        self.assertEqual(keep, sorted(set(keep)))
+        compacted = compact_forest(self.model, max_trees=4, X=self.X, y=self.y)
+        self.assertEqual(len(compacted.estimators_), 4)
+        self.assertEqual(len(self.model.estimators_), 10)
+
+    def test_float32_arrays_keep_splits_exact(self):
+        arrays = compile_forest(self.model).to_arrays()
+        compact = CompiledForest(compact_forest_arrays(arrays))
+        self.assertEqual(compact.threshold.dtype, np.float32)
+        # Inputs exactly on float32-rounded thresholds still take the same branch
+        X = np.vstack([self.X, np.tile(arrays['threshold'][arrays['feature'] >= 0][:50, None], (1, 4))])
+        np.testing.assert_array_equal(compact.apply(X), CompiledForest(arrays).apply(X))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# ai_engine/tests/test_compiled_forest.py
+
+import unittest
+import numpy as np
+from scipy import sparse
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from ai_engine.ml_models.compiled_forest import compile_forest, validate_compiled_forest
+
+class TestCompiledForest(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.X = self.rng.random((500, 6))
+
+    def test_bit_identical_binary(self):
+        y = (self.X[:, 0] > 0.5).astype(int)
+        model = RandomForestClassifier(n_estimators=25, random_state=0).fit(self.X, y)
+        compiled = compile_forest(model)
+        X_test = self.rng.random((300, 6))
+        self.assertTrue(validate_compiled_forest(model, compiled, X_test))
+        self.assertTrue(validate_compiled_forest(model, compiled, X_test[:1]))
+        np.testing.assert_array_equal(compiled.predict(X_test), model.predict(X_test))
+
+    def test_bit_identical_multiclass_with_missing_values(self):
+        X = self.X.copy()
+        X[self.rng.random(X.shape) < 0.1] = np.nan
+        y = self.rng.integers(0, 3, len(X))
+        model = RandomForestClassifier(n_estimators=25, random_state=0).fit(X, y)
+        X_test = self.rng.random((300, 6))
+        X_test[self.rng.random(X_test.shape) < 0.1] = np.nan
+        self.assertTrue(validate_compiled_forest(model, compile_forest(model), X_test))
+
+    def test_sparse_input(self):
+        y = (self.X[:, 0] > 0.5).astype(int)
+        model = RandomForestClassifier(n_estimators=10, random_state=0).fit(self.X, y)
+        compiled = compile_forest(model)
+        np.testing.assert_array_equal(
+            compiled.predict_proba(sparse.csr_matrix(self.X)), model.predict_proba(self.X)
+        )
+
+    def test_rejects_non_forest(self):
+        model = LogisticRegression().fit(self.X, (self.X[:, 0] > 0.5).astype(int))
+        with self.assertRaises(ValueError):
+            compile_forest(model)
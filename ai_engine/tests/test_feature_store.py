@@ -0,0 +1,68 @@
+# ai_engine/tests/test_feature_store.py
+
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from ai_engine.ml_models import feature_store
+from ai_engine.ml_models.feature_store import FeatureStore
+from ai_engine.ml_models.pair_features import candidate_vector, job_vector, pair_features_from_vectors
+
+class TestFeatureStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = FeatureStore(self.tmpdir.name, 'candidates', dim=3)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_upsert_and_read_back(self):
+        self.store.upsert_many([7, 9], [[1, 2, 3], [4, 5, 6]])
+        vectors, found = self.store.get_many([9, 8, 7])
+        np.testing.assert_array_equal(found, [True, False, True])
+        np.testing.assert_array_equal(vectors, [[4, 5, 6], [0, 0, 0], [1, 2, 3]])
+
+        self.store.upsert(7, [0, 0, 1])
+        np.testing.assert_array_equal(self.store.get(7), [0, 0, 1])
+        self.assertEqual(len(self.store), 2)
+
+    def test_other_instance_sees_updates(self):
+        reader = FeatureStore(self.tmpdir.name, 'candidates', dim=3)
+        self.store.upsert(1, [1, 1, 1])
+        np.testing.assert_array_equal(reader.get(1), [1, 1, 1])
+        self.store.upsert(1, [2, 2, 2])
+        np.testing.assert_array_equal(reader.get(1), [2, 2, 2])
+        self.store.delete(1)
+        self.assertIsNone(reader.get(1))
+
+    def test_grows_past_capacity(self):
+        with mock.patch.object(feature_store, 'INITIAL_CAPACITY', 4):
+            reader = FeatureStore(self.tmpdir.name, 'candidates', dim=3)
+            self.store.upsert_many(range(3), np.ones((3, 3)))
+            self.assertEqual(len(reader), 3)
+            self.store.upsert_many(range(3, 10), np.arange(21).reshape(7, 3))
+        ids, vectors = reader.all()
+        np.testing.assert_array_equal(ids, np.arange(10))
+        np.testing.assert_array_equal(vectors[9], [18, 19, 20])
+        np.testing.assert_array_equal(vectors[0], [1, 1, 1])
+
+
+class TestPairFeaturesFromVectors(unittest.TestCase):
+    def test_scores(self):
+        job = job_vector({'python': 1, 'sql': 1}, 'NYC')
+        candidates = np.stack([
+            candidate_vector(['Python'], 5, 'nyc', {'education': ['BSc']}),
+            candidate_vector([], 30, 'SF', {'skills': ['sql', 'python']}),
+        ])
+        X = pair_features_from_vectors(job, candidates)
+        np.testing.assert_allclose(X, [[0.5, 0.5, 1.0, 1.0], [1.0, 1.0, 0.0, 0.0]])
+
+    def test_one_candidate_against_many_jobs(self):
+        candidate = candidate_vector(['python'], 5, 'NYC', {'education': ['BSc']})
+        jobs = np.stack([job_vector({'python': 1, 'sql': 1}, 'nyc'), job_vector('go', 'SF'), job_vector({}, '')])
+        X = pair_features_from_vectors(jobs, candidate)
+        np.testing.assert_allclose(X, [[0.5, 0.5, 1.0, 1.0], [0.0, 0.5, 0.0, 1.0], [0.0, 0.5, 0.0, 1.0]])
+        self.assertEqual(pair_features_from_vectors(jobs[:0], candidate).shape, (0, 4))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,30 @@
 # ai_engine/tests/test_global_ai.py
 
+import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 import numpy as np
 import pandas as pd
-from ai_engine.ml_models import global_ai
+from ai_engine.ml_models import artifacts, global_ai
 
 class TestGlobalAI(unittest.TestCase):
+    def setUp(self):
+        # Models and their blobs go to a scratch directory, not models/
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        for patch in (
+            mock.patch.object(global_ai, 'GLOBAL_MODEL_PATH', os.path.join(tmpdir, 'global', 'global_ai_model.pkl')),
+            mock.patch.object(artifacts, 'MODEL_STORE_DIR', os.path.join(tmpdir, 'store')),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+        # Prediction tests need a trained global model regardless of test order
+        X = pd.DataFrame({'a': [1, 2, 3, 4], 'b': [4, 3, 2, 1]})
+        y = pd.Series([0, 1, 0, 1])
+        global_ai.train_global_model(X, y)
+
     def test_training_and_loading(self):
         # Synthetic data for basic fit
         X = pd.DataFrame({'a': [1, 2, 3, 4], 'b': [4, 3, 2, 1]})
@@ -20,3 +39,9 @@ class TestGlobalAI(unittest.TestCase):
         features = [2, 3]
         score = global_ai.predict_candidate_fit(features)
         self.assertTrue(0 <= score <= 1)
+
+    def test_predict_candidate_fit_batch(self):
+        scores = global_ai.predict_candidate_fit_batch(np.array([[2, 3], [1, 4]]))
+        self.assertEqual(scores.dtype, np.float32)
+        self.assertEqual(scores.shape, (2,))
+        self.assertTrue(((scores >= 0) & (scores <= 1)).all())
@@ -0,0 +1,80 @@
+# ai_engine/tests/test_inference_server.py
+
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import numpy as np
+import pandas as pd
+from ai_engine.ml_models import artifacts, global_ai, inference_client, inference_server, tenant_ai
+from ai_engine.ml_models.inference_client import InferenceClient, InferenceServerError
+from ai_engine.ml_models.inference_server import InferenceServer, MicroBatcher
+from ai_engine.ml_models.registry import ModelRegistry
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_concurrent_requests_share_a_batch(self):
+        calls = []
+        def score(key, X):
+            calls.append(X.shape[0])
+            return X[:, 0] * 2
+        batcher = MicroBatcher(score, max_wait=0.2)
+        futures = [batcher.submit('model', np.array([[i, 0.0]])) for i in range(5)]
+        results = [float(f.result(timeout=5)[0]) for f in futures]
+        self.assertEqual(results, [0.0, 2.0, 4.0, 6.0, 8.0])
+        self.assertEqual(calls, [5])
+
+class TestInferenceServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        # Models and their blobs go to the scratch directory, not models/
+        global_model_path = os.path.join(cls.tmpdir.name, 'global', 'global_ai_model.pkl')
+        cls.patches = [
+            mock.patch.object(global_ai, 'GLOBAL_MODEL_PATH', global_model_path),
+            mock.patch.object(tenant_ai, 'GLOBAL_MODEL_PATH', global_model_path),
+            mock.patch.object(inference_server, 'GLOBAL_MODEL_PATH', global_model_path),
+            mock.patch.object(tenant_ai, 'TENANT_MODEL_DIR', os.path.join(cls.tmpdir.name, 'tenants')),
+            mock.patch.object(artifacts, 'MODEL_STORE_DIR', os.path.join(cls.tmpdir.name, 'store')),
+        ]
+        for patch in cls.patches:
+            patch.start()
+        X = pd.DataFrame({'a': [1, 2, 3, 4], 'b': [4, 3, 2, 1]})
+        global_ai.train_global_model(X, pd.Series([0, 1, 0, 1]))
+        cls.socket_path = os.path.join(cls.tmpdir.name, 'inference.sock')
+        cls.server = InferenceServer(cls.socket_path, max_wait=0.01, registry=ModelRegistry())
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        for patch in cls.patches:
+            patch.stop()
+        cls.tmpdir.cleanup()
+
+    def test_scores_match_in_process(self):
+        client = InferenceClient(self.socket_path)
+        rows = np.array([[2, 3], [1, 4], [4, 1]])
+        expected = global_ai.load_global_model().predict_proba(rows)[:, 1]
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            scores = list(pool.map(lambda row: client.predict(None, [row])[0], rows))
+        np.testing.assert_array_equal(scores, expected)
+
+    def test_bad_request_raises_server_error(self):
+        client = InferenceClient(self.socket_path)
+        with self.assertRaises(InferenceServerError):
+            client.predict(None, [[1, 2, 3]])
+        # The connection stays usable after an error
+        self.assertEqual(client.predict(None, [[2, 3]]).shape, (1,))
+
+    def test_predict_job_fit_falls_back_without_server(self):
+        missing = os.path.join(self.tmpdir.name, 'missing.sock')
+        inference_client.configure_inference_client(missing)
+        try:
+            score = tenant_ai.predict_job_fit(987003, [2, 3])
+            self.assertIsNone(inference_client.get_inference_client())
+        finally:
+            inference_client.configure_inference_client(None)
+        self.assertTrue(0 <= score <= 1)
@@ -0,0 +1,181 @@
+# ai_engine/tests/test_matching.py
+
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+import numpy as np
+from ai_engine.ml_models.ann_index import ANNIndex, VectorEntry, embed
+from ai_engine.ml_models.candidate_index import CandidateIndex, candidate_entry, candidate_filters
+from ai_engine.ml_models.matching import CandidateJobMatchingEngine, JobCandidateMatchingEngine
+from ai_engine.ml_models.pair_features import candidate_vector, job_vector
+from ai_engine.ml_models.semantic_index import SemanticIndex, candidate_document
+
+JOBS = {
+    1: job_vector({'python': 1, 'sql': 1}, 'Austin'),
+    2: job_vector({'python': 1}, 'Austin'),
+    3: job_vector({'java': 1}, 'Boston'),
+}
+
+def _fetch_jobs(tenant_id, job_ids):
+    return {job_id: {'id': job_id, 'title': f"job {job_id}"} for job_id in job_ids if job_id != 3}
+
+class TestCandidateJobMatching(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch('ai_engine.utils.job_retrieval.open_job_ids', return_value=np.array(sorted(JOBS))),
+            mock.patch(
+                'ai_engine.utils.entity_features.job_vectors',
+                side_effect=lambda tenant_id, ids: np.stack([JOBS[job_id] for job_id in ids]),
+            ),
+            mock.patch('ai_engine.utils.job_retrieval.fetch_jobs', side_effect=_fetch_jobs),
+            # Stand-in model: the mean of the pair features
+            mock.patch.object(CandidateJobMatchingEngine, 'score_features', lambda self, X: X.mean(axis=1)),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.candidate = SimpleNamespace(
+            id=None, skills=['Python'], experience_years=4, location='austin', ai_learning_profile={}
+        )
+
+    def test_best_open_jobs_scored_in_batches(self):
+        engine = CandidateJobMatchingEngine(1, batch_size=2)
+        matches = engine.find_best_jobs(self.candidate, limit=3)
+        # Job 3 closed since the ids were read: dropped
+        self.assertEqual([match['job_id'] for match in matches], [2, 1])
+        self.assertEqual(matches[0]['features']['skills_score'], 1.0)
+        self.assertEqual(matches[1]['features']['skills_score'], 0.5)
+        self.assertGreater(matches[0]['match_score'], matches[1]['match_score'])
+        self.assertEqual(engine.last_search['scored'], 3)
+
+    def test_limit(self):
+        matches = CandidateJobMatchingEngine(1).find_best_jobs(self.candidate, limit=1)
+        self.assertEqual([match['job_id'] for match in matches], [2])
+
+    def test_rank_breaks_ties_by_lower_row(self):
+        # Few distinct rows: the limit cuts through runs of equal scores
+        X = np.random.default_rng(0).integers(0, 3, size=(500, 2)).astype(np.float64)
+        scores = X.mean(axis=1)
+        engine = CandidateJobMatchingEngine(1, batch_size=4)
+        for limit in (1, 7, 100, 500, 600):
+            expected = np.lexsort((np.arange(len(scores)), -scores))[:limit]
+            self.assertEqual(engine.rank(X, limit), [(float(scores[row]), int(row)) for row in expected])
+
+# id: (skills, experience_years, location, visa_status)
+CANDIDATES = {
+    1: (['Python', 'SQL'], 5, 'Austin', 'H1B'),
+    2: (['Python'], 5, 'Austin', 'Citizen'),
+    3: (['Python', 'SQL'], 5, 'Austin', 'Citizen'),
+    4: (['Java'], 9, 'Boston', 'Citizen'),
+    5: (['Python', 'SQL'], 5, 'Austin', 'Citizen'),
+}
+
+# Deleted from the database after it was indexed
+DELETED_CANDIDATE = 5
+
+def _fetch_candidates(tenant_id, candidate_ids):
+    return {
+        candidate_id: {'id': candidate_id, 'name': f"candidate {candidate_id}"}
+        for candidate_id in candidate_ids if candidate_id != DELETED_CANDIDATE
+    }
+
+class TestJobCandidateMatching(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        index = CandidateIndex(tmpdir.name)
+        index.rebuild([candidate_entry(candidate_id, *fields) for candidate_id, fields in CANDIDATES.items()])
+        semantic = SemanticIndex(tmpdir.name, 'candidates')
+        semantic.rebuild([
+            (candidate_id, candidate_document(fields[0])) for candidate_id, fields in CANDIDATES.items()
+        ])
+        ids, rows = semantic.export()
+        self.ann = ann = ANNIndex(tmpdir.name)
+        ann.rebuild((VectorEntry(candidate_id, vector) for candidate_id, vector in zip(ids.tolist(), embed(rows))), n_lists=2)
+        patches = [
+            mock.patch('ai_engine.utils.candidate_retrieval.ensure_candidate_index', return_value=index),
+            mock.patch('ai_engine.utils.semantic_matching.ensure_ann_index', return_value=ann),
+            mock.patch('django.conf.settings', SimpleNamespace(AI_ANN_SHORTLIST=3)),
+            mock.patch('ai_engine.utils.candidate_retrieval.fetch_candidates', side_effect=_fetch_candidates),
+            mock.patch('ai_engine.utils.semantic_matching.ensure_semantic_index', return_value=semantic),
+            mock.patch(
+                'ai_engine.utils.entity_features.candidate_vectors',
+                side_effect=lambda tenant_id, ids: np.stack([
+                    candidate_vector(*CANDIDATES[candidate_id][:3]) for candidate_id in ids
+                ]),
+            ),
+            mock.patch(
+                'ai_engine.utils.entity_features.job_vectors',
+                side_effect=lambda tenant_id, ids: np.stack([JOBS[job_id] for job_id in ids]),
+            ),
+            mock.patch.object(JobCandidateMatchingEngine, 'score_features', lambda self, X: X.mean(axis=1)),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.job = SimpleNamespace(
+            id=1, title='Backend engineer', description='Python services on SQL databases',
+            skills_required={'python': 1, 'sql': 1},
+        )
+
+    def test_best_candidates(self):
+        engine = JobCandidateMatchingEngine(1)
+        matches = engine.find_best_candidates(self.job, limit=4)
+        # 1, 3 and 5 fit equally: the newer candidate (generated first) wins
+        # the tie, and 5 was deleted since it was indexed
+        self.assertEqual([match['candidate_id'] for match in matches], [3, 1, 2])
+        self.assertEqual([match['skill_overlap'] for match in matches], [2, 2, 1])
+        self.assertEqual(matches[0]['match_score'], matches[1]['match_score'])
+        self.assertGreater(matches[1]['match_score'], matches[2]['match_score'])
+        self.assertEqual(matches[0]['features']['skills_score'], 1.0)
+        # Candidate 4 shares no skill: not generated
+        self.assertEqual(engine.last_search['generated'], 4)
+        self.assertEqual(engine.last_search['pool_size'], 5)
+
+    def test_best_candidates_filtered_and_capped(self):
+        filters = candidate_filters(visa_status='citizen')
+        matches = JobCandidateMatchingEngine(1).find_best_candidates(self.job, filters=filters)
+        self.assertEqual([match['candidate_id'] for match in matches], [3, 2])
+        engine = JobCandidateMatchingEngine(1, max_candidates=2)
+        # Generation keeps the largest skill overlaps (5 and 3); 5 is gone
+        self.assertEqual([match['candidate_id'] for match in engine.find_best_candidates(self.job)], [3])
+
+    def test_similar_candidates(self):
+        engine = JobCandidateMatchingEngine(1)
+        matches = engine.find_similar_candidates(self.job, limit=5)
+        ids = [match['candidate_id'] for match in matches]
+        self.assertEqual(set(ids[:2]), {1, 3})
+        self.assertEqual(ids[2], 2)
+        self.assertNotIn(DELETED_CANDIDATE, ids)
+        self.assertNotIn(4, ids)
+        similarities = [match['similarity'] for match in matches]
+        self.assertEqual(similarities, sorted(similarities, reverse=True))
+        filtered = engine.find_similar_candidates(self.job, filters=candidate_filters(visa_status='h1b'))
+        self.assertEqual([match['candidate_id'] for match in filtered], [1])
+        self.assertEqual(engine.last_search['scored'], 1)
+
+    def test_approximate_similar_candidates_reranked_exactly(self):
+        engine = JobCandidateMatchingEngine(1)
+        exact = engine.find_similar_candidates(self.job, limit=5)
+        # The shortlist (every list probed) holds the true neighbors, so
+        # reranking gives back the exact ranking and similarity; candidate 4,
+        # sharing no term, is shortlisted but dropped
+        approximate = engine.find_similar_candidates(self.job, limit=5, approximate=True)
+        self.assertEqual(approximate, exact)
+        filtered = engine.find_similar_candidates(self.job, filters=candidate_filters(visa_status='h1b'), approximate=True)
+        self.assertEqual([match['candidate_id'] for match in filtered], [1])
+
+    def test_approximate_with_selective_filter_searches_exactly(self):
+        engine = JobCandidateMatchingEngine(1)
+        filters = candidate_filters(visa_status='h1b')
+        # Probed lists holding none of the filtered candidates
+        nothing = (np.array([], dtype=np.int64), np.array([], dtype=np.float32))
+        with mock.patch.object(self.ann, 'search', return_value=nothing) as search:
+            filtered = engine.find_similar_candidates(self.job, filters=filters, approximate=True)
+        search.assert_not_called()
+        self.assertEqual(filtered, engine.find_similar_candidates(self.job, filters=filters))
+        self.assertEqual([match['candidate_id'] for match in filtered], [1])
+
+if __name__ == '__main__':
+    unittest.main()
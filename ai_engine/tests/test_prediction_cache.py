@@ -0,0 +1,82 @@
+# ai_engine/tests/test_prediction_cache.py
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import joblib
+import numpy as np
+from django.core.cache.backends.locmem import LocMemCache
+
+from ai_engine.ml_models.registry import ModelRegistry
+from ai_engine.utils.prediction_cache import PredictionCache
+
+
+class ConstantModel:
+    """Scores every row with the same fit probability."""
+
+    def __init__(self, fit):
+        self.fit = fit
+
+    def predict_proba(self, X):
+        return np.tile([1.0 - self.fit, self.fit], (X.shape[0], 1))
+
+
+class TestPredictionCache(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.dir = tmpdir.name
+        self.link = os.path.join(self.dir, 'current.pkl')
+        self.registry = ModelRegistry()
+        self.publish(1, 0.25)
+
+        backend = LocMemCache('predictions', {})
+        for target, kwargs in [
+            ('ai_engine.utils.prediction_cache.load_tenant_model_versioned',
+             {'side_effect': lambda tenant_id: self.registry.get_versioned(self.link)}),
+            ('ai_engine.utils.prediction_cache.PredictionCache.cache',
+             {'new_callable': mock.PropertyMock, 'return_value': backend}),
+            ('ai_engine.utils.prediction_cache.PredictionCache._metadata_version', {'return_value': 1}),
+        ]:
+            patcher = mock.patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.cache = PredictionCache()
+        self.rows = np.arange(6, dtype=np.float64).reshape(3, 2)
+
+    def publish(self, version, fit):
+        """Repoint the serving link at a new artifact, as save_model_version does."""
+        path = os.path.join(self.dir, f'v{version}.pkl')
+        joblib.dump(ConstantModel(fit), path)
+        tmp = self.link + '.tmp'
+        os.symlink(path, tmp)
+        os.replace(tmp, self.link)
+
+    def test_hit_returns_cached_score(self):
+        np.testing.assert_allclose(self.cache.predict_job_fit_batch(1, self.rows), 0.25)
+        with mock.patch('ai_engine.utils.prediction_cache.predict_fit_proba_batch') as score:
+            np.testing.assert_allclose(self.cache.predict_job_fit_batch(1, self.rows), 0.25)
+        score.assert_not_called()
+        self.assertEqual(self.cache.stats()['hits'], 3)
+        self.assertEqual(self.cache.stats()['misses'], 3)
+
+    def test_new_model_version_misses(self):
+        self.cache.predict_job_fit_batch(1, self.rows)
+        self.publish(2, 0.75)
+        np.testing.assert_allclose(self.cache.predict_job_fit_batch(1, self.rows), 0.75)
+        self.assertEqual(self.cache.stats()['misses'], 6)
+
+    def test_scores_during_swap_keep_the_old_version(self):
+        self.registry.configure(check_interval=3600)
+        self.cache.predict_job_fit_batch(1, self.rows[:1])
+        # Published, but the registry still serves the old model until its next check
+        self.publish(2, 0.75)
+        np.testing.assert_allclose(self.cache.predict_job_fit_batch(1, self.rows), 0.25)
+        self.registry.configure(check_interval=0)
+        # None of the old model's scores were stored under the new version
+        np.testing.assert_allclose(self.cache.predict_job_fit_batch(1, self.rows), 0.75)
+
+if __name__ == '__main__':
+    unittest.main()
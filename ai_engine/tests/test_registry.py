@@ -0,0 +1,71 @@
+# ai_engine/tests/test_registry.py
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+import joblib
+from ai_engine.ml_models.artifacts import save_model_version
+from ai_engine.ml_models.registry import ModelRegistry
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'model.pkl')
+        joblib.dump({'weights': list(range(100))}, self.path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_hit_after_first_load(self):
+        registry = ModelRegistry()
+        first = registry.get(self.path)
+        second = registry.get(self.path)
+        self.assertIs(first, second)
+        stats = registry.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+
+    def test_reload_when_file_changes(self):
+        registry = ModelRegistry()
+        first = registry.get(self.path)
+        joblib.dump({'weights': list(range(200))}, self.path)
+        second = registry.get(self.path)
+        self.assertIsNot(first, second)
+        self.assertEqual(len(second['weights']), 200)
+
+    def test_lru_eviction_within_budget(self):
+        other = os.path.join(self.tmpdir.name, 'other.pkl')
+        joblib.dump({'weights': list(range(100))}, other)
+        registry = ModelRegistry(max_bytes=os.path.getsize(self.path) + 1)
+        registry.get(self.path)
+        registry.get(other)
+        stats = registry.stats()
+        self.assertEqual(stats['entries'], 1)
+        self.assertEqual(stats['evictions'], 1)
+        self.assertLessEqual(stats['current_bytes'], stats['max_bytes'])
+
+    def test_missing_file_raises(self):
+        registry = ModelRegistry()
+        with self.assertRaises(FileNotFoundError):
+            registry.get(os.path.join(self.tmpdir.name, 'missing.pkl'))
+
+    def test_check_interval_throttles_reload(self):
+        registry = ModelRegistry(check_interval=3600)
+        first = registry.get(self.path)
+        joblib.dump({'weights': list(range(200))}, self.path)
+        # Within the interval the cached model is served without a stat
+        self.assertIs(registry.get(self.path), first)
+        registry.configure(check_interval=0)
+        self.assertEqual(len(registry.get(self.path)['weights']), 200)
+
+    def test_swaps_to_published_version(self):
+        registry = ModelRegistry()
+        link = os.path.join(self.tmpdir.name, 'current.pkl')
+        store = mock.patch('ai_engine.ml_models.artifacts.MODEL_STORE_DIR', os.path.join(self.tmpdir.name, 'store'))
+        store.start()
+        self.addCleanup(store.stop)
+        save_model_version({'weights': [1]}, link)
+        self.assertEqual(registry.get(link)['weights'], [1])
+        save_model_version({'weights': [2]}, link)
+        self.assertEqual(registry.get(link)['weights'], [2])
@@ -0,0 +1,83 @@
+# ai_engine/tests/test_semantic_index.py
+
+import tempfile
+import unittest
+import numpy as np
+from ai_engine.ml_models.semantic_index import (
+    SemanticIndex,
+    analyze,
+    candidate_document,
+    job_document,
+)
+
+def _documents():
+    return [
+        (1, candidate_document({'K8s': 1, 'Docker': 1}, {'experience': ['Ran k8s clusters on AWS'], 'email': 'a@b.c'})),
+        (2, candidate_document(['Java', 'Spring'], {'education': ['BSc Computer Science']})),
+        (3, candidate_document('python, django, postgres', None)),
+        (4, candidate_document(['ReactJS', 'CSS'], {'experience': ['Frontend developer']})),
+    ]
+
+class TestSemanticIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.index = SemanticIndex(self.tmpdir.name, 'candidates')
+        self.index.rebuild(_documents())
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_aliases_and_phrases_normalize(self):
+        self.assertEqual(analyze('K8s, Node.js and ReactJS')[:3], ['kubernetes', 'node', 'react'])
+        self.assertIn('machine-learning', analyze('ML engineer'))
+        self.assertIn('machine-learning', analyze('Machine Learning engineer'))
+        self.assertNotIn('a@b.c', candidate_document([], {'email': 'a@b.c'}))
+
+    def test_cosine_top_k(self):
+        job = job_document('Platform engineer', 'Operate Kubernetes on Amazon Web Services', {'docker': 1})
+        ids, similarity = self.index.search(job, limit=2)
+        np.testing.assert_array_equal(ids, [1])
+        self.assertTrue(0 < similarity[0] <= 1)
+        ids, similarity = self.index.search(job_document('Backend', 'Python and PostgreSQL', []), limit=5)
+        self.assertEqual(ids[0], 3)
+        self.assertTrue(np.all(np.diff(similarity) <= 0))
+        # Identical text: cosine 1
+        self.assertAlmostEqual(float(self.index.search(_documents()[1][1])[1][0]), 1.0, places=5)
+
+    def test_incremental_additions_visible_to_other_instances(self):
+        reader = SemanticIndex(self.tmpdir.name, 'candidates')
+        idf = reader.idf.copy()
+        self.index.add_documents([(9, 'kubernetes helm'), (4, 'java')])
+        self.index.delete_many([1])
+        ids, _ = reader.search('k8s engineer')
+        np.testing.assert_array_equal(ids, [9])
+        self.assertEqual(set(reader.search('java')[0]), {2, 4})
+        self.assertEqual(len(reader), 4)
+        # Rows already indexed keep their weights: no rebuild happened
+        np.testing.assert_array_equal(reader.idf, idf)
+        np.testing.assert_array_equal(reader.search('java', within=[2])[0], [2])
+
+    def test_similarity_of_given_documents(self):
+        self.index.add_documents([(9, 'kubernetes helm')])
+        self.index.delete_many([3])
+        query = job_document('Platform engineer', 'Kubernetes and Docker', [])
+        ids, similarity = self.index.search(query)
+        np.testing.assert_allclose(self.index.similarity(query, ids), similarity, rtol=1e-5)
+        # Deleted, unknown and unrelated documents score 0
+        np.testing.assert_array_equal(self.index.similarity(query, [3, 42, 2]), [0, 0, 0])
+        self.assertEqual(len(self.index.similarity(query, [])), 0)
+
+    def test_compaction_preserves_results(self):
+        index = SemanticIndex(self.tmpdir.name, 'candidates', compact_threshold=2)
+        index.add_documents([(5, 'go kubernetes')])
+        before = [index.search(query) for query in ('kubernetes', 'java spring', 'react')]
+        index.delete_many([2])  # second change triggers a compaction
+        self.assertEqual(len(SemanticIndex(self.tmpdir.name, 'candidates')), 4)
+        after = [index.search(query) for query in ('kubernetes', 'java spring', 'react')]
+        np.testing.assert_array_equal(after[0][0], before[0][0])
+        np.testing.assert_allclose(after[0][1], before[0][1], rtol=1e-5)
+        self.assertEqual(len(after[1][0]), 0)
+        np.testing.assert_array_equal(after[2][0], before[2][0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,30 @@
 # ai_engine/tests/test_tenant_ai.py
 
+import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
+import numpy as np
 import pandas as pd
-from ai_engine.ml_models import tenant_ai
+from scipy import sparse
+from ai_engine.ml_models import artifacts, global_ai, tenant_ai
+from ai_engine.ml_models.artifacts import load_estimator
 
 class TestTenantAI(unittest.TestCase):
     def setUp(self):
+        # Models and their blobs go to a scratch directory, not models/
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        global_model_path = os.path.join(tmpdir, 'global', 'global_ai_model.pkl')
+        for patch in (
+            mock.patch.object(global_ai, 'GLOBAL_MODEL_PATH', global_model_path),
+            mock.patch.object(tenant_ai, 'GLOBAL_MODEL_PATH', global_model_path),
+            mock.patch.object(tenant_ai, 'TENANT_MODEL_DIR', os.path.join(tmpdir, 'tenants')),
+            mock.patch.object(artifacts, 'MODEL_STORE_DIR', os.path.join(tmpdir, 'store')),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
         self.tenant_id = 99
         X = pd.DataFrame({'a': [1, 2, 3, 4], 'b': [4, 3, 2, 1]})
         y = pd.Series([0, 1, 1, 0])
@@ -20,3 +39,38 @@ class TestTenantAI(unittest.TestCase):
     def test_predict_job_fit(self):
         score = tenant_ai.predict_job_fit(self.tenant_id, [2, 3])
         self.assertTrue(0 <= score <= 1)
+
+    def test_predict_job_fit_batch(self):
+        matrix = np.array([[2, 3], [1, 4], [4, 1]])
+        scores = tenant_ai.predict_job_fit_batch(self.tenant_id, matrix, chunk_size=2)
+        self.assertEqual(scores.dtype, np.float32)
+        self.assertEqual(scores.shape, (3,))
+        for row, score in zip(matrix, scores):
+            self.assertAlmostEqual(score, tenant_ai.predict_job_fit(self.tenant_id, row), places=6)
+
+    def test_predict_job_fit_batch_sparse(self):
+        matrix = np.array([[2, 3], [1, 4]])
+        dense = tenant_ai.predict_job_fit_batch(self.tenant_id, matrix)
+        csr = tenant_ai.predict_job_fit_batch(self.tenant_id, sparse.csr_matrix(matrix))
+        np.testing.assert_array_equal(dense, csr)
+
+    def test_clone_references_global_model(self):
+        if not os.path.isfile(global_ai.GLOBAL_MODEL_PATH):
+            global_ai.train_global_model(pd.DataFrame({'a': [1, 2, 3, 4], 'b': [4, 3, 2, 1]}), pd.Series([0, 1, 0, 1]))
+        tenant_id = 98
+        model_ref = tenant_ai.clone_global_model_for_tenant(tenant_id)
+        self.assertEqual(model_ref, 'ref:' + global_ai.GLOBAL_MODEL_PATH)
+        self.assertFalse(os.path.exists(tenant_ai.get_tenant_model_path(tenant_id)))
+        self.assertIs(tenant_ai.load_tenant_model(tenant_id), global_ai.load_global_model())
+
+    def test_update_tenant_model_adds_trees(self):
+        before = len(load_estimator(tenant_ai.get_tenant_model_path(self.tenant_id)).estimators_)
+        X_new = pd.DataFrame({'a': [1, 4], 'b': [4, 1]})
+        model = tenant_ai.update_tenant_model(self.tenant_id, X_new, pd.Series([1, 0]), n_new_trees=5)
+        self.assertEqual(len(model.estimators_), before + 5)
+        self.assertEqual(len(tenant_ai.load_tenant_model(self.tenant_id).roots), before + 5)
+
+    def test_update_tenant_model_requires_all_classes(self):
+        X_new = pd.DataFrame({'a': [1, 4], 'b': [4, 1]})
+        with self.assertRaises(ValueError):
+            tenant_ai.update_tenant_model(self.tenant_id, X_new, pd.Series([1, 1]))
@@ -0,0 +1,81 @@
+# ai_engine/tests/test_training_data.py
+
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from ai_engine.ml_models.training_data import (
+    LABEL_COLUMN,
+    downcast_frame,
+    iter_training_batches,
+    load_training_matrix,
+)
+
+class TestTrainingData(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame(rng.random((1000, 3)), columns=['a', 'b', 'c'])
+        self.df[LABEL_COLUMN] = np.arange(1000) % 2
+        self.csv_path = os.path.join(self.tmpdir.name, 'train.csv')
+        self.df.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_downcast_frame(self):
+        df = downcast_frame(pd.DataFrame({'x': [1.5, 2.5], 'y': [0, 1], 'z': ['a', 'a']}))
+        self.assertEqual(df['x'].dtype, np.float32)
+        self.assertEqual(df['y'].dtype, np.int8)
+        # Strings are left alone: features must be numeric anyway
+        self.assertNotIsInstance(df['z'].dtype, pd.CategoricalDtype)
+
+    def test_load_whole_file_under_cap(self):
+        X, y, names, stats = load_training_matrix(self.csv_path, chunk_rows=128)
+        self.assertEqual(names, ['a', 'b', 'c'])
+        self.assertEqual(X.dtype, np.float32)
+        self.assertEqual(stats['rows_used'], 1000)
+        np.testing.assert_allclose(X, self.df[['a', 'b', 'c']].to_numpy(), rtol=1e-6)
+        np.testing.assert_array_equal(y, self.df[LABEL_COLUMN])
+
+    def test_subsample_respects_cap(self):
+        max_bytes = 300 * 3 * 4
+        X, y, _, stats = load_training_matrix(self.csv_path, max_bytes=max_bytes, chunk_rows=128)
+        self.assertEqual(len(X), 300)
+        self.assertLessEqual(X.nbytes, max_bytes)
+        self.assertEqual(stats['rows_read'], 1000)
+        # Sampled rows are real rows with their own labels
+        original = {tuple(row): label for row, label in zip(
+            self.df[['a', 'b', 'c']].to_numpy(dtype=np.float32), self.df[LABEL_COLUMN])}
+        for row, label in zip(X, y):
+            self.assertEqual(original[tuple(row)], label)
+
+    def test_npz_batches(self):
+        path = os.path.join(self.tmpdir.name, 'train.npz')
+        np.savez(path, X=self.df[['a', 'b', 'c']].to_numpy(), y=self.df[LABEL_COLUMN].to_numpy())
+        batches = list(iter_training_batches(path, chunk_rows=400))
+        self.assertEqual([len(X) for X, _, _ in batches], [400, 400, 200])
+        self.assertEqual(batches[0][2], ['f0', 'f1', 'f2'])
+
+    def test_npz_streamed_in_row_blocks(self):
+        X = self.df[['a', 'b', 'c']].to_numpy()
+        y = self.df[LABEL_COLUMN].to_numpy()
+        for name, save, data in (
+            ('compressed.npz', np.savez_compressed, X),
+            ('fortran.npz', np.savez, np.asfortranarray(X)),
+        ):
+            path = os.path.join(self.tmpdir.name, name)
+            save(path, X=data, y=y, feature_names=np.array(['a', 'b', 'c']))
+            batches = list(iter_training_batches(path, chunk_rows=300))
+            self.assertEqual([len(batch_X) for batch_X, _, _ in batches], [300, 300, 300, 100])
+            self.assertEqual(batches[0][2], ['a', 'b', 'c'])
+            np.testing.assert_allclose(np.concatenate([batch_X for batch_X, _, _ in batches]), X, rtol=1e-6)
+            np.testing.assert_array_equal(np.concatenate([batch_y for _, batch_y, _ in batches]), y)
+        path = os.path.join(self.tmpdir.name, 'mismatched.npz')
+        np.savez(path, X=X, y=y[:500])
+        with self.assertRaises(ValueError):
+            list(iter_training_batches(path, chunk_rows=300))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# ai_engine/tests/test_training_dataset.py
+
+import unittest
+from datetime import datetime, timezone
+import numpy as np
+from ai_engine.ml_models.pair_features import skill_set
+from ai_engine.utils.training_dataset import TrainingDataset, merge_datasets
+
+class TestPairFeatures(unittest.TestCase):
+    def test_skill_set_accepts_json_shapes(self):
+        self.assertEqual(skill_set({'Python': 3, 'SQL': 1}), {'python', 'sql'})
+        self.assertEqual(skill_set(['Python', ' sql ']), {'python', 'sql'})
+        self.assertEqual(skill_set('python, sql'), {'python', 'sql'})
+        self.assertEqual(skill_set(None), set())
+
+
+class TestMergeDatasets(unittest.TestCase):
+    def dataset(self, pairs, labels, day):
+        return TrainingDataset(
+            X=np.array(labels, dtype=np.float32)[:, None].repeat(4, axis=1),
+            y=np.array(labels, dtype=np.int8),
+            job_ids=np.array([p[0] for p in pairs], dtype=np.int64),
+            candidate_ids=np.array([p[1] for p in pairs], dtype=np.int64),
+            watermark=datetime(2025, 1, day, tzinfo=timezone.utc),
+        )
+
+    def test_update_replaces_changed_pairs(self):
+        previous = self.dataset([(1, 1), (1, 2), (2, 1)], [0, 1, 0], day=1)
+        update = self.dataset([(2, 1), (3, 3)], [1, 1], day=2)
+        merged = merge_datasets(previous, update)
+        rows = dict(zip(zip(merged.job_ids, merged.candidate_ids), merged.y))
+        self.assertEqual(rows, {(1, 1): 0, (1, 2): 1, (2, 1): 1, (3, 3): 1})
+        self.assertEqual(merged.watermark, update.watermark)
+
+    def test_empty_update_keeps_watermark(self):
+        previous = self.dataset([(1, 1)], [1], day=3)
+        update = TrainingDataset(np.zeros((0, 4), np.float32), np.zeros(0, np.int8),
+                                 np.zeros(0, np.int64), np.zeros(0, np.int64), None)
+        merged = merge_datasets(previous, update)
+        self.assertEqual(len(merged.y), 1)
+        self.assertEqual(merged.watermark, previous.watermark)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+# ai_engine/tests/test_training_scheduler.py
+
+import unittest
+from datetime import datetime, timedelta
+from ai_engine.utils.training_scheduler import AGING_SECONDS, QueuedJob, is_heavy_job, schedule_jobs
+
+class TestTrainingScheduler(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime(2025, 1, 1, 12, 0)
+
+    def job(self, job_id, tenant_id, plan, waited=0, heavy=True):
+        return QueuedJob(job_id, tenant_id, plan, self.now - timedelta(seconds=waited), heavy)
+
+    def test_higher_plan_first(self):
+        queued = [self.job(1, 10, 'Free', waited=60), self.job(2, 20, 'Enterprise'), self.job(3, 30, 'Pro')]
+        self.assertEqual(schedule_jobs(queued, {}, 3, 3, self.now), [2, 3, 1])
+
+    def test_one_running_job_per_tenant(self):
+        queued = [self.job(1, 10, 'Enterprise'), self.job(2, 20, 'Free')]
+        self.assertEqual(schedule_jobs(queued, {10: 1}, 2, 2, self.now), [2])
+
+    def test_long_wait_outranks_plan(self):
+        queued = [self.job(1, 10, 'Free', waited=3 * AGING_SECONDS), self.job(2, 20, 'Enterprise')]
+        self.assertEqual(schedule_jobs(queued, {}, 1, 1, self.now), [1])
+
+    def test_node_cap_only_limits_heavy_jobs(self):
+        queued = [self.job(1, 10, 'Enterprise'), self.job(2, 20, 'Pro', heavy=False), self.job(3, 30, 'Pro')]
+        self.assertEqual(schedule_jobs(queued, {}, 3, 1, self.now), [1, 2])
+
+    def test_clone_and_incremental_jobs_are_light(self):
+        self.assertFalse(is_heavy_job('tenant_clone', {}))
+        self.assertFalse(is_heavy_job('tenant_retrain', {'mode': 'incremental'}))
+        self.assertTrue(is_heavy_job('tenant_retrain', {}))
@@ -0,0 +1,34 @@
+# ai_engine/tests/test_tuning.py
+
+import unittest
+import numpy as np
+from ai_engine.ml_models.tuning import CV_METRICS, search_hyperparameters
+
+class TestHyperparameterSearch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = rng.random((300, 4))
+        self.y = (self.X[:, 0] + self.X[:, 1] > 1).astype(int)
+        self.space = {'n_estimators': [5, 40], 'max_depth': [2, 8]}
+
+    def test_search_records_scores_and_latency(self):
+        result = search_hyperparameters(self.X, self.y, param_space=self.space, n_jobs=1)
+        self.assertEqual(set(result.cv_metrics), set(CV_METRICS))
+        self.assertIn(result.best_params, [c['params'] for c in result.candidates])
+        finalists = [c for c in result.candidates if c.get('finalist')]
+        self.assertTrue(finalists)
+        for candidate in finalists:
+            self.assertGreater(candidate['latency_p99_ms'], 0)
+        # Successive halving drops configurations before the last round
+        self.assertLess(len(finalists), 4)
+
+    def test_tight_latency_budget_prefers_fastest_finalist(self):
+        result = search_hyperparameters(
+            self.X, self.y, param_space=self.space, n_jobs=1, latency_budget_ms=0.0
+        )
+        finalists = [c for c in result.candidates if c.get('finalist')]
+        fastest = min(finalists, key=lambda c: c['latency_p99_ms'])
+        self.assertEqual(result.best_params, fastest['params'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+# ai_engine/tests/test_warmup.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from ai_engine.ml_models import artifacts, global_ai, tenant_ai, warmup
+from ai_engine.ml_models.registry import ModelRegistry
+from ai_engine.ml_models.warmup import warm_up_models
+
+class TestModelWarmup(unittest.TestCase):
+    def setUp(self):
+        # Models and their blobs go to a scratch directory, not models/
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        global_model_path = os.path.join(tmpdir, 'global', 'global_ai_model.pkl')
+        for patch in (
+            mock.patch.object(global_ai, 'GLOBAL_MODEL_PATH', global_model_path),
+            mock.patch.object(tenant_ai, 'GLOBAL_MODEL_PATH', global_model_path),
+            mock.patch.object(warmup, 'GLOBAL_MODEL_PATH', global_model_path),
+            mock.patch.object(tenant_ai, 'TENANT_MODEL_DIR', os.path.join(tmpdir, 'tenants')),
+            mock.patch.object(artifacts, 'MODEL_STORE_DIR', os.path.join(tmpdir, 'store')),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+        X = pd.DataFrame({'a': [1, 2, 3, 4], 'b': [4, 3, 2, 1]})
+        y = pd.Series([0, 1, 0, 1])
+        global_ai.train_global_model(X, y)
+
+    def test_shared_global_model_primed_once(self):
+        registry = ModelRegistry()
+        # Untrained tenants resolve to the global model
+        report = warm_up_models([987001, 987002], include_nlp=False, registry=registry)
+        self.assertEqual(len(report['models']), 1)
+        self.assertEqual(report['errors'], [])
+        self.assertEqual(registry.stats()['entries'], 1)
+        self.assertGreaterEqual(report['duration'], report['models'][0]['seconds'])
+
+    def test_load_errors_are_reported(self):
+        def failing_loader(path):
+            raise IOError("disk unavailable")
+        registry = ModelRegistry(loader=failing_loader)
+        report = warm_up_models(include_nlp=False, registry=registry)
+        self.assertEqual(report['models'], [])
+        self.assertEqual(len(report['errors']), 1)
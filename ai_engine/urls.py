@@ -20,11 +20,13 @@ urlpatterns = [
     
     # API endpoints for AJAX calls
     path('api/matches/find/', views.find_candidate_matches, name='find_matches'),
+    path('api/matches/jobs/', views.find_job_matches, name='find_job_matches'),
     path('api/features/extract/', views.extract_candidate_features, name='extract_features'),
     path('api/models/retrain/', views.retrain_tenant_model, name='retrain_model'),
     path('api/performance/', views.get_model_performance, name='model_performance'),
     path('api/training/status/', views.get_training_status, name='training_status'),
     path('api/feedback/submit/', views.submit_match_feedback, name='submit_feedback'),
+    path('api/models/cache/', views.get_model_cache_stats, name='model_cache_stats'),
     
     # REST API endpoints (DRF ViewSets)
     path('api/v1/', include(router.urls)),
@@ -32,6 +34,7 @@ urlpatterns = [
     # Specific AI operations
     path('api/jobs/<int:job_id>/candidates/', views.find_candidate_matches, name='job_candidates'),
     path('api/candidates/<int:candidate_id>/features/', views.extract_candidate_features, name='candidate_features'),
+    path('api/candidates/<int:candidate_id>/jobs/', views.find_job_matches, name='candidate_jobs'),
     
     # Model management endpoints
     path('api/models/global/train/', viewsets.AIModelMetadataViewSet.as_view({'post': 'train_global_model'}), name='train_global'),
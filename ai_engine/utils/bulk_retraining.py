@@ -0,0 +1,93 @@
+# ai_engine/utils/bulk_retraining.py
+
+import json
+import os
+import time
+
+# Rough per-process cost of a training worker (interpreter, Django, sklearn)
+WORKER_BASE_BYTES = 150 * 1024 * 1024
+
+# Rough bytes per training row per tree: fitted nodes plus their value arrays
+TREE_BYTES_PER_ROW = 120
+
+def estimate_training_bytes(n_rows, n_features, n_estimators=100):
+    """
+    Rough peak memory of fitting a random forest on n_rows labeled rows:
+    worker overhead, a few copies of the feature matrix, and tree storage.
+    """
+    return WORKER_BASE_BYTES + n_rows * n_features * 8 * 4 + n_rows * n_estimators * TREE_BYTES_PER_ROW
+
+def physical_memory_bytes():
+    """Total RAM of this machine, or None where sysconf is unavailable."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def retrain_tenant(tenant_id):
+    """
+    Fully retrain one tenant from its feedback; runs in a worker process.
+    Returns a summary dict with status 'completed', 'skipped' (not enough
+    labeled feedback) or 'failed'.
+    """
+    from core.models import Tenant
+    from ai_engine.utils.feedback_training import train_tenant_from_feedback
+
+    started = time.perf_counter()
+    summary = {'tenant_id': tenant_id}
+    try:
+        metadata = train_tenant_from_feedback(Tenant.objects.get(id=tenant_id))
+    except ValueError as e:
+        summary.update(status='skipped', error=str(e))
+    except Exception as e:
+        summary.update(status='failed', error=f"{type(e).__name__}: {e}")
+    else:
+        summary.update(
+            status='completed',
+            version=metadata.version,
+            samples=metadata.training_samples,
+            accuracy=metadata.accuracy,
+            f1_score=metadata.f1_score,
+        )
+    summary['seconds'] = time.perf_counter() - started
+    return summary
+
+
+class RetrainState:
+    """
+    Progress of a bulk retrain persisted as JSON, so an interrupted run
+    resumes with the tenants it had not finished.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.results = {}  # tenant_id -> summary dict
+
+    @classmethod
+    def load(cls, path):
+        state = cls(path)
+        if os.path.isfile(path):
+            with open(path) as f:
+                data = json.load(f)
+            state.results = {int(k): v for k, v in data.get('results', {}).items()}
+        return state
+
+    def is_done(self, tenant_id):
+        # Failed tenants are retried on resume
+        return self.results.get(tenant_id, {}).get('status') in ('completed', 'skipped')
+
+    def record(self, summary):
+        self.results[summary['tenant_id']] = summary
+        self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'results': self.results}, f, indent=2, default=str)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        self.results = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,71 @@
+# ai_engine/utils/candidate_retrieval.py
+
+import os
+import threading
+
+from ai_engine.ml_models.candidate_index import CandidateIndex, candidate_entry
+from ai_engine.utils.entity_features import DEFAULT_FEATURE_STORE_DIR, REBUILD_BATCH_SIZE
+
+INDEX_FIELDS = ('id', 'skills', 'experience_years', 'location', 'visa_status', 'ai_learning_profile')
+
+# Candidate fields returned with each match
+MATCH_FIELDS = ('id', 'name', 'email', 'location', 'visa_status', 'experience_years')
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_candidate_index(tenant_id):
+    """Process-wide CandidateIndex of a tenant, next to its feature store."""
+    from django.conf import settings
+
+    root = getattr(settings, 'AI_FEATURE_STORE_DIR', None) or DEFAULT_FEATURE_STORE_DIR
+    key = (root, tenant_id)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = CandidateIndex(os.path.join(root, f"tenant_{tenant_id}"))
+        return _indexes[key]
+
+def index_candidates(tenant_id, rows):
+    """
+    Add or update candidates given as INDEX_FIELDS value tuples.
+    A tenant without an index yet is skipped: writing its log would make the
+    index exist without the candidates already in the database, so it is
+    built from the database on first use instead.
+    """
+    index = get_candidate_index(tenant_id)
+    if rows and index.exists():
+        index.upsert_many([candidate_entry(*row) for row in rows])
+
+def remove_candidates(tenant_id, candidate_ids):
+    """Drop candidates from the tenant's index, where built."""
+    index = get_candidate_index(tenant_id)
+    if index.exists():
+        index.delete_many(candidate_ids)
+
+def rebuild_candidate_index(tenant_id, batch_size=REBUILD_BATCH_SIZE):
+    """Rebuild a tenant's candidate index from the database. Returns the candidate count."""
+    from core.models import Candidate
+
+    entries = [
+        candidate_entry(*row)
+        for row in Candidate.objects.filter(tenant_id=tenant_id).values_list(*INDEX_FIELDS)
+        .iterator(chunk_size=batch_size)
+    ]
+    get_candidate_index(tenant_id).rebuild(entries)
+    return len(entries)
+
+def ensure_candidate_index(tenant_id):
+    """The tenant's candidate index, built from the database on first use."""
+    index = get_candidate_index(tenant_id)
+    if not index.exists():
+        rebuild_candidate_index(tenant_id)
+    return index
+
+def fetch_candidates(tenant_id, candidate_ids):
+    """{id: MATCH_FIELDS dict} of the given candidates, in one query."""
+    from core.models import Candidate
+
+    return {
+        row['id']: row
+        for row in Candidate.objects.filter(tenant_id=tenant_id, id__in=list(candidate_ids)).values(*MATCH_FIELDS)
+    }
@@ -0,0 +1,110 @@
+# ai_engine/utils/entity_features.py
+
+import os
+import threading
+
+import numpy as np
+
+from ai_engine.ml_models.feature_store import FeatureStore
+from ai_engine.ml_models.pair_features import candidate_vector, job_vector
+
+DEFAULT_FEATURE_STORE_DIR = 'models/feature_store'
+
+# Rows per batch when (re)building a store from the database
+REBUILD_BATCH_SIZE = 5000
+
+CANDIDATE_FIELDS = ('id', 'skills', 'experience_years', 'location', 'ai_learning_profile')
+JOB_FIELDS = ('id', 'skills_required', 'location')
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_feature_store(tenant_id, kind):
+    """Process-wide FeatureStore of a tenant's 'candidates' or 'jobs'."""
+    from django.conf import settings
+
+    root = getattr(settings, 'AI_FEATURE_STORE_DIR', None) or DEFAULT_FEATURE_STORE_DIR
+    key = (root, tenant_id, kind)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = FeatureStore(os.path.join(root, f"tenant_{tenant_id}"), kind)
+        return _stores[key]
+
+def _candidate_rows_to_vectors(rows):
+    ids = [row[0] for row in rows]
+    vectors = np.array([candidate_vector(*row[1:]) for row in rows], dtype=np.float32)
+    return ids, vectors
+
+def _job_rows_to_vectors(rows):
+    ids = [row[0] for row in rows]
+    vectors = np.array([job_vector(*row[1:]) for row in rows], dtype=np.float32)
+    return ids, vectors
+
+def store_candidates(tenant_id, rows):
+    """Materialize candidates given as CANDIDATE_FIELDS value tuples."""
+    if rows:
+        get_feature_store(tenant_id, 'candidates').upsert_many(*_candidate_rows_to_vectors(rows))
+
+def store_jobs(tenant_id, rows):
+    """Materialize jobs given as JOB_FIELDS value tuples."""
+    if rows:
+        get_feature_store(tenant_id, 'jobs').upsert_many(*_job_rows_to_vectors(rows))
+
+def candidate_vectors(tenant_id, candidate_ids):
+    """
+    Feature vectors of candidates, aligned with candidate_ids, read in bulk
+    from the tenant's feature store. Candidates missing from the store are
+    loaded with one query and stored. Ids that don't exist get zero rows.
+    """
+    from core.models import Candidate
+
+    store = get_feature_store(tenant_id, 'candidates')
+    vectors, found = store.get_many(candidate_ids)
+    if not found.all():
+        missing = [candidate_ids[i] for i in np.flatnonzero(~found)]
+        rows = list(Candidate.objects.filter(tenant_id=tenant_id, id__in=missing).values_list(*CANDIDATE_FIELDS))
+        store_candidates(tenant_id, rows)
+        vectors[~found], _ = store.get_many(missing)
+    return vectors
+
+def job_vectors(tenant_id, job_ids):
+    """Feature vectors of jobs, aligned with job_ids (see candidate_vectors)."""
+    from core.models import Job
+
+    store = get_feature_store(tenant_id, 'jobs')
+    vectors, found = store.get_many(job_ids)
+    if not found.all():
+        missing = [job_ids[i] for i in np.flatnonzero(~found)]
+        rows = list(Job.objects.filter(tenant_id=tenant_id, id__in=missing).values_list(*JOB_FIELDS))
+        store_jobs(tenant_id, rows)
+        vectors[~found], _ = store.get_many(missing)
+    return vectors
+
+def rebuild_feature_store(tenant_id, batch_size=REBUILD_BATCH_SIZE):
+    """
+    Recompute every candidate and job vector of a tenant from the database
+    and drop rows of entities that no longer exist (e.g. after bulk
+    updates or deletes, which don't send model signals).
+    Returns (candidates, jobs) stored.
+    """
+    from core.models import Candidate, Job
+
+    counts = []
+    for kind, model, fields, store_fn in (
+        ('candidates', Candidate, CANDIDATE_FIELDS, store_candidates),
+        ('jobs', Job, JOB_FIELDS, store_jobs),
+    ):
+        seen = set()
+        batch = []
+        for row in model.objects.filter(tenant_id=tenant_id).values_list(*fields).iterator(chunk_size=batch_size):
+            batch.append(row)
+            seen.add(row[0])
+            if len(batch) >= batch_size:
+                store_fn(tenant_id, batch)
+                batch = []
+        store_fn(tenant_id, batch)
+        store = get_feature_store(tenant_id, kind)
+        stored_ids, _ = store.all()
+        store.delete_many([entity_id for entity_id in stored_ids.tolist() if entity_id not in seen])
+        counts.append(len(seen))
+    return tuple(counts)
@@ -0,0 +1,174 @@
+# ai_engine/utils/feedback_training.py
+
+import numpy as np
+import pandas as pd
+from django.utils import timezone
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.model_selection import train_test_split
+
+from ai_engine.ml_models.global_ai import GLOBAL_MODEL_PATH, train_global_model
+from ai_engine.ml_models.pair_features import PAIR_FEATURES
+from ai_engine.ml_models.tenant_ai import (
+    DEFAULT_INCREMENTAL_TREES,
+    get_tenant_model_path,
+    train_tenant_model,
+    update_tenant_model,
+)
+from ai_engine.utils.model_metadata import record_model_version
+
+# AIMatchingResult score fields used as job-candidate pair features
+FEEDBACK_FEATURES = PAIR_FEATURES
+
+# Share of labeled rows held out to measure a fully retrained model
+HOLDOUT_FRACTION = 0.2
+
+# actual_outcome values (lower-cased) mapped to fit labels; others are skipped
+OUTCOME_LABELS = {
+    'hired': 1,
+    'offer': 1,
+    'accepted': 1,
+    'interview': 1,
+    'shortlisted': 1,
+    'rejected': 0,
+    'declined': 0,
+    'no-show': 0,
+    'not_hired': 0,
+}
+
+class UpdateSkipped(Exception):
+    """New feedback cannot update the model yet; it is kept for a later update."""
+
+def outcome_label(outcome):
+    """Map a recruiter outcome string to a fit label, or None if unknown."""
+    if not outcome:
+        return None
+    return OUTCOME_LABELS.get(outcome.strip().lower())
+
+def collect_new_feedback(tenant, watermark=None):
+    """
+    Return (X, y, new_watermark) for AIMatchingResult rows of the tenant
+    (all tenants if tenant is None) whose outcome was recorded after
+    `watermark`.
+    new_watermark is the newest updated_at seen (None if there were no rows).
+    """
+    from ai_engine.models import AIMatchingResult
+
+    rows = AIMatchingResult.objects.filter(actual_outcome__isnull=False)
+    if tenant is not None:
+        rows = rows.filter(tenant=tenant)
+    if watermark is not None:
+        rows = rows.filter(updated_at__gt=watermark)
+    rows = list(rows.values_list(*FEEDBACK_FEATURES, 'actual_outcome', 'updated_at'))
+    if not rows:
+        return None, None, None
+
+    features, labels = [], []
+    for row in rows:
+        label = outcome_label(row[-2])
+        if label is not None:
+            features.append(row[:len(FEEDBACK_FEATURES)])
+            labels.append(label)
+    new_watermark = max(row[-1] for row in rows)
+    X = pd.DataFrame(np.array(features, dtype=np.float64).reshape(-1, len(FEEDBACK_FEATURES)),
+                     columns=FEEDBACK_FEATURES)
+    return X, np.array(labels, dtype=np.int64), new_watermark
+
+def incremental_update_tenant(tenant, n_new_trees=DEFAULT_INCREMENTAL_TREES):
+    """
+    Add trees learned from the tenant's feedback since the active model's
+    watermark and publish them as a new model version.
+    Returns the new AIModelMetadata, or None if there was nothing to learn.
+    Raises UpdateSkipped, leaving the watermark where it was, if the new
+    feedback covers a single outcome (warm_start needs every class the
+    model knows), and ValueError if the feedback cannot update the model
+    (see tenant_ai.update_tenant_model).
+    """
+    from ai_engine.models import AIModelMetadata
+
+    current = AIModelMetadata.objects.filter(
+        tenant=tenant, model_type='tenant', status='active'
+    ).first()
+    watermark = current.feedback_watermark if current else None
+    X, y, new_watermark = collect_new_feedback(tenant, watermark)
+    if X is None or len(y) == 0:
+        return None
+    if len(np.unique(y)) < 2:
+        raise UpdateSkipped(f"New feedback covers a single outcome ({len(y)} rows); waiting for both fit and no-fit examples")
+
+    started = timezone.now()
+    model = update_tenant_model(tenant.id, X, y, n_new_trees=n_new_trees)
+    return record_model_version(
+        get_tenant_model_path(tenant.id), 'tenant',
+        tenant=tenant,
+        training_samples=(current.training_samples if current else 0) + len(y),
+        features_count=len(FEEDBACK_FEATURES),
+        training_duration=timezone.now() - started,
+        feedback_watermark=new_watermark,
+        incremental_samples=len(y),
+        hyperparameters={**(current.hyperparameters if current else {}), 'n_estimators': len(model.estimators_)},
+    )
+
+def holdout_metrics(y_true, y_pred):
+    """Accuracy, precision, recall and F1 of binary fit predictions."""
+    return {
+        'accuracy': float(accuracy_score(y_true, y_pred)),
+        'precision': float(precision_score(y_true, y_pred, zero_division=0)),
+        'recall': float(recall_score(y_true, y_pred, zero_division=0)),
+        'f1_score': float(f1_score(y_true, y_pred, zero_division=0)),
+    }
+
+def _split_for_holdout(X, y):
+    """
+    Split off HOLDOUT_FRACTION of the rows for evaluation when every class
+    has enough rows; otherwise train on everything and skip metrics.
+    """
+    _, counts = np.unique(y, return_counts=True)
+    if len(counts) < 2 or counts.min() < 2 or len(y) * HOLDOUT_FRACTION < len(counts):
+        return X, y, None, None
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=HOLDOUT_FRACTION, stratify=y, random_state=0
+    )
+    return X_train, y_train, X_test, y_test
+
+def _train_from_feedback(tenant, train_fn, model_path, model_type):
+    X, y, watermark = collect_new_feedback(tenant)
+    if X is None or len(y) == 0:
+        raise ValueError("No labeled feedback to train on")
+    if len(np.unique(y)) < 2:
+        raise ValueError("Feedback covers a single outcome; need both fit and no-fit examples")
+
+    started = timezone.now()
+    X_train, y_train, X_test, y_test = _split_for_holdout(X, y)
+    model = train_fn(X_train, y_train)
+    metrics = holdout_metrics(y_test, model.predict(X_test)) if X_test is not None else {}
+    metadata = record_model_version(
+        model_path, model_type,
+        tenant=tenant,
+        training_samples=len(y_train),
+        features_count=len(FEEDBACK_FEATURES),
+        training_duration=timezone.now() - started,
+        feedback_watermark=watermark,
+        incremental_samples=0,
+        hyperparameters=model.get_params(),
+        **metrics,
+    )
+    return metadata
+
+def train_tenant_from_feedback(tenant):
+    """
+    Fully retrain the tenant model on all of its labeled feedback, measure
+    it on a held-out split and publish it as a new version.
+    Returns the new AIModelMetadata. Raises ValueError if there is not
+    enough labeled feedback.
+    """
+    return _train_from_feedback(
+        tenant, lambda X, y: train_tenant_model(tenant.id, X, y),
+        get_tenant_model_path(tenant.id), 'tenant',
+    )
+
+def train_global_from_feedback():
+    """
+    Retrain the global model on labeled feedback from all tenants and
+    publish it as a new version. Returns the new AIModelMetadata.
+    """
+    return _train_from_feedback(None, train_global_model, GLOBAL_MODEL_PATH, 'global')
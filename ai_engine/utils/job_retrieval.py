@@ -0,0 +1,28 @@
+# ai_engine/utils/job_retrieval.py
+
+import numpy as np
+
+# Job statuses reverse matching recommends
+OPEN_JOB_STATUSES = ('Open',)
+
+# Job fields returned with each match
+JOB_MATCH_FIELDS = ('id', 'title', 'location', 'employment_type', 'pay_rate', 'status')
+
+def open_job_ids(tenant_id, statuses=OPEN_JOB_STATUSES):
+    """Sorted int64 ids of the tenant's jobs in one of `statuses`."""
+    from core.models import Job
+
+    return np.fromiter(
+        Job.objects.filter(tenant_id=tenant_id, status__in=statuses).order_by('id').values_list('id', flat=True),
+        dtype=np.int64,
+    )
+
+def fetch_jobs(tenant_id, job_ids, statuses=OPEN_JOB_STATUSES):
+    """{id: JOB_MATCH_FIELDS dict} of the given jobs still in one of `statuses`, in one query."""
+    from core.models import Job
+
+    return {
+        row['id']: row
+        for row in Job.objects.filter(tenant_id=tenant_id, id__in=list(job_ids), status__in=statuses)
+        .values(*JOB_MATCH_FIELDS)
+    }
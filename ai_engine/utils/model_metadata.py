@@ -0,0 +1,86 @@
+# ai_engine/utils/model_metadata.py
+
+from django.db import transaction
+from django.utils import timezone
+
+from ai_engine.ml_models.artifacts import current_model_version, publish_model_version, store_digest
+from ai_engine.utils.prediction_cache import prediction_cache
+
+def format_model_version(version):
+    """
+    Metadata version string for an artifact version number. Version 0 is the
+    "1.0.0" entry tenants start with while sharing the global model.
+    """
+    return f"1.0.{version}"
+
+def parse_model_version(version):
+    """Artifact version number of a metadata version string ("1.0.N" -> N)."""
+    try:
+        return int(version.rsplit('.', 1)[-1])
+    except ValueError:
+        raise ValueError(f"Not an artifact version: {version!r}")
+
+def published_model_path(tenant=None):
+    """Pointer path the tenant's (or, without one, the global) model is published at."""
+    from ai_engine.ml_models.global_ai import GLOBAL_MODEL_PATH
+    from ai_engine.ml_models.tenant_ai import get_tenant_model_path
+
+    return get_tenant_model_path(tenant.id) if tenant is not None else GLOBAL_MODEL_PATH
+
+def record_model_version(model_path, model_type, tenant=None, **fields):
+    """
+    Point AIModelMetadata at the version currently published at `model_path`:
+    create (or update) the row for that version as 'active' and deprecate
+    the previously active rows for the same tenant and model type.
+    Extra keyword arguments are stored on the row (e.g. training_samples).
+    Raises ValueError if `model_path` is not a published versioned model.
+    """
+    from ai_engine.models import AIModelMetadata
+
+    current = current_model_version(model_path)
+    if current is None:
+        raise ValueError(f"No published model version at {model_path}")
+    version, versioned_path = current
+
+    fields.setdefault('last_trained', timezone.now())
+    fields.setdefault('artifact_sha256', store_digest(versioned_path) or '')
+    with transaction.atomic():
+        metadata, _ = AIModelMetadata.objects.update_or_create(
+            tenant=tenant,
+            model_type=model_type,
+            version=format_model_version(version),
+            defaults={'model_path': versioned_path, 'status': 'active', **fields},
+        )
+        _deprecate_others(metadata)
+    # Cached scores are keyed by version; stop serving the old one here at once
+    prediction_cache.invalidate(tenant.id if tenant is not None else None)
+    return metadata
+
+def activate_model_version(metadata):
+    """
+    Roll the model back (or forward) to an earlier AIModelMetadata version:
+    repoint the published model at its artifact and make the row active.
+    Nothing is retrained or copied; versions whose link was pruned are
+    relinked to their blob in the content-addressed store.
+    Raises FileNotFoundError if the version's artifact is gone.
+    """
+    from ai_engine.ml_models.registry import model_registry
+
+    path = published_model_path(metadata.tenant)
+    publish_model_version(
+        path, parse_model_version(metadata.version), digest=metadata.artifact_sha256 or None
+    )
+    model_registry.invalidate(path)
+    with transaction.atomic():
+        metadata.status = 'active'
+        metadata.save(update_fields=['status', 'updated_at'])
+        _deprecate_others(metadata)
+    prediction_cache.invalidate(metadata.tenant_id)
+    return metadata
+
+def _deprecate_others(metadata):
+    from ai_engine.models import AIModelMetadata
+
+    AIModelMetadata.objects.filter(
+        tenant=metadata.tenant, model_type=metadata.model_type, status='active'
+    ).exclude(pk=metadata.pk).update(status='deprecated')
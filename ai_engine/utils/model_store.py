@@ -0,0 +1,139 @@
+# ai_engine/utils/model_store.py
+
+import os
+import time
+from collections import Counter, defaultdict
+
+from ai_engine.ml_models.artifacts import (
+    blob_size,
+    list_model_versions,
+    list_store_blobs,
+    model_version_path,
+    remove_store_blob,
+    store_digest,
+    store_model_file,
+)
+from ai_engine.utils.model_metadata import published_model_path
+
+# Blobs younger than this are never collected: a model is stored before
+# record_model_version creates the AIModelMetadata row referencing it
+DEFAULT_GC_MIN_AGE_SECONDS = 3600
+
+def published_model_paths():
+    """Map 'global' / 'tenant <id>' to the model pointer paths that exist on disk."""
+    from core.models import Tenant
+
+    paths = {'global': published_model_path()}
+    for tenant in Tenant.objects.only('id'):
+        path = published_model_path(tenant)
+        if os.path.lexists(path):
+            paths[f"tenant {tenant.id}"] = path
+    return paths
+
+def adopt_legacy_versions():
+    """
+    Move model versions saved before the content-addressed store into it
+    (identical ones collapse to one blob) and record the blob on the
+    AIModelMetadata rows pointing at them. Returns the number of files moved.
+    """
+    from ai_engine.models import AIModelMetadata
+
+    moved = 0
+    for path in published_model_paths().values():
+        for version in list_model_versions(path):
+            versioned_path = model_version_path(path, version)
+            if os.path.isfile(versioned_path) and store_digest(versioned_path) is None:
+                store_model_file(versioned_path)
+                moved += 1
+    for metadata in AIModelMetadata.objects.filter(artifact_sha256='').exclude(model_path__startswith='ref:'):
+        digest = store_digest(metadata.model_path) if os.path.exists(metadata.model_path) else None
+        if digest is not None:
+            AIModelMetadata.objects.filter(pk=metadata.pk).update(artifact_sha256=digest)
+    return moved
+
+def blob_references():
+    """Refcount of each blob: AIModelMetadata rows (other than failed ones) referencing it."""
+    from ai_engine.models import AIModelMetadata
+
+    return Counter(
+        AIModelMetadata.objects.exclude(artifact_sha256='').exclude(status='failed')
+        .values_list('artifact_sha256', flat=True)
+    )
+
+def collect_garbage(min_age_seconds=DEFAULT_GC_MIN_AGE_SECONDS, dry_run=False):
+    """
+    Delete store blobs no AIModelMetadata row references. Blobs a published
+    model currently points at and blobs younger than min_age_seconds are
+    kept regardless. Version links left dangling are removed too.
+    Returns {'removed': [digest, ...], 'freed_bytes': n, 'kept': n}.
+    """
+    references = blob_references()
+    paths = published_model_paths()
+    live = {store_digest(path) for path in paths.values() if os.path.exists(path)}
+    cutoff = time.time() - min_age_seconds
+    removed, freed = [], 0
+    blobs = list_store_blobs()
+    for digest, path in blobs.items():
+        if references[digest] or digest in live or os.path.getmtime(path) > cutoff:
+            continue
+        removed.append(digest)
+        freed += blob_size(path)
+        if not dry_run:
+            remove_store_blob(digest)
+    if not dry_run:
+        for path in paths.values():
+            for version in list_model_versions(path):
+                versioned_path = model_version_path(path, version)
+                if os.path.islink(versioned_path) and not os.path.exists(versioned_path):
+                    os.remove(versioned_path)
+    return {'removed': removed, 'freed_bytes': freed, 'kept': len(blobs) - len(removed)}
+
+def store_usage():
+    """
+    Disk use of model versions with and without deduplication.
+    Returns {'scopes': [...], 'totals': {...}}. Each scope (global or a
+    tenant) reports its versions, the bytes they would take as separate
+    files ('logical_bytes'), their distinct blobs and how many of those
+    are shared with another scope. Totals compare logical bytes with the
+    bytes stored for referenced blobs and the reclaimable unreferenced ones.
+    """
+    from ai_engine.models import AIModelMetadata
+
+    sizes = {digest: blob_size(path) for digest, path in list_store_blobs().items()}
+    rows = (
+        AIModelMetadata.objects.exclude(artifact_sha256='').exclude(status='failed')
+        .values_list('tenant_id', 'artifact_sha256')
+    )
+    scopes = defaultdict(list)  # tenant_id (None for global) -> digests
+    for tenant_id, digest in rows:
+        scopes[tenant_id].append(digest)
+    owners = defaultdict(set)
+    for tenant_id, digests in scopes.items():
+        for digest in digests:
+            owners[digest].add(tenant_id)
+
+    report = []
+    for tenant_id in sorted(scopes, key=lambda t: (t is not None, t or 0)):
+        digests = scopes[tenant_id]
+        distinct = set(digests)
+        report.append({
+            'scope': 'global' if tenant_id is None else f"tenant {tenant_id}",
+            'versions': len(digests),
+            'logical_bytes': sum(sizes.get(digest, 0) for digest in digests),
+            'blobs': len(distinct),
+            'shared_blobs': sum(1 for digest in distinct if len(owners[digest]) > 1),
+            'missing_blobs': sum(1 for digest in distinct if digest not in sizes),
+        })
+    logical = sum(scope['logical_bytes'] for scope in report)
+    referenced = sum(sizes[digest] for digest in owners if digest in sizes)
+    return {
+        'scopes': report,
+        'totals': {
+            'versions': sum(scope['versions'] for scope in report),
+            'logical_bytes': logical,
+            'blobs': len(sizes),
+            'stored_bytes': referenced,
+            'saved_bytes': logical - referenced,
+            'unreferenced_bytes': sum(size for digest, size in sizes.items() if digest not in owners),
+        },
+    }
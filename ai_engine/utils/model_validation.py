@@ -19,3 +19,61 @@ def is_model_file_valid(path, loader):
         return True
     except Exception:
         return False
+
+def collect_model_artifacts():
+    """
+    Map each distinct model artifact in use (global plus every tenant's
+    own or shared model) to the labels of the models served from it.
+    """
+    import os
+    from ai_engine.ml_models.global_ai import GLOBAL_MODEL_PATH
+    from ai_engine.ml_models.tenant_ai import resolve_tenant_model_path
+    from core.models import Tenant
+
+    artifacts = {os.path.realpath(GLOBAL_MODEL_PATH): ['global']}
+    for tenant_id in Tenant.objects.values_list('id', flat=True):
+        path = os.path.realpath(resolve_tenant_model_path(tenant_id))
+        artifacts.setdefault(path, []).append(f"tenant {tenant_id}")
+    return artifacts
+
+def validate_model_artifacts(paths, deep=False, workers=None):
+    """
+    Validate model artifacts. By default each is checked against its
+    manifest by streaming hashes in a thread pool (hashlib releases the
+    GIL); models without a manifest are reported as unverified. With
+    deep=True every model is also unpickled and scored in a process pool.
+    Returns {path: (ok, detail)}.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    from ai_engine.ml_models.artifacts import deep_validate_model, verify_model_artifact
+
+    paths = list(paths)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = dict(zip(paths, pool.map(verify_model_artifact, paths)))
+    if deep:
+        # Corrupt files already failed; load the rest
+        to_load = [path for path in paths if results[path][0] is not False]
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            results.update(zip(to_load, pool.map(deep_validate_model, to_load)))
+    return results
+
+def record_validation_failures(results):
+    """
+    Mark active AIModelMetadata rows whose own artifact failed validation
+    as 'failed'. Rows referencing another model's artifact are left to
+    that model's row. Returns the number of rows updated.
+    """
+    import os
+    from ai_engine.ml_models.artifacts import MODEL_REF_PREFIX
+    from ai_engine.models import AIModelMetadata
+
+    failed_paths = {path for path, (ok, _) in results.items() if ok is False}
+    if not failed_paths:
+        return 0
+    failed_ids = [
+        metadata_id
+        for metadata_id, model_path in AIModelMetadata.objects.filter(status='active').values_list('id', 'model_path')
+        if not model_path.startswith(MODEL_REF_PREFIX) and os.path.realpath(model_path) in failed_paths
+    ]
+    return AIModelMetadata.objects.filter(id__in=failed_ids).update(status='failed')
@@ -0,0 +1,46 @@
+# ai_engine/utils/model_warmup.py
+
+import logging
+
+from ai_engine.ml_models.warmup import warm_up_models
+
+logger = logging.getLogger(__name__)
+
+def get_recently_active_tenant_ids(limit):
+    """
+    Return up to `limit` tenant ids ordered by their latest AIMatchingResult,
+    most recently active first.
+    """
+    from django.db.models import Max
+    from ai_engine.models import AIMatchingResult
+
+    if limit <= 0:
+        return []
+    rows = (
+        AIMatchingResult.objects.values('tenant_id')
+        .annotate(last_active=Max('created_at'))
+        .order_by('-last_active')[:limit]
+    )
+    return [row['tenant_id'] for row in rows]
+
+def run_model_warmup(tenant_limit=10, include_nlp=True):
+    """
+    Preload the global model and the most recently active tenants' models,
+    then log how long warm-up took. Returns the warm-up report.
+    """
+    try:
+        tenant_ids = get_recently_active_tenant_ids(tenant_limit)
+    except Exception as e:
+        # e.g. tables not migrated yet; still warm the global model
+        logger.warning(f"Could not look up active tenants for warm-up: {e}")
+        tenant_ids = []
+
+    report = warm_up_models(tenant_ids, include_nlp=include_nlp)
+    report['tenant_ids'] = tenant_ids
+    for error in report['errors']:
+        logger.warning(f"Warm-up failed for {error['path']}: {error['error']}")
+    logger.info(
+        f"AI model warm-up finished in {report['duration']:.2f}s: "
+        f"{len(report['models'])} models loaded, {len(report['errors'])} errors"
+    )
+    return report
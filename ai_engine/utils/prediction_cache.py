@@ -0,0 +1,154 @@
+# ai_engine/utils/prediction_cache.py
+
+import hashlib
+import threading
+import time
+
+import numpy as np
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from scipy import sparse
+
+from ai_engine.ml_models.inference import as_feature_matrix, predict_fit_proba_batch
+from ai_engine.ml_models.tenant_ai import load_tenant_model_versioned
+
+# Django cache alias holding cached scores (see CACHES in settings)
+PREDICTION_CACHE_ALIAS = 'predictions'
+
+# Seconds a tenant's metadata version is memoized before re-reading AIModelMetadata
+DEFAULT_VERSION_TTL = 2.0
+
+
+def feature_hash(row):
+    """Stable hash of one feature vector (values compared as float64)."""
+    data = np.ascontiguousarray(row, dtype='<f8').tobytes()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class PredictionCache:
+    """
+    Cache of job-fit scores keyed by (tenant, model version, feature hash),
+    stored in a Django cache backend whose MAX_ENTRIES bounds its size.
+    The model version combines the tenant's active AIModelMetadata version
+    with the registry stamp of the model that scores the rows, so a
+    retrain (or a new global model for tenants sharing it) makes old keys
+    unreachable once the registry serves the new model, and scores are
+    never stored under a version other than the one that computed them;
+    the backend's culling then evicts the old keys.
+    """
+
+    def __init__(self, alias=PREDICTION_CACHE_ALIAS, timeout=DEFAULT_TIMEOUT, version_ttl=DEFAULT_VERSION_TTL):
+        self.alias = alias
+        self.timeout = timeout
+        self.version_ttl = version_ttl
+        self._versions = {}  # tenant_id -> (metadata version, fetched_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.compute_seconds = 0.0
+
+    @property
+    def cache(self):
+        from django.conf import settings
+        # Fall back to the default cache if no dedicated alias is configured
+        alias = self.alias if self.alias in settings.CACHES else DEFAULT_CACHE_ALIAS
+        return caches[alias]
+
+    def get_model_version(self, tenant_id, stamp):
+        """
+        Return the version token of the tenant's model loaded with registry
+        `stamp`. The metadata version is re-checked at most once per
+        version_ttl seconds.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._versions.get(tenant_id)
+        if cached is not None and now - cached[1] < self.version_ttl:
+            metadata_version = cached[0]
+        else:
+            metadata_version = self._metadata_version(tenant_id)
+            with self._lock:
+                self._versions[tenant_id] = (metadata_version, now)
+        artifact = hashlib.blake2b(repr(stamp).encode('utf-8'), digest_size=8).hexdigest()
+        return f"{metadata_version}:{artifact}"
+
+    def _metadata_version(self, tenant_id):
+        """Version of the tenant's active AIModelMetadata (None if it has none)."""
+        from ai_engine.models import AIModelMetadata
+        return AIModelMetadata.objects.filter(
+            tenant_id=tenant_id, model_type='tenant', status='active'
+        ).values_list('version', flat=True).first()
+
+    def invalidate(self, tenant_id=None):
+        """Forget memoized metadata versions (all tenants if tenant_id is None)."""
+        with self._lock:
+            if tenant_id is None:
+                self._versions.clear()
+            else:
+                self._versions.pop(tenant_id, None)
+
+    def predict_job_fit(self, tenant_id, features):
+        """Cached equivalent of tenant_ai.predict_job_fit."""
+        return float(self.predict_job_fit_batch(tenant_id, [features])[0])
+
+    def predict_job_fit_batch(self, tenant_id, matrix):
+        """
+        Cached equivalent of tenant_ai.predict_job_fit_batch: rows already
+        scored by the model version serving the tenant are read from the
+        cache and the remaining rows are scored by that same model in one batch.
+        """
+        matrix = as_feature_matrix(matrix)
+        n_rows = matrix.shape[0]
+        scores = np.empty(n_rows, dtype=np.float32)
+        if n_rows == 0:
+            return scores
+
+        # The key and the scores come from the same model, even mid-swap
+        model, stamp = load_tenant_model_versioned(tenant_id)
+        version = self.get_model_version(tenant_id, stamp)
+        prefix = f"pred:{tenant_id}:{version}:"
+        dense = matrix.toarray() if sparse.issparse(matrix) else matrix
+        keys = [prefix + feature_hash(row) for row in dense]
+        cached = self.cache.get_many(keys)
+
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        for i, key in enumerate(keys):
+            if key in cached:
+                scores[i] = cached[key]
+        if missing:
+            start = time.perf_counter()
+            computed = predict_fit_proba_batch(model, matrix[missing])
+            elapsed = time.perf_counter() - start
+            scores[missing] = computed
+            self.cache.set_many(
+                {keys[i]: float(score) for i, score in zip(missing, computed)},
+                timeout=self.timeout,
+            )
+        else:
+            elapsed = 0.0
+
+        with self._lock:
+            self.hits += n_rows - len(missing)
+            self.misses += len(missing)
+            self.compute_seconds += elapsed
+        return scores
+
+    def stats(self):
+        """
+        Hit/miss counters for this process. saved_seconds estimates the
+        scoring time avoided: hits times the average cost of a scored row.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            per_row = self.compute_seconds / self.misses if self.misses else 0.0
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'compute_seconds': self.compute_seconds,
+                'saved_seconds': self.hits * per_row,
+            }
+
+
+# Shared prediction cache used by the matching engine
+prediction_cache = PredictionCache()
@@ -0,0 +1,163 @@
+# ai_engine/utils/semantic_matching.py
+
+import os
+import threading
+
+import numpy as np
+from scipy import sparse
+
+from ai_engine.ml_models.ann_index import (
+    DEFAULT_EMBEDDING_DIM,
+    DEFAULT_NPROBE,
+    DEFAULT_SHORTLIST,
+    ANNIndex,
+    VectorEntry,
+    embed,
+    top_k,
+)
+from ai_engine.ml_models.semantic_index import (
+    DEFAULT_MAX_QUERY_TERMS,
+    HASH_FEATURES,
+    SemanticIndex,
+    candidate_document,
+    job_document,
+)
+from ai_engine.utils.entity_features import DEFAULT_FEATURE_STORE_DIR, REBUILD_BATCH_SIZE
+
+SEMANTIC_CANDIDATE_FIELDS = ('id', 'skills', 'ai_learning_profile')
+SEMANTIC_JOB_FIELDS = ('id', 'title', 'description', 'skills_required')
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_semantic_index(tenant_id, kind):
+    """Process-wide SemanticIndex of a tenant's 'candidates' or 'jobs', next to its feature store."""
+    from django.conf import settings
+
+    root = getattr(settings, 'AI_FEATURE_STORE_DIR', None) or DEFAULT_FEATURE_STORE_DIR
+    key = (root, tenant_id, kind)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = SemanticIndex(
+                os.path.join(root, f"tenant_{tenant_id}"), kind,
+                max_query_terms=getattr(settings, 'AI_SEMANTIC_MAX_QUERY_TERMS', DEFAULT_MAX_QUERY_TERMS),
+            )
+        return _indexes[key]
+
+def get_ann_index(tenant_id, kind='candidates'):
+    """Process-wide ANNIndex over the embeddings of a tenant's semantic vectors."""
+    from django.conf import settings
+
+    root = getattr(settings, 'AI_FEATURE_STORE_DIR', None) or DEFAULT_FEATURE_STORE_DIR
+    key = (root, tenant_id, f'ann.{kind}')
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = ANNIndex(
+                os.path.join(root, f"tenant_{tenant_id}"), kind,
+                nprobe=getattr(settings, 'AI_ANN_NPROBE', DEFAULT_NPROBE),
+            )
+        return _indexes[key]
+
+def vector_embedding(vector):
+    """Dense embedding of a SemanticIndex (columns, weights) vector."""
+    columns, values = vector
+    return embed(sparse.csr_matrix((values, columns, [0, len(columns)]), shape=(1, HASH_FEATURES)))[0]
+
+def _embedded_entries(entries):
+    return [VectorEntry(entry.id, vector_embedding((entry.indices, entry.values))) for entry in entries]
+
+def _candidate_documents(rows):
+    return [(row[0], candidate_document(*row[1:])) for row in rows]
+
+def _job_documents(rows):
+    return [(row[0], job_document(*row[1:])) for row in rows]
+
+def index_semantic_candidates(tenant_id, rows):
+    """
+    Add or update candidates given as SEMANTIC_CANDIDATE_FIELDS value tuples.
+    A tenant without an index yet is skipped: it is built from the database
+    (with a fresh idf) on first use.
+    """
+    index = get_semantic_index(tenant_id, 'candidates')
+    if rows and index.exists():
+        entries = index.add_documents(_candidate_documents(rows))
+        ann = get_ann_index(tenant_id)
+        if ann.exists() and ann.dim == DEFAULT_EMBEDDING_DIM:
+            ann.upsert_many(_embedded_entries(entries))
+
+def index_semantic_jobs(tenant_id, rows):
+    """Add or update jobs given as SEMANTIC_JOB_FIELDS value tuples (see index_semantic_candidates)."""
+    index = get_semantic_index(tenant_id, 'jobs')
+    if rows and index.exists():
+        index.add_documents(_job_documents(rows))
+
+def remove_semantic_documents(tenant_id, kind, document_ids):
+    """Drop candidates or jobs from the tenant's semantic and ANN indexes, where built."""
+    for index in (get_semantic_index(tenant_id, kind), get_ann_index(tenant_id, kind)):
+        if index.exists():
+            index.delete_many(document_ids)
+
+def rebuild_semantic_index(tenant_id, kind, batch_size=REBUILD_BATCH_SIZE):
+    """Rebuild a tenant's candidate or job vectors (and idf) from the database. Returns the document count."""
+    from core.models import Candidate, Job
+
+    if kind == 'candidates':
+        rows = Candidate.objects.filter(tenant_id=tenant_id).values_list(*SEMANTIC_CANDIDATE_FIELDS)
+        documents = _candidate_documents(rows.iterator(chunk_size=batch_size))
+    else:
+        rows = Job.objects.filter(tenant_id=tenant_id).values_list(*SEMANTIC_JOB_FIELDS)
+        documents = _job_documents(rows.iterator(chunk_size=batch_size))
+    return get_semantic_index(tenant_id, kind).rebuild(documents)
+
+def ensure_semantic_index(tenant_id, kind):
+    """The tenant's semantic index of `kind`, built from the database on first use."""
+    index = get_semantic_index(tenant_id, kind)
+    if not index.exists():
+        rebuild_semantic_index(tenant_id, kind)
+    return index
+
+def rebuild_ann_index(tenant_id, kind='candidates', n_lists=None, batch_size=REBUILD_BATCH_SIZE):
+    """Retrain a tenant's ANN index on the embeddings of its semantic vectors. Returns the vector count."""
+    ids, rows = ensure_semantic_index(tenant_id, kind).export()
+    # Embedded in batches: the dense product of the whole corpus would be
+    # several times the size of the embeddings
+    vectors = np.empty((len(ids), DEFAULT_EMBEDDING_DIM), dtype=np.float32)
+    for start in range(0, len(ids), batch_size):
+        vectors[start:start + batch_size] = embed(rows[start:start + batch_size])
+    return get_ann_index(tenant_id, kind).rebuild_vectors(ids, vectors, n_lists=n_lists)
+
+def ensure_ann_index(tenant_id, kind='candidates'):
+    """The tenant's ANN index of `kind`, trained on first use and again if its embedding width changed."""
+    index = get_ann_index(tenant_id, kind)
+    if not index.exists() or index.dim != DEFAULT_EMBEDDING_DIM:
+        rebuild_ann_index(tenant_id, kind)
+    return index
+
+def approximate_search(tenant_id, kind, query, limit=10, within=None, nprobe=None, shortlist=None):
+    """
+    Semantic top-k through the tenant's ANN index: the nearest embeddings
+    of `query` (a text or a SemanticIndex vector), at least `shortlist` of
+    them, reranked by exact cosine with the semantic vectors. (ids,
+    similarity) as SemanticIndex.search returns them, best first; the
+    only loss is true neighbors whose embeddings fell outside the shortlist.
+    With a `within` too small for the probed lists to hold a shortlist of
+    it, searches those ids exactly instead.
+    """
+    from django.conf import settings
+
+    index = ensure_semantic_index(tenant_id, kind)
+    vector = index.vectorize(query) if isinstance(query, str) else query
+    shortlist = max(limit, shortlist or getattr(settings, 'AI_ANN_SHORTLIST', DEFAULT_SHORTLIST))
+    ann = ensure_ann_index(tenant_id, kind)
+    if within is not None:
+        # The probed lists hold about len(within) * probed / n_lists of the
+        # allowed ids: fewer than the shortlist and a selective filter
+        # would come back short or empty
+        n_lists = ann.n_lists
+        probed = min(nprobe or ann.nprobe, n_lists)
+        if len(within) * probed < shortlist * n_lists:
+            return index.search(vector, limit, within=within)
+    ids, _ = ann.search(vector_embedding(vector), shortlist, nprobe=nprobe, within=within)
+    similarity = index.similarity(vector, ids)
+    hits = similarity > 0
+    return top_k(ids[hits], similarity[hits], limit)
@@ -0,0 +1,176 @@
+# ai_engine/utils/training_dataset.py
+
+from collections import namedtuple
+
+import numpy as np
+from django.db.models import Count, Max, Q
+
+from ai_engine.ml_models.pair_features import PAIR_FEATURES, pair_features_from_vectors
+from ai_engine.utils.entity_features import candidate_vectors, job_vectors
+from ai_engine.utils.feedback_training import outcome_label
+
+# X -- float32 (n, len(PAIR_FEATURES)); y -- int8 fit labels;
+# job_ids, candidate_ids -- int64 pair keys aligned with the rows;
+# watermark -- newest change included (None if there were no rows)
+TrainingDataset = namedtuple('TrainingDataset', 'X y job_ids candidate_ids watermark')
+
+# Pipeline statuses mapped to feedback_training.OUTCOME_LABELS outcomes
+OFFER_OUTCOMES = {'Accepted': 'accepted', 'Rejected': 'declined'}
+INTERVIEW_OUTCOMES = {'completed': 'interview', 'no_show': 'no-show'}
+
+def _newest(*timestamps):
+    timestamps = [t for t in timestamps if t is not None]
+    return max(timestamps) if timestamps else None
+
+def build_tenant_dataset(tenant, watermark=None):
+    """
+    Labeled job-candidate feature matrix for a tenant, built from the
+    recruiting pipeline with a few set-based queries (no per-row ORM access).
+    A pair's label comes from, in order of precedence: the recorded
+    AIMatchingResult.actual_outcome, the offer status, the submission
+    status, then its interviews (any completed / no-show). Pairs with no
+    decisive status (e.g. only 'Submitted') are left out.
+    Features are the AIMatchingResult scores where the pair was scored,
+    otherwise computed from the candidate and job vectors in the tenant's
+    feature store (entity_features).
+    With a watermark only pairs whose submission, interviews, offer or
+    matching result changed after it are returned, so callers can merge
+    the result into a previous build (see merge_datasets).
+    """
+    from ai_engine.models import AIMatchingResult
+    from core.models import Interview, Offer, Submission
+
+    submissions = Submission.objects.filter(tenant=tenant)
+    results = AIMatchingResult.objects.filter(tenant=tenant)
+    if watermark is not None:
+        submissions = submissions.filter(
+            Q(updated_at__gt=watermark)
+            | Q(interviews__updated_at__gt=watermark)
+            | Q(offer__updated_at__gt=watermark)
+        ).distinct()
+        results = results.filter(
+            Q(actual_outcome__isnull=False, updated_at__gt=watermark)
+            | Q(job_id__in=submissions.values('job_id'), candidate_id__in=submissions.values('candidate_id'))
+        )
+    else:
+        results = results.filter(
+            Q(actual_outcome__isnull=False)
+            | Q(job_id__in=submissions.values('job_id'), candidate_id__in=submissions.values('candidate_id'))
+        )
+
+    # 1. submissions, 2. their interviews rolled up, 3. their offers
+    submission_rows = list(submissions.order_by('id').values_list(
+        'id', 'job_id', 'candidate_id', 'status', 'updated_at'
+    ))
+    submission_ids = submissions.values('id')
+    interviews = {
+        row['submission_id']: row
+        for row in Interview.objects.filter(submission_id__in=submission_ids)
+        .values('submission_id')
+        .annotate(
+            completed=Count('id', filter=Q(status='Completed')),
+            no_show=Count('id', filter=Q(status='No-Show')),
+            newest=Max('updated_at'),
+        )
+    }
+    offers = {
+        submission_id: (status, updated_at)
+        for submission_id, status, updated_at in Offer.objects.filter(
+            submission_id__in=submission_ids
+        ).values_list('submission_id', 'status', 'updated_at')
+    }
+    # 4. matching results: scores and recorded outcomes
+    scored = {
+        (row[0], row[1]): row[2:]
+        for row in results.values_list('job_id', 'candidate_id', *PAIR_FEATURES, 'actual_outcome', 'updated_at')
+    }
+
+    labels = {}  # (job_id, candidate_id) -> label
+    newest = None
+    for submission_id, job_id, candidate_id, status, updated_at in submission_rows:
+        interview = interviews.get(submission_id)
+        offer_status, offer_updated = offers.get(submission_id, (None, None))
+        label = outcome_label(OFFER_OUTCOMES.get(offer_status))
+        if label is None:
+            label = outcome_label(status)
+        if label is None and interview:
+            if interview['completed']:
+                label = outcome_label(INTERVIEW_OUTCOMES['completed'])
+            elif interview['no_show']:
+                label = outcome_label(INTERVIEW_OUTCOMES['no_show'])
+        newest = _newest(newest, updated_at, offer_updated, interview and interview['newest'])
+        if label is not None:
+            labels[(job_id, candidate_id)] = label
+    for pair, row in scored.items():
+        recorded = outcome_label(row[-2])
+        if recorded is not None:
+            labels[pair] = recorded
+        if row[-2] is not None:
+            newest = _newest(newest, row[-1])
+
+    pairs = sorted(labels)
+    X = np.zeros((len(pairs), len(PAIR_FEATURES)), dtype=np.float32)
+    unscored = [i for i, pair in enumerate(pairs) if pair not in scored]
+    for i, pair in enumerate(pairs):
+        if pair in scored:
+            X[i] = scored[pair][:len(PAIR_FEATURES)]
+    if unscored:
+        # Pairs the engine never scored: features from the feature store
+        # (entities missing from it are loaded with one query per kind)
+        unscored_pairs = [pairs[i] for i in unscored]
+        X[unscored] = pair_features_from_vectors(
+            job_vectors(tenant.id, [pair[0] for pair in unscored_pairs]),
+            candidate_vectors(tenant.id, [pair[1] for pair in unscored_pairs]),
+        )
+
+    return TrainingDataset(
+        X=X,
+        y=np.array([labels[pair] for pair in pairs], dtype=np.int8),
+        job_ids=np.array([pair[0] for pair in pairs], dtype=np.int64),
+        candidate_ids=np.array([pair[1] for pair in pairs], dtype=np.int64),
+        watermark=newest,
+    )
+
+def merge_datasets(previous, update):
+    """
+    Fold an incremental build into a previous one: pairs present in the
+    update replace their earlier rows. Returns a new TrainingDataset.
+    """
+    if previous is None or len(previous.y) == 0:
+        return update._replace(watermark=_newest(previous and previous.watermark, update.watermark))
+    keys = previous.job_ids.astype(np.int64) << 32 | previous.candidate_ids
+    updated_keys = update.job_ids.astype(np.int64) << 32 | update.candidate_ids
+    keep = ~np.isin(keys, updated_keys)
+    return TrainingDataset(
+        X=np.concatenate([previous.X[keep], update.X]),
+        y=np.concatenate([previous.y[keep], update.y]),
+        job_ids=np.concatenate([previous.job_ids[keep], update.job_ids]),
+        candidate_ids=np.concatenate([previous.candidate_ids[keep], update.candidate_ids]),
+        watermark=_newest(previous.watermark, update.watermark),
+    )
+
+def save_dataset(dataset, path):
+    """Write a dataset as .npz (readable by training_data.iter_training_chunks)."""
+    np.savez(
+        path,
+        X=dataset.X,
+        y=dataset.y,
+        feature_names=np.array(PAIR_FEATURES),
+        job_ids=dataset.job_ids,
+        candidate_ids=dataset.candidate_ids,
+        watermark=np.array(dataset.watermark.isoformat() if dataset.watermark else ''),
+    )
+
+def load_dataset(path):
+    """Read a dataset written by save_dataset."""
+    from django.utils.dateparse import parse_datetime
+
+    with np.load(path, allow_pickle=False) as archive:
+        watermark = str(archive['watermark'])
+        return TrainingDataset(
+            X=archive['X'],
+            y=archive['y'],
+            job_ids=archive['job_ids'],
+            candidate_ids=archive['candidate_ids'],
+            watermark=parse_datetime(watermark) if watermark else None,
+        )
@@ -0,0 +1,264 @@
+# ai_engine/utils/training_jobs.py
+
+import logging
+import os
+import socket
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Avg, Count, F, Max, Min, Q
+from django.utils import timezone
+
+from ai_engine.utils.training_scheduler import QueuedJob, is_heavy_job, schedule_jobs
+
+logger = logging.getLogger(__name__)
+
+# A running job whose heartbeat is older than this is considered abandoned
+DEFAULT_LEASE_SECONDS = 300
+
+# Abandoned jobs are retried until they have been claimed this many times
+DEFAULT_MAX_ATTEMPTS = 3
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def setup_worker_process():
+    """Process pool initializer: make Django usable in a spawned child."""
+    import django
+    django.setup()
+
+def worker_node(worker_id):
+    """Host part of a worker id (see default_worker_id)."""
+    return worker_id.rsplit(':', 1)[0]
+
+def claim_jobs(limit, worker_id, node_max_heavy=None):
+    """
+    Claim up to `limit` pending jobs for this worker, chosen by
+    training_scheduler.schedule_jobs: subscription plan priority with
+    aging, one running job per tenant, and at most node_max_heavy
+    CPU-heavy jobs running on this worker's host (None = no cap).
+    Rows are locked with SELECT ... FOR UPDATE SKIP LOCKED so concurrent
+    workers never block on or claim the same job; the conditional update
+    keeps the claim safe on backends without row locks (e.g. SQLite).
+    Records each job's queue wait. Returns the claimed job ids.
+    """
+    from ai_engine.models import ModelTrainingQueue
+
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    claimed = []
+    with transaction.atomic():
+        running = ModelTrainingQueue.objects.filter(status='running')
+        running_by_tenant = dict(
+            running.values('tenant_id').annotate(n=Count('id')).values_list('tenant_id', 'n')
+        )
+        heavy_slots = limit
+        if node_max_heavy is not None:
+            node_jobs = running.filter(worker_id__startswith=worker_node(worker_id) + ':')
+            heavy_running = sum(
+                is_heavy_job(training_type, config)
+                for training_type, config in node_jobs.values_list('training_type', 'training_config')
+            )
+            heavy_slots = max(0, node_max_heavy - heavy_running)
+
+        # Only each tenant's oldest pending job can start this round
+        head_ids = (
+            ModelTrainingQueue.objects.filter(status='pending')
+            .values('tenant_id').annotate(head_id=Min('id')).values_list('head_id', flat=True)
+        )
+        rows = (
+            ModelTrainingQueue.objects.select_for_update(skip_locked=True, of=('self',))
+            .filter(id__in=list(head_ids), status='pending')
+            .values_list('id', 'tenant_id', 'tenant__subscription_plan', 'created_at',
+                         'training_type', 'training_config')
+        )
+        queued = [
+            QueuedJob(job_id, tenant_id, plan, created_at, is_heavy_job(training_type, config))
+            for job_id, tenant_id, plan, created_at, training_type, config in rows
+        ]
+        created = {job.id: job.created_at for job in queued}
+        for job_id in schedule_jobs(queued, running_by_tenant, limit, heavy_slots, now):
+            updated = ModelTrainingQueue.objects.filter(id=job_id, status='pending').update(
+                status='running',
+                worker_id=worker_id,
+                started_at=now,
+                heartbeat_at=now,
+                attempts=F('attempts') + 1,
+                progress=0,
+                current_step='Claimed by worker',
+                error_message=None,
+                queue_wait_seconds=(now - created[job_id]).total_seconds(),
+            )
+            if updated:
+                claimed.append(job_id)
+    return claimed
+
+def heartbeat(job_ids, worker_id):
+    """Extend the lease of jobs this worker is still running."""
+    from ai_engine.models import ModelTrainingQueue
+
+    if not job_ids:
+        return 0
+    return ModelTrainingQueue.objects.filter(
+        id__in=job_ids, status='running', worker_id=worker_id
+    ).update(heartbeat_at=timezone.now())
+
+def release_jobs(job_ids, worker_id, reason, max_attempts=None):
+    """
+    Put jobs this worker can no longer run back in the queue. With
+    max_attempts, jobs that have been claimed that often are failed
+    instead, so a job that crashes its process is not retried forever.
+    """
+    from ai_engine.models import ModelTrainingQueue
+
+    jobs = ModelTrainingQueue.objects.filter(id__in=job_ids, status='running', worker_id=worker_id)
+    if max_attempts is not None:
+        jobs.filter(attempts__gte=max_attempts).update(
+            status='failed', completed_at=timezone.now(), error_message=f"{reason} ({max_attempts} attempts)"
+        )
+    return jobs.filter(status='running').update(
+        status='pending', worker_id='', current_step=f"Requeued: {reason}"
+    )
+
+def reclaim_stale_jobs(lease_seconds=DEFAULT_LEASE_SECONDS, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """
+    Requeue running jobs whose worker stopped heartbeating, or fail them
+    once they have used up max_attempts. Returns (requeued, failed).
+    """
+    from ai_engine.models import ModelTrainingQueue
+
+    now = timezone.now()
+    stale = ModelTrainingQueue.objects.filter(status='running').filter(
+        Q(heartbeat_at__lt=now - timedelta(seconds=lease_seconds)) | Q(heartbeat_at__isnull=True)
+    )
+    failed = stale.filter(attempts__gte=max_attempts).update(
+        status='failed',
+        completed_at=now,
+        error_message=f"Worker lease expired after {max_attempts} attempts",
+    )
+    requeued = stale.filter(attempts__lt=max_attempts).update(
+        status='pending', worker_id='', current_step='Requeued after worker lease expired'
+    )
+    if requeued or failed:
+        logger.warning(f"Reclaimed stale training jobs: {requeued} requeued, {failed} failed")
+    return requeued, failed
+
+def update_progress(job_id, worker_id, progress, step):
+    """Record progress of a running job (also renews its lease)."""
+    from ai_engine.models import ModelTrainingQueue
+
+    ModelTrainingQueue.objects.filter(id=job_id, worker_id=worker_id, status='running').update(
+        progress=progress, current_step=step, heartbeat_at=timezone.now()
+    )
+
+def run_training_job(job_id, worker_id):
+    """
+    Execute one claimed training job and record its outcome.
+    Runs in a worker process. Returns the job's final status.
+    """
+    from ai_engine.models import ModelTrainingQueue
+    from ai_engine.utils.feedback_training import UpdateSkipped
+
+    job = ModelTrainingQueue.objects.select_related('tenant').get(id=job_id)
+    try:
+        update_progress(job_id, worker_id, 10, 'Preparing training data')
+        metadata = _execute(job, worker_id)
+        status, error = 'completed', None
+        if metadata is None:
+            result = {'message': 'No new labeled feedback'}
+        else:
+            result = {
+                'model_id': metadata.id,
+                'version': metadata.version,
+                'training_samples': metadata.training_samples,
+                **{k: v for k, v in metadata.get_performance_summary().items() if v is not None},
+            }
+    except UpdateSkipped as e:
+        # Not a failure: the feedback stays unconsumed for the next update
+        logger.info(f"Training job {job_id} skipped: {e}")
+        metadata, result = None, {'message': 'Skipped', 'skipped_reason': str(e)}
+        status, error = 'completed', None
+    except Exception as e:
+        logger.error(f"Training job {job_id} failed: {e}")
+        metadata, result = None, {}
+        status, error = 'failed', str(e)
+
+    finished = ModelTrainingQueue.objects.filter(
+        id=job_id, worker_id=worker_id, status='running'
+    ).update(
+        status=status,
+        progress=100 if status == 'completed' else F('progress'),
+        current_step='Done' if status == 'completed' else 'Failed',
+        completed_at=timezone.now(),
+        result_metadata=result,
+        error_message=error,
+        ai_model=metadata,
+    )
+    if not finished:
+        logger.warning(f"Training job {job_id} finished after its lease was reclaimed; result not recorded")
+    return status
+
+def _execute(job, worker_id):
+    from ai_engine.utils.feedback_training import (
+        incremental_update_tenant,
+        train_global_from_feedback,
+        train_tenant_from_feedback,
+    )
+
+    if job.training_type in ('global_initial', 'global_retrain'):
+        update_progress(job.id, worker_id, 30, 'Training global model')
+        return train_global_from_feedback()
+    if job.tenant is None:
+        raise ValueError(f"{job.training_type} job has no tenant")
+    if job.training_type == 'tenant_clone':
+        update_progress(job.id, worker_id, 50, 'Cloning global model')
+        return _clone_global_to_tenant(job.tenant)
+    if job.training_config.get('mode') == 'incremental':
+        update_progress(job.id, worker_id, 30, 'Adding trees from new feedback')
+        return incremental_update_tenant(job.tenant)
+    update_progress(job.id, worker_id, 30, 'Training tenant model')
+    return train_tenant_from_feedback(job.tenant)
+
+def _clone_global_to_tenant(tenant):
+    from ai_engine.ml_models.tenant_ai import clone_global_model_for_tenant
+    from ai_engine.models import AIModelMetadata
+    from ai_engine.utils.model_metadata import format_model_version
+    from ai_engine.utils.prediction_cache import prediction_cache
+
+    model_path = clone_global_model_for_tenant(tenant.id)
+    with transaction.atomic():
+        metadata, _ = AIModelMetadata.objects.update_or_create(
+            tenant=tenant,
+            model_type='tenant',
+            version=format_model_version(0),
+            defaults={'model_path': model_path, 'status': 'active'},
+        )
+        AIModelMetadata.objects.filter(
+            tenant=tenant, model_type='tenant', status='active'
+        ).exclude(pk=metadata.pk).update(status='deprecated')
+    prediction_cache.invalidate(tenant.id)
+    return metadata
+
+def queue_wait_by_plan(since=None):
+    """
+    Scheduling latency per subscription plan: jobs started, average and
+    maximum queue wait in seconds, plus jobs still pending.
+    """
+    from ai_engine.models import ModelTrainingQueue
+
+    started = ModelTrainingQueue.objects.filter(queue_wait_seconds__isnull=False)
+    if since is not None:
+        started = started.filter(started_at__gte=since)
+    stats = {}
+    for row in started.values('tenant__subscription_plan').annotate(
+        jobs=Count('id'), avg_wait=Avg('queue_wait_seconds'), max_wait=Max('queue_wait_seconds')
+    ):
+        plan = row['tenant__subscription_plan'] or 'Global'
+        stats[plan] = {'jobs': row['jobs'], 'avg_wait': row['avg_wait'], 'max_wait': row['max_wait'], 'pending': 0}
+    pending = ModelTrainingQueue.objects.filter(status='pending')
+    for row in pending.values('tenant__subscription_plan').annotate(n=Count('id')):
+        plan = row['tenant__subscription_plan'] or 'Global'
+        stats.setdefault(plan, {'jobs': 0, 'avg_wait': None, 'max_wait': None, 'pending': 0})
+        stats[plan]['pending'] = row['n']
+    return stats
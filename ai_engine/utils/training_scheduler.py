@@ -0,0 +1,61 @@
+# ai_engine/utils/training_scheduler.py
+
+from collections import namedtuple
+
+# Lower runs first; unknown plans rank with Free
+PLAN_PRIORITY = {'Enterprise': 0, 'Pro': 1, 'Free': 2}
+DEFAULT_PLAN_PRIORITY = 2
+
+# Waiting this long raises a job by one plan level, so lower plans
+# are delayed under load but never starved
+AGING_SECONDS = 600
+
+# Running jobs allowed per tenant at once (fair share)
+MAX_JOBS_PER_TENANT = 1
+
+# Training types that need a whole CPU for minutes; others (clones,
+# incremental updates) are cheap and not limited by the node cap
+LIGHT_TRAINING_TYPES = ('tenant_clone',)
+
+QueuedJob = namedtuple('QueuedJob', 'id tenant_id plan created_at heavy')
+
+
+def is_heavy_job(training_type, training_config):
+    """Whether a job is CPU-heavy and counts against the node's cap."""
+    if training_type in LIGHT_TRAINING_TYPES:
+        return False
+    return (training_config or {}).get('mode') != 'incremental'
+
+def job_priority(job, now):
+    """Effective priority of a queued job: plan level minus aging credit."""
+    level = PLAN_PRIORITY.get(job.plan, DEFAULT_PLAN_PRIORITY)
+    waited = (now - job.created_at).total_seconds()
+    return level - waited / AGING_SECONDS
+
+def schedule_jobs(queued, running_by_tenant, limit, heavy_slots, now,
+                  max_per_tenant=MAX_JOBS_PER_TENANT):
+    """
+    Choose which queued jobs to start.
+    queued -- QueuedJob tuples waiting to run
+    running_by_tenant -- {tenant_id: running job count} across all workers
+    limit -- free worker slots
+    heavy_slots -- CPU-heavy jobs this node may still start
+    Jobs are taken in effective priority order (plan, aged by wait time),
+    skipping tenants that already have max_per_tenant jobs running, so one
+    tenant's backlog cannot occupy every slot. Global jobs (tenant None)
+    share one fair-share bucket. Returns the chosen job ids in start order.
+    """
+    running = dict(running_by_tenant)
+    chosen = []
+    for job in sorted(queued, key=lambda job: (job_priority(job, now), job.created_at, job.id)):
+        if len(chosen) >= limit:
+            break
+        if running.get(job.tenant_id, 0) >= max_per_tenant:
+            continue
+        if job.heavy:
+            if heavy_slots <= 0:
+                continue
+            heavy_slots -= 1
+        running[job.tenant_id] = running.get(job.tenant_id, 0) + 1
+        chosen.append(job.id)
+    return chosen
@@ -1,5 +1,6 @@
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
@@ -14,11 +15,20 @@ from datetime import datetime, timedelta
 
 from core.models import Tenant, Candidate, Job
 from .models import AIModelMetadata, AIMatchingResult, FeatureExtractionLog, ModelTrainingQueue
-from .ml_models.matching import JobCandidateMatchingEngine
+from .ml_models.candidate_index import candidate_filters
+from .ml_models.matching import DEFAULT_MAX_CANDIDATES, CandidateJobMatchingEngine, JobCandidateMatchingEngine
 from .ml_models.features import ResumeFeatureExtractor
+from .ml_models.registry import model_registry
+from .utils.prediction_cache import prediction_cache
 
 logger = logging.getLogger(__name__)
 
+# Largest number of matches returned by find_candidate_matches / find_job_matches
+MAX_MATCH_LIMIT = 200
+
+# Ranking modes of find_candidate_matches / find_job_matches
+MATCH_MODES = ('model', 'semantic')
+
 
 class AIModelDashboardView(View):
     """
@@ -96,28 +106,68 @@ def find_candidate_matches(request):
     try:
         data = json.loads(request.body)
         job_id = data.get('job_id')
-        limit = data.get('limit', 10)
         
         if not job_id:
             return JsonResponse({
                 'error': 'job_id is required'
             }, status=400)
         
+        # 'model' ranks with the tenant model, 'semantic' by text similarity
+        # (with approximate=true, through the tenant's ANN index)
+        mode = data.get('mode', 'model')
+        if mode not in MATCH_MODES:
+            return JsonResponse({
+                'error': f"mode must be one of {', '.join(MATCH_MODES)}"
+            }, status=400)
+        # A JSON boolean: the string "false" would otherwise read as true
+        approximate = data.get('approximate', False)
+        if not isinstance(approximate, bool):
+            return JsonResponse({
+                'error': 'approximate must be true or false'
+            }, status=400)
+        
+        # Optional hard filters: location, visa_status (a value or a list),
+        # min_experience_years, max_experience_years
+        try:
+            limit = int(data.get('limit', 10))
+            filters = candidate_filters(**(data.get('filters') or {}))
+        except (TypeError, ValueError) as e:
+            return JsonResponse({
+                'error': 'Invalid limit or filters',
+                'message': str(e)
+            }, status=400)
+        if not 1 <= limit <= MAX_MATCH_LIMIT:
+            return JsonResponse({
+                'error': f'limit must be between 1 and {MAX_MATCH_LIMIT}'
+            }, status=400)
+        
         tenant = request.user.tenant
         job = get_object_or_404(Job, id=job_id, tenant=tenant)
         
         # Initialize matching engine
-        matching_engine = JobCandidateMatchingEngine(tenant.id)
+        matching_engine = JobCandidateMatchingEngine(
+            tenant.id,
+            max_candidates=getattr(settings, 'AI_MATCHING_MAX_CANDIDATES', DEFAULT_MAX_CANDIDATES),
+        )
         
         # Find best matches
-        matches = matching_engine.find_best_candidates(job, limit=limit)
+        if mode == 'semantic':
+            matches = matching_engine.find_similar_candidates(
+                job, limit=limit, filters=filters, approximate=approximate
+            )
+        else:
+            matches = matching_engine.find_best_candidates(job, limit=limit, filters=filters)
+        search = matching_engine.last_search
         
         # Format response
         response_data = {
             'job_id': job_id,
             'job_title': job.title,
+            'mode': mode,
             'matches': matches,
-            'total_candidates_scored': len(matches),
+            'total_candidates_scored': search['scored'],
+            'candidate_pool_size': search['pool_size'],
+            'timings_ms': search['timings'],
             'timestamp': datetime.now().isoformat()
         }
         
@@ -133,6 +183,90 @@ def find_candidate_matches(request):
         }, status=500)
 
 
+@login_required
+@require_http_methods(["POST"])
+@csrf_exempt
+def find_job_matches(request, candidate_id=None):
+    """
+    API endpoint to find the open jobs that best fit a candidate: a saved
+    one (candidate_id) or one pasted as a 'candidate' object with skills,
+    experience_years, location and optionally ai_learning_profile and
+    resume_text. Returns ranked jobs with match scores.
+    """
+    try:
+        data = json.loads(request.body or '{}')
+        candidate_id = candidate_id or data.get('candidate_id')
+        pasted = data.get('candidate')
+        
+        if not candidate_id and not isinstance(pasted, dict):
+            return JsonResponse({
+                'error': 'candidate_id or candidate is required'
+            }, status=400)
+        
+        mode = data.get('mode', 'model')
+        if mode not in MATCH_MODES:
+            return JsonResponse({
+                'error': f"mode must be one of {', '.join(MATCH_MODES)}"
+            }, status=400)
+        
+        tenant = request.user.tenant
+        resume_text = ''
+        try:
+            limit = int(data.get('limit', 10))
+            if candidate_id:
+                candidate = get_object_or_404(Candidate, id=candidate_id, tenant=tenant)
+            else:
+                # Not saved: only scored
+                candidate = Candidate(
+                    tenant=tenant,
+                    skills=pasted.get('skills') or {},
+                    experience_years=int(pasted.get('experience_years') or 0),
+                    location=str(pasted.get('location') or ''),
+                    ai_learning_profile=pasted.get('ai_learning_profile') or {},
+                )
+                resume_text = str(pasted.get('resume_text') or '')
+        except (TypeError, ValueError) as e:
+            return JsonResponse({
+                'error': 'Invalid limit or candidate',
+                'message': str(e)
+            }, status=400)
+        if not 1 <= limit <= MAX_MATCH_LIMIT:
+            return JsonResponse({
+                'error': f'limit must be between 1 and {MAX_MATCH_LIMIT}'
+            }, status=400)
+        
+        matching_engine = CandidateJobMatchingEngine(tenant.id)
+        if mode == 'semantic':
+            matches = matching_engine.find_similar_jobs(candidate, limit=limit, resume_text=resume_text)
+        else:
+            matches = matching_engine.find_best_jobs(candidate, limit=limit)
+        search = matching_engine.last_search
+        
+        response_data = {
+            'candidate_id': candidate.id,
+            'mode': mode,
+            'matches': matches,
+            'total_jobs_scored': search['scored'],
+            'open_jobs': search['pool_size'],
+            'timings_ms': search['timings'],
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        logger.info(f"Found {len(matches)} job matches for candidate {candidate.id or '(pasted)'} (tenant: {tenant.name})")
+        
+        return JsonResponse(response_data)
+        
+    except Http404:
+        # Unknown candidate, or another tenant's
+        raise
+    except Exception as e:
+        logger.error(f"Error finding job matches: {e}")
+        return JsonResponse({
+            'error': 'Internal server error',
+            'message': str(e)
+        }, status=500)
+
+
 @login_required
 @require_http_methods(["POST"])
 @csrf_exempt
@@ -233,9 +367,7 @@ def retrain_tenant_model(request):
             }
         )
         
-        # TODO: Trigger asynchronous training task (Celery)
-        # from .tasks import retrain_tenant_model_task
-        # retrain_tenant_model_task.delay(training_job.id)
+        # Picked up by `manage.py run_training_worker`
         
         response_data = {
             'message': 'Training job queued successfully',
@@ -384,6 +516,30 @@ def get_training_status(request):
         }, status=500)
 
 
+@login_required
+def get_model_cache_stats(request):
+    """
+    API endpoint to get in-process model and prediction cache statistics
+    Returns hit/miss/eviction counters and memory usage of the model registry,
+    and prediction cache hit ratio and saved scoring time
+    """
+    try:
+        response_data = {
+            'model_cache': model_registry.stats(),
+            'prediction_cache': prediction_cache.stats(),
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        return JsonResponse(response_data)
+        
+    except Exception as e:
+        logger.error(f"Error getting model cache stats: {e}")
+        return JsonResponse({
+            'error': 'Failed to get model cache stats',
+            'message': str(e)
+        }, status=500)
+
+
 @login_required
 def submit_match_feedback(request):
     """
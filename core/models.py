@@ -123,6 +123,7 @@ class Submission(models.Model):
     created_by = models.CharField(max_length=20, choices=[("AI","AI"),("Recruiter","Recruiter")])
     feedback = models.JSONField(default=dict, blank=True, null=True)
     ai_decision_log = models.JSONField(default=dict, blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"Submission {self.id} - {self.candidate.name} for {self.job.title}"
@@ -136,6 +137,7 @@ class Interview(models.Model):
     status = models.CharField(max_length=20, choices=[("Scheduled","Scheduled"),("Completed","Completed"),("Cancelled","Cancelled"),("No-Show","No-Show")])
     notes = models.TextField(blank=True, null=True)
     ai_learning_notes = models.JSONField(default=dict, blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"Interview {self.id} - {self.submission}"
@@ -148,6 +150,7 @@ class Offer(models.Model):
     start_date = models.DateField()
     status = models.CharField(max_length=20, choices=[("Accepted","Accepted"),("Rejected","Rejected"),("Pending","Pending")])
     ai_learning_notes = models.JSONField(default=dict, blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"Offer {self.id} for {self.submission}"
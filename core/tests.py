@@ -1,3 +1,207 @@
-from django.test import TestCase
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ai_engine.models import AIMatchingResult, AIModelMetadata, ModelTrainingQueue
+from ai_engine.utils import training_jobs
+
+from .models import Candidate, Client, Job, Tenant, User
+
+
+def _candidate(tenant, email, skills):
+    return Candidate.objects.create(
+        tenant=tenant, name=email, email=email, phone='', location='Austin', visa_status='Citizen',
+        skills=skills, experience_years=3, resume_url='https://example.com/resume.pdf',
+    )
+
+
+class TenantTestCase(TestCase):
+    """A signed-in recruiter of a fresh tenant, with the AI stores in a scratch directory."""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        settings_override = override_settings(AI_FEATURE_STORE_DIR=tmpdir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # New tenants reference the global model: keep the real artifacts out of it
+        clone = mock.patch('ai_engine.signals.clone_global_model_for_tenant', return_value='global')
+        clone.start()
+        self.addCleanup(clone.stop)
+        self.tenant = Tenant.objects.create(name='Acme', subscription_plan='Pro', status='Active')
+        self.user = User.objects.create_user('recruiter@acme.test', 'secret', name='Recruiter', tenant=self.tenant)
+        self.client.force_login(self.user)
+
+
+class CandidateSkillFilterTests(TenantTestCase):
+    def _filtered(self, skills):
+        response = self.client.get('/api/candidates/', {'skills': skills})
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['id'] for row in response.json())
+
+    def test_candidates_saved_before_the_index_are_filtered(self):
+        # In the database before the tenant's index existed (their on-commit
+        # signal handlers never run in a TestCase)
+        python = _candidate(self.tenant, 'a@acme.test', {'Python': 1})
+        both = _candidate(self.tenant, 'b@acme.test', ['python', 'django'])
+        _candidate(self.tenant, 'c@acme.test', ['java'])
+        # A save before the first filtered request must not shadow them
+        with self.captureOnCommitCallbacks(execute=True):
+            saved = _candidate(self.tenant, 'd@acme.test', ['python'])
+        self.assertEqual(self._filtered('python'), [python.id, both.id, saved.id])
+        self.assertEqual(self._filtered('python,django'), [both.id])
+        # Once built, the index follows saves
+        with self.captureOnCommitCallbacks(execute=True):
+            later = _candidate(self.tenant, 'e@acme.test', ['django'])
+        self.assertEqual(self._filtered('django'), [both.id, later.id])
+
+
+class CandidateJobMatchesTests(TenantTestCase):
+    def test_unknown_or_other_tenants_candidate_is_not_found(self):
+        other = Tenant.objects.create(name='Other', subscription_plan='Pro', status='Active')
+        foreign = _candidate(other, 'x@other.test', ['python'])
+        own = _candidate(self.tenant, 'a@acme.test', ['python'])
+        for candidate_id in (foreign.id, own.id + 1000):
+            response = self.client.post(f'/ai/api/candidates/{candidate_id}/jobs/', '{}', content_type='application/json')
+            self.assertEqual(response.status_code, 404)
+            response = self.client.post(
+                '/ai/api/matches/jobs/', {'candidate_id': candidate_id}, content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 404)
+        response = self.client.post(f'/ai/api/candidates/{own.id}/jobs/', '{}', content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['matches'], [])
+
+
+class TrainingJobLeaseTests(TenantTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = Tenant.objects.create(name='Other', subscription_plan='Basic', status='Active')
+
+    def _job(self, tenant, **fields):
+        return ModelTrainingQueue.objects.create(tenant=tenant, training_type='tenant_retrain', **fields)
+
+    def _expire(self, job, seconds=600):
+        ModelTrainingQueue.objects.filter(id=job.id).update(heartbeat_at=timezone.now() - timedelta(seconds=seconds))
+
+    def test_two_workers_never_claim_the_same_job(self):
+        jobs = [self._job(self.tenant), self._job(self.other)]
+        schedule_jobs = training_jobs.schedule_jobs
+        raced = {}
+
+        def claim_in_between(*args):
+            # Worker a claims after worker b read the queue, before b's updates
+            chosen = schedule_jobs(*args)
+            if 'a:1' not in raced:
+                raced['a:1'] = None
+                raced['a:1'] = training_jobs.claim_jobs(10, 'a:1')
+            return chosen
+
+        with mock.patch('ai_engine.utils.training_jobs.schedule_jobs', side_effect=claim_in_between):
+            claimed = training_jobs.claim_jobs(10, 'b:1')
+        self.assertEqual(sorted(raced['a:1']), [job.id for job in jobs])
+        self.assertEqual(claimed, [])
+        for job in ModelTrainingQueue.objects.all():
+            self.assertEqual((job.status, job.worker_id, job.attempts), ('running', 'a:1', 1))
+        self.assertEqual(training_jobs.claim_jobs(10, 'b:1'), [])
+
+    def test_expired_lease_is_reclaimed(self):
+        stale, live = self._job(self.tenant), self._job(self.other)
+        training_jobs.claim_jobs(10, 'a:1')
+        self._expire(stale)
+        self.assertEqual(training_jobs.reclaim_stale_jobs(lease_seconds=300), (1, 0))
+        stale.refresh_from_db()
+        self.assertEqual((stale.status, stale.worker_id), ('pending', ''))
+        self.assertEqual(ModelTrainingQueue.objects.get(id=live.id).status, 'running')
+
+        self.assertEqual(training_jobs.claim_jobs(10, 'b:1'), [stale.id])
+        # The first worker lost the lease: its heartbeat and result are ignored
+        self.assertEqual(training_jobs.heartbeat([stale.id], 'a:1'), 0)
+        with mock.patch('ai_engine.utils.training_jobs._execute', return_value=None):
+            training_jobs.run_training_job(stale.id, 'a:1')
+            stale.refresh_from_db()
+            self.assertEqual((stale.status, stale.attempts), ('running', 2))
+            self.assertEqual(training_jobs.run_training_job(stale.id, 'b:1'), 'completed')
+        stale.refresh_from_db()
+        self.assertEqual((stale.status, stale.result_metadata), ('completed', {'message': 'No new labeled feedback'}))
+
+    def test_job_fails_at_max_attempts(self):
+        job = self._job(self.tenant, attempts=2)
+        self.assertEqual(training_jobs.claim_jobs(10, 'a:1'), [job.id])
+        self._expire(job)
+        self.assertEqual(training_jobs.reclaim_stale_jobs(lease_seconds=300, max_attempts=3), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 3))
+        self.assertEqual(training_jobs.claim_jobs(10, 'b:1'), [])
+
+        crashed = self._job(self.other, attempts=2)
+        training_jobs.claim_jobs(10, 'a:1')
+        self.assertEqual(training_jobs.release_jobs([crashed.id], 'a:1', 'Worker crashed', max_attempts=3), 0)
+        crashed.refresh_from_db()
+        self.assertEqual((crashed.status, crashed.error_message), ('failed', 'Worker crashed (3 attempts)'))
+
+    def test_release_only_touches_this_workers_jobs(self):
+        own, foreign = self._job(self.tenant), self._job(self.other)
+        with mock.patch('ai_engine.utils.training_jobs.schedule_jobs', side_effect=lambda *args: [own.id]):
+            training_jobs.claim_jobs(10, 'a:1')
+        self.assertEqual(training_jobs.claim_jobs(10, 'b:1'), [foreign.id])
+        self.assertEqual(training_jobs.release_jobs([own.id, foreign.id], 'a:1', 'Shutting down'), 1)
+        own.refresh_from_db()
+        foreign.refresh_from_db()
+        self.assertEqual((own.status, own.worker_id, own.current_step), ('pending', '', 'Requeued: Shutting down'))
+        self.assertEqual((foreign.status, foreign.worker_id), ('running', 'b:1'))
+
+
+class IncrementalUpdateTests(TenantTestCase):
+    def test_single_outcome_batch_is_skipped(self):
+        watermark = timezone.now() - timedelta(days=1)
+        # Created with the tenant (see ai_engine.signals)
+        current = AIModelMetadata.objects.get(tenant=self.tenant, model_type='tenant', status='active')
+        current.feedback_watermark = watermark
+        current.save()
+        for candidate_id in range(3):
+            AIMatchingResult.objects.create(
+                tenant=self.tenant, job_id=1, candidate_id=candidate_id, match_score=0.5, confidence=0.5,
+                model_version='1.0.0', actual_outcome='hired',
+            )
+        job = ModelTrainingQueue.objects.create(
+            tenant=self.tenant, training_type='tenant_retrain', training_config={'mode': 'incremental'}
+        )
+        training_jobs.claim_jobs(1, 'a:1')
+        with mock.patch('ai_engine.utils.feedback_training.update_tenant_model') as update:
+            self.assertEqual(training_jobs.run_training_job(job.id, 'a:1'), 'completed')
+        update.assert_not_called()
+        job.refresh_from_db()
+        self.assertIsNone(job.error_message)
+        self.assertIn('single outcome', job.result_metadata['skipped_reason'])
+        current.refresh_from_db()
+        self.assertEqual((current.status, current.feedback_watermark), ('active', watermark))
+        self.assertEqual(AIModelMetadata.objects.filter(tenant=self.tenant).count(), 1)
+
+
+class FindCandidateMatchesTests(TenantTestCase):
+    def test_approximate_must_be_a_json_boolean(self):
+        client = Client.objects.create(tenant=self.tenant, name='Client', industry='Software', location='Austin')
+        job = Job.objects.create(
+            tenant=self.tenant, client=client, title='Python developer', description='Python services',
+            location='Austin', pay_rate=50, employment_type='W2', skills_required={'python': 1}, status='Open',
+        )
+        _candidate(self.tenant, 'a@acme.test', ['python'])
+
+        def find(approximate):
+            return self.client.post(
+                '/ai/api/matches/find/', {'job_id': job.id, 'mode': 'semantic', 'approximate': approximate},
+                content_type='application/json',
+            )
+
+        for approximate in ('false', 'true', 0, 1, None):
+            response = find(approximate)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()['error'], 'approximate must be true or false')
+        for approximate in (False, True):
+            response = find(approximate)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()['matches']), 1)
@@ -29,9 +29,30 @@ class RecruiterAIViewSet(TenantSafeViewSet):
 
 
 class CandidateViewSet(TenantSafeViewSet):
+    """
+    Candidates of the current tenant. `?skills=` filters them through the
+    tenant's inverted skill index: comma-separated skills must all match,
+    `|` separates alternatives (e.g. `?skills=kubernetes,python|go`).
+    Skills from resume parsing count too.
+    """
     queryset = Candidate.objects.all()
     serializer_class = CandidateSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        skills = ','.join(self.request.query_params.getlist('skills'))
+        tenant = get_current_tenant()
+        if not skills or not tenant:
+            return queryset
+        from ai_engine.ml_models.candidate_index import parse_skill_query
+        from ai_engine.utils.candidate_retrieval import ensure_candidate_index
+
+        clauses = parse_skill_query(skills)
+        if not clauses:
+            return queryset
+        candidate_ids = ensure_candidate_index(tenant.id).query(clauses)
+        return queryset.filter(id__in=candidate_ids.tolist())
+
 
 class JobViewSet(TenantSafeViewSet):
     queryset = Job.objects.all()
@@ -91,6 +91,9 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Training worker processes write concurrently; take the write lock
+        # up front and wait for it instead of failing with "database is locked"
+        "OPTIONS": {"transaction_mode": "IMMEDIATE", "timeout": 20},
     }
 }
 
@@ -137,3 +140,65 @@ MEDIA_ROOT = BASE_DIR / "media"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Caches
+# "predictions" holds job-fit scores keyed by tenant, model version and
+# feature hash; MAX_ENTRIES bounds its size (oldest entries are culled)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "predictions": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "ai-predictions",
+        "TIMEOUT": 24 * 60 * 60,
+        "OPTIONS": {"MAX_ENTRIES": 200000},
+    },
+}
+
+# AI engine
+# Memory budget for loaded tenant/global models kept in each worker process
+AI_MODEL_CACHE_MAX_BYTES = 512 * 1024 * 1024
+# Inference backend: "mmap" (compiled forest arrays shared across workers),
+# "compiled" (compiled forest in private memory) or "sklearn" (full estimator)
+AI_INFERENCE_BACKEND = "mmap"
+# Seconds between checks for a newly published model version (0 = every lookup)
+AI_MODEL_RELOAD_CHECK_INTERVAL = 2.0
+# Unix socket of the micro-batching inference server (`manage.py run_inference_server`).
+# When set, predict_job_fit goes through it and falls back to in-process scoring
+AI_INFERENCE_SOCKET = None
+# Preload the global model and the N most recently active tenants' models
+# when the app starts (or run `manage.py warm_up_models` from worker boot)
+AI_WARMUP_ON_STARTUP = False
+AI_WARMUP_TENANT_COUNT = 10
+# `manage.py run_training_worker`: parallel training processes per worker
+# (None = one per CPU) and seconds without a heartbeat before a running
+# job is reclaimed by another worker
+AI_TRAINING_WORKER_CONCURRENCY = None
+AI_TRAINING_LEASE_SECONDS = 300
+# CPU-heavy training jobs allowed at once per host, summed over all
+# workers on it (None = one per CPU)
+AI_TRAINING_NODE_MAX_HEAVY_JOBS = None
+# Estimated memory `manage.py retrain_all_tenants` may use across its
+# training processes (None = half of physical RAM)
+AI_RETRAIN_MEMORY_BUDGET_MB = None
+# Cap on the in-memory matrix `manage.py train_global_ai` loads; larger
+# training exports are uniformly subsampled (or use --chunked)
+AI_TRAINING_DATA_MAX_MB = 1024
+# Per-tenant memory-mapped candidate/job feature vectors, kept current by
+# Candidate/Job signals (`manage.py rebuild_feature_store` backfills)
+AI_FEATURE_STORE_DIR = BASE_DIR / "models" / "feature_store"
+# {param: [values]} searched by `--tune` on the training commands
+# (None = ai_engine.ml_models.tuning.DEFAULT_PARAM_SPACE)
+AI_TUNING_PARAM_SPACE = None
+# Model blobs younger than this are kept by gc_model_store even when no
+# AIModelMetadata row references them yet
+AI_MODEL_STORE_GC_MIN_AGE_SECONDS = 3600
+# Candidates candidate generation passes to model scoring per job match
+AI_MATCHING_MAX_CANDIDATES = 3000
+# Heaviest job terms scored in semantic matching (fewer is faster, more is closer to exact cosine)
+AI_SEMANTIC_MAX_QUERY_TERMS = 64
+# Inverted lists probed per approximate semantic search (more: higher recall, slower)
+AI_ANN_NPROBE = 16
+# Nearest embeddings reranked by exact similarity per approximate semantic search
+AI_ANN_SHORTLIST = 200